@@ -1,4 +1,8 @@
+import time
+PROCESS_STARTED = time.perf_counter()  # Awal timing startup, sebelum import berat
+
 import discord
+import aiohttp
 from discord.ext import tasks
 from discord.ui import Button, View, Select
 import psutil
@@ -8,11 +12,21 @@ import datetime
 from typing import Optional, Dict, List
 import json
 import os
-import time
+import csv
+import gzip
+import zlib
+import io
+import tempfile
 import subprocess
 import socket
-from collections import deque
+import struct
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import math
+import heapq
+import threading
+import re
+import signal
 
 # ===== KONFIGURASI =====
 CONFIG = {
@@ -27,29 +41,552 @@ CONFIG = {
         "cpu": 80,
         "memory": 85,
         "disk": 90,
-        "temperature": 75
+        "temperature": 75,
+        "psi_cpu": 40,  # PSI cpu some avg10 (%)
+        "psi_memory": 20,  # PSI memory some avg10 (%)
+        "psi_io": 40,  # PSI io some avg10 (%)
+        "load_per_core": 2.0,  # Load average 1 menit dibagi jumlah core
+        "fd_usage": 80,  # File descriptor terpakai (%)
+        "conntrack": 80,  # nf_conntrack terpakai (%)
+        "exec_rate": 600,  # exec per menit (butuh proc_events)
+        "probe_failures": 3,  # Gagal berturut-turut sebelum probe di-alert
+        "log_rate": 60,  # Event log per menit per pattern
+        "core_hot": 95  # Usage satu core (%) yang dianggap pinned
     },
     "view_mode": "detailed",  # detailed, compact
     "color_mode": "dynamic",  # dynamic, static
     "enable_alerts": True,
     "monitor_docker": False,
     "monitor_services": [],  # List service yang mau dimonitor
+    "sample_interval_min": 1,  # Interval sampling tercepat (detik) saat mendekati threshold
+    "sample_interval_max": 5,  # Interval sampling terlambat (detik) saat host idle
+    "sample_window": 900,  # Detik sample yang disimpan di memory
+    "fast_proc": True,  # Baca /proc langsung untuk sampler (Linux), fallback ke psutil
+    "dashboards": [],  # Dashboard tambahan: [{"channel_id": 123, "view_mode": "compact"}]
+    "dashboard_concurrency": 4,  # Maksimum edit dashboard bersamaan (maks. worker scheduler - 1)
+    "heavy_hitter_capacity": 100,  # Jumlah key process yang dilacak per jam
+    "heavy_hitter_hours": 24,  # Jam history heavy-hitter yang disimpan
+    "proc_events": False,  # Tangkap fork/exec/exit via netlink (butuh root), fallback sampling
+    "probes": [],  # [{"name", "type": tcp|http|dns, "target", "timeout", "expect_status", "history"}]
+    "probe_interval": 60,  # Detik antar putaran probe
+    "probe_concurrency": 20,  # Probe maksimum yang jalan bersamaan
+    "log_files": [],  # [{"path", "name", "patterns": {nama: regex}, "threshold"}], ditambah log default monitor_services
+    "budget_cpu": 10,  # Budget CPU bot sendiri (% satu core), 0 = tanpa budget
+    "budget_rss_mb": 300,  # Budget RSS bot sendiri (MB), 0 = tanpa budget
+    "budget_tracemalloc": False,  # Lacak heap Python via tracemalloc (ada overhead)
+    "save_interval": 10,  # Detik maksimum data dirty sebelum ditulis ke disk
+    "history_retention_days": 400,  # Umur history terkompresi (monitor_history.bin)
+    "graph_png": True,  # Lampirkan chart PNG di !graph (False = sparkline saja)
+    "disk_scan_roots": [],  # Direktori yang di-scan ukurannya (mis. ["/var", "/home"]), kosong = mati
+    "disk_scan_interval": 1800,  # Detik antar scan ukuran direktori
+    "disk_scan_rate": 5000,  # Entry direktori maksimum per detik saat scan, 0 = tanpa batas
+    "disk_scan_depth": 4,  # Kedalaman direktori maksimum yang dilaporkan di top/growth
+    "report_schedule": [],  # Laporan terjadwal: ["daily"], ["weekly"] atau keduanya
+    "report_time": "09:00",  # Jam kirim laporan (zona waktu lokal, env TZ)
+    "report_weekday": "mon",  # Hari kirim laporan weekly
+    "report_channel_id": 0,  # Channel laporan, 0 = alert_channel_id
+    "incident_window": 300,  # Detik; alert yang fire berdekatan digabung ke satu incident
+    "incident_resolve_after": 180,  # Detik semua alert clear sebelum incident resolve
+    "core_hot_minutes": 5,  # Menit satu core di atas core_hot sebelum alert core_imbalance
 }
 
+def parse_duration(text: str) -> Optional[int]:
+    """Parse durasi seperti '30m', '24h', '7d' (angka saja = jam) ke detik"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    text = text.strip().lower()
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(float(text) * 3600)
+    except (ValueError, OverflowError):
+        # OverflowError: 'inf' atau angka yang terlalu besar
+        return None
+
+class StartupTimer:
+    """Catat waktu tiap fase startup sejak proses mulai (sebelum import)"""
+    def __init__(self, started: float):
+        self.started = started
+        self.phases: List[tuple] = []  # (fase, ms sejak proses mulai)
+    
+    def mark(self, phase: str):
+        """Catat fase sekali saja (on_ready bisa terpanggil lagi saat reconnect)"""
+        if any(name == phase for name, _ in self.phases):
+            return
+        elapsed = (time.perf_counter() - self.started) * 1000
+        self.phases.append((phase, elapsed))
+        print(f"[startup] {phase}: {elapsed:.0f} ms")
+
+STARTUP_TIMER = StartupTimer(PROCESS_STARTED)
+
+class SeriesStore:
+    """History metric jangka panjang dalam block terkompresi (append-only file).
+    
+    Tiap metric disimpan per block berisi maksimal BLOCK_SIZE sample:
+    timestamp sebagai delta-of-delta dan nilai sebagai delta terkuantisasi
+    (resolusi 1/QUANT), keduanya varint zigzag. Header block menyimpan
+    waktu awal/akhir, min/max/sum nilai, sehingga query range bisa melewati
+    block di luar window dan memakai agregat header untuk block yang penuh di dalamnya.
+    Block yang belum penuh hanya ada di memory; history JSON terakhir dipakai
+    untuk mengisinya ulang setelah restart.
+    Resolusi timestamp satu detik: sample kedua untuk metric yang sama di detik
+    yang sama (atau lebih lama) diabaikan, sample pertama yang disimpan.
+    """
+    MAGIC = b"MSB1"
+    RECORD = struct.Struct("<4sHI")  # magic, panjang nama, panjang payload
+    HEADER = struct.Struct("<IqqdddH")  # count, t_first, t_last, min, max, sum, quant
+    BLOCK_SIZE = 512
+    QUANT = 100
+    COMPACT_INTERVAL = 86400
+    
+    def __init__(self, filename: str = 'monitor_history.bin'):
+        self.filename = filename
+        self.compact_filename = f"{filename}.compact"  # Hasil compact lengkap, belum disalin
+        self.blocks: Dict[str, List[dict]] = {}  # metric -> block terurut waktu
+        self.open: Dict[str, tuple] = {}  # metric -> (timestamps, values) yang belum di-seal
+        self.pending: List[tuple] = []  # (metric, block) sudah di-seal, belum ditulis
+        self.lock = threading.Lock()
+        self.file_size = 0
+        self.last_compact = time.time()
+        self._load_index()
+    
+    # ----- encoding -----
+    @staticmethod
+    def _put_varint(out: bytearray, value: int):
+        value = (value << 1) if value >= 0 else ((-value) << 1) - 1  # zigzag
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+    
+    @staticmethod
+    def _get_varints(data: bytes, count: int) -> List[int]:
+        values = []
+        append = values.append
+        shift = result = 0
+        for byte in data:
+            result |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            append((result >> 1) if not result & 1 else -((result + 1) >> 1))
+            shift = result = 0
+            if len(values) == count:
+                break
+        return values
+    
+    def encode(self, timestamps: List[int], values: List[float]) -> dict:
+        """Encode satu block (timestamp detik, nilai float)"""
+        out = bytearray()
+        put = self._put_varint
+        previous_delta = 0
+        for i in range(1, len(timestamps)):
+            delta = timestamps[i] - timestamps[i - 1]
+            put(out, delta - previous_delta)
+            previous_delta = delta
+        previous = 0
+        for value in values:
+            quantized = int(round(value * self.QUANT))
+            put(out, quantized - previous)
+            previous = quantized
+        return {
+            "count": len(values),
+            "t_first": timestamps[0],
+            "t_last": timestamps[-1],
+            "min": min(values),
+            "max": max(values),
+            "sum": sum(values),
+            "quant": self.QUANT,
+            "data": bytes(out),
+            "offset": None,
+            "length": len(out)
+        }
+    
+    def decode(self, block: dict) -> tuple:
+        """(timestamps, values) dari satu block"""
+        data = block.get("data")
+        if data is None:
+            with self.lock:
+                data = os.pread(self.fd, block["length"], block["offset"])
+        count = block["count"]
+        ints = self._get_varints(data, 2 * count - 1)
+        timestamps = [block["t_first"]]
+        delta = 0
+        for dod in ints[:count - 1]:
+            delta += dod
+            timestamps.append(timestamps[-1] + delta)
+        values = []
+        quantized = 0
+        scale = block["quant"]
+        for delta_value in ints[count - 1:]:
+            quantized += delta_value
+            values.append(quantized / scale)
+        return timestamps, values
+    
+    # ----- file -----
+    def _load_index(self):
+        """Baca header semua block; record terpotong di akhir file dibuang"""
+        self.fd = os.open(self.filename, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        if os.path.exists(self.compact_filename):
+            # Crash saat compact menyalin in-place: selesaikan dari salinan lengkap
+            print(f"Finishing interrupted compaction of {self.filename}")
+            self._copy_in_place(self.compact_filename)
+            os.remove(self.compact_filename)
+        size = os.fstat(self.fd).st_size
+        offset = 0
+        while offset + self.RECORD.size <= size:
+            magic, name_len, payload_len = self.RECORD.unpack(os.pread(self.fd, self.RECORD.size, offset))
+            end = offset + self.RECORD.size + name_len + self.HEADER.size + payload_len
+            if magic != self.MAGIC or end > size:
+                break
+            raw = os.pread(self.fd, name_len + self.HEADER.size, offset + self.RECORD.size)
+            metric = raw[:name_len].decode()
+            count, t_first, t_last, vmin, vmax, vsum, quant = self.HEADER.unpack(raw[name_len:])
+            self.blocks.setdefault(metric, []).append({
+                "count": count, "t_first": t_first, "t_last": t_last,
+                "min": vmin, "max": vmax, "sum": vsum, "quant": quant,
+                "data": None, "offset": end - payload_len, "length": payload_len
+            })
+            offset = end
+        if offset < size:
+            print(f"Truncating {size - offset} bytes of incomplete data in {self.filename}")
+            os.ftruncate(self.fd, offset)
+        self.file_size = offset
+    
+    def _copy_in_place(self, source: str) -> int:
+        """Timpa isi file dengan source tanpa rename (file bind-mount Docker)"""
+        offset = 0
+        with open(source, 'rb') as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                os.pwrite(self.fd, chunk, offset)
+                offset += len(chunk)
+        os.ftruncate(self.fd, offset)
+        os.fsync(self.fd)
+        return offset
+    
+    def _record(self, metric: str, block: dict) -> bytes:
+        name = metric.encode()
+        return (
+            self.RECORD.pack(self.MAGIC, len(name), block["length"]) + name
+            + self.HEADER.pack(block["count"], block["t_first"], block["t_last"],
+                               block["min"], block["max"], block["sum"], block["quant"])
+            + block["data"]
+        )
+    
+    def write_pending(self):
+        """Tulis block yang sudah di-seal ke file (dipanggil dari thread flush)"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+            if not pending:
+                return
+            records = [self._record(metric, block) for metric, block in pending]
+            try:
+                os.pwrite(self.fd, b"".join(records), self.file_size)
+                os.fsync(self.fd)
+            except OSError:
+                self.pending = pending + self.pending
+                raise
+            offset = self.file_size
+            for (metric, block), record in zip(pending, records):
+                offset += len(record)
+                # Offset di-set dulu baru data dilepas, pembaca di thread lain tetap aman
+                block["offset"] = offset - block["length"]
+                block["data"] = None
+            self.file_size = offset
+    
+    def compact(self, retention: float):
+        """Tulis ulang file tanpa block yang lebih tua dari retention.
+        
+        File baru dibangun dari snapshot di luar lock supaya query dan seal()
+        tidak tertahan selama penulisan; lock hanya dipegang saat swap.
+        """
+        cutoff = time.time() - retention
+        with self.lock:
+            snapshot = [(metric, list(blocks)) for metric, blocks in self.blocks.items()]
+            size_before = self.file_size
+        if not any(blocks and blocks[0]["t_last"] < cutoff for _, blocks in snapshot):
+            return
+        dropped = set()
+        offsets = []
+        tmp = f"{self.filename}.tmp"
+        with open(tmp, 'wb') as f:
+            for metric, blocks in snapshot:
+                for block in blocks:
+                    if block["offset"] is None:
+                        continue  # Belum ditulis (pending), tetap dipertahankan
+                    if block["t_last"] < cutoff:
+                        dropped.add(id(block))
+                        continue
+                    # Offset lama tetap valid sampai swap: file hanya di-append
+                    data = os.pread(self.fd, block["length"], block["offset"])
+                    f.write(self._record(metric, dict(block, data=data)))
+                    offsets.append((block, f.tell() - block["length"]))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        with self.lock:
+            if self.file_size != size_before:
+                # Ada block yang ditulis ke file lama selama compact; ulangi nanti
+                os.remove(tmp)
+                return
+            self.last_compact = time.time()
+            try:
+                os.replace(tmp, self.filename)
+            except OSError:
+                # File bind-mount (Docker) tidak bisa di-rename: salin in-place.
+                # .compact menandai salinan lengkap untuk _load_index jika crash di tengah
+                try:
+                    os.replace(tmp, self.compact_filename)
+                except OSError as e:
+                    print(f"Error compacting {self.filename}: {e}")
+                    os.remove(tmp)
+                    return
+                self._copy_in_place(self.compact_filename)
+                os.remove(self.compact_filename)
+            else:
+                os.close(self.fd)
+                self.fd = os.open(self.filename, os.O_RDWR | os.O_CLOEXEC)
+            for block, offset in offsets:
+                block["offset"] = offset
+            for metric, blocks in list(self.blocks.items()):
+                # Block yang di-seal setelah snapshot ikut dipertahankan
+                self.blocks[metric] = [b for b in blocks if id(b) not in dropped]
+            self.file_size = size
+    
+    # ----- append & query -----
+    def last_time(self, metric: str) -> int:
+        if metric in self.open and self.open[metric][0]:
+            return self.open[metric][0][-1]
+        blocks = self.blocks.get(metric)
+        return blocks[-1]["t_last"] if blocks else 0
+    
+    def append(self, timestamp: int, stats: dict):
+        """Tambah satu sample untuk semua metric numerik di stats (maksimal satu per detik)"""
+        for metric, value in stats.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            timestamps, values = self.open.setdefault(metric, ([], []))
+            if timestamps and timestamp <= timestamps[-1]:
+                continue
+            timestamps.append(timestamp)
+            values.append(float(value))
+            if len(values) >= self.BLOCK_SIZE:
+                self.seal(metric)
+    
+    def seal(self, metric: str):
+        timestamps, values = self.open.pop(metric, ([], []))
+        if not values:
+            return
+        block = self.encode(timestamps, values)
+        with self.lock:
+            self.blocks.setdefault(metric, []).append(block)
+            self.pending.append((metric, block))
+    
+    def seal_all(self):
+        for metric in list(self.open):
+            self.seal(metric)
+    
+    def backfill(self, history: list):
+        """Isi block terbuka dari history JSON yang lebih baru dari data tersimpan"""
+        last = {}
+        for entry in history:
+            timestamp = int(datetime.datetime.fromisoformat(entry["timestamp"]).timestamp())
+            stats = {}
+            for metric, value in entry["stats"].items():
+                if metric not in last:
+                    last[metric] = self.last_time(metric)
+                if timestamp > last[metric]:
+                    stats[metric] = value
+            if stats:
+                self.append(timestamp, stats)
+    
+    def metrics(self) -> List[str]:
+        return sorted(set(self.blocks) | set(self.open))
+    
+    @staticmethod
+    def _first_block(blocks: List[dict], start: float) -> int:
+        """Index block pertama yang berakhir >= start (binary search)"""
+        lo, hi = 0, len(blocks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if blocks[mid]["t_last"] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def query(self, metric: str, start: float, end: float = None):
+        """Generator (timestamp, value) terurut dalam [start, end], block di luar window dilewati"""
+        end = end if end is not None else float('inf')
+        blocks = list(self.blocks.get(metric, []))
+        for block in blocks[self._first_block(blocks, start):]:
+            if block["t_first"] > end:
+                break
+            for timestamp, value in zip(*self.decode(block)):
+                if start <= timestamp <= end:
+                    yield timestamp, value
+        timestamps, values = self.open.get(metric, ([], []))
+        for timestamp, value in zip(list(timestamps), list(values)):
+            if start <= timestamp <= end:
+                yield timestamp, value
+    
+    def metrics_since(self, start: float) -> List[str]:
+        """Metric yang punya sample di atau setelah start"""
+        found = []
+        for metric in self.metrics():
+            blocks = self.blocks.get(metric)
+            timestamps = self.open.get(metric, ([], []))[0]
+            if (blocks and blocks[-1]["t_last"] >= start) or (timestamps and timestamps[-1] >= start):
+                found.append(metric)
+        return found
+    
+    def rows(self, metrics: List[str], start: float, end: float = None):
+        """Generator (timestamp, {metric: value}) gabungan beberapa metric, terurut waktu.
+        
+        Streaming satu block per metric sekaligus; sample dengan timestamp sama
+        (satu tick history) digabung jadi satu baris.
+        """
+        def tagged(index: int, metric: str):
+            for timestamp, value in self.query(metric, start, end):
+                yield timestamp, index, value
+        
+        streams = [tagged(index, metric) for index, metric in enumerate(metrics)]
+        row_time, row = None, {}
+        for timestamp, index, value in heapq.merge(*streams):
+            if timestamp != row_time:
+                if row:
+                    yield row_time, row
+                row_time, row = timestamp, {}
+            row[metrics[index]] = value
+        if row:
+            yield row_time, row
+    
+    def aggregate(self, metric: str, start: float, end: float = None) -> Optional[dict]:
+        """count/min/max/avg dalam window; block yang penuh di dalam window tidak di-decode"""
+        end = end if end is not None else float('inf')
+        count, total, low, high = 0, 0.0, float('inf'), float('-inf')
+        partial = []
+        blocks = list(self.blocks.get(metric, []))
+        for block in blocks[self._first_block(blocks, start):]:
+            if block["t_first"] > end:
+                break
+            if block["t_first"] >= start and block["t_last"] <= end:
+                count += block["count"]
+                total += block["sum"]
+                low = min(low, block["min"])
+                high = max(high, block["max"])
+            else:
+                partial.append(block)
+        timestamps, values = self.open.get(metric, ([], []))
+        samples = [pair for block in partial for pair in zip(*self.decode(block))]
+        samples += list(zip(list(timestamps), list(values)))
+        for timestamp, value in samples:
+            if start <= timestamp <= end:
+                count += 1
+                total += value
+                low = min(low, value)
+                high = max(high, value)
+        if not count:
+            return None
+        return {"count": count, "min": low, "max": high, "avg": total / count}
+    
+    def summary(self) -> dict:
+        """Ukuran file dan rata-rata byte per sample"""
+        samples = sum(b["count"] for blocks in self.blocks.values() for b in blocks)
+        return {
+            "metrics": len(self.metrics()),
+            "blocks": sum(len(blocks) for blocks in self.blocks.values()),
+            "samples": samples,
+            "bytes": self.file_size,
+            "bytes_per_sample": self.file_size / samples if samples else 0.0
+        }
+
 class DataStore:
-    """Manajemen data dengan JSON"""
-    def __init__(self, filename='monitor_data.json'):
+    """Manajemen data dengan JSON.
+    
+    Setelah start_flusher() jalan, save() hanya menandai dirty dan file ditulis
+    oleh flusher di worker thread paling sering tiap save_interval detik.
+    Penulisan lewat file .tmp + fsync + rename supaya file tidak pernah setengah jadi.
+    History juga disimpan terkompresi di SeriesStore untuk jangka panjang;
+    JSON hanya menyimpan max_history entry terakhir.
+    
+    Saat startup hanya bagian selain history yang di-parse; array history
+    di-parse di background (entry terakhir dulu) lewat start_history_loader().
+    """
+    HISTORY_MARKER = '\n    "history": ['
+    ENTRY_SEPARATOR = '\n        },\n        {'
+    TAIL_ENTRIES = 120  # Entry terbaru yang di-parse duluan
+    
+    def __init__(self, filename='monitor_data.json', series_filename='monitor_history.bin'):
         self.filename = filename
+        self.tmp_filename = f"{filename}.tmp"
+        self.history_text: Optional[str] = None  # Array history yang belum di-parse
+        self.history_source = filename  # File asal history_text
         self.data = self.load()
+        self.history_complete = self.history_text is None
+        # Loader async vs finish_history_sync() (shutdown): hanya satu yang boleh merge
+        self.history_lock = threading.Lock()
+        self.history_event: Optional[asyncio.Event] = None
+        self.history_task: Optional[asyncio.Task] = None
+        self.series = SeriesStore(series_filename)
+        if self.history_complete:
+            self.series.backfill(self.data["history"])
+        self.max_history = 1000  # Bisa diturunkan oleh ResourceGovernor
+        # Naik tiap ada history/alert baru, dipakai sebagai key cache response
+        self.history_seq = 0
+        self.alert_seq = 0
+        self.dirty = False
+        self.write_behind = False
+        self.flush_lock: Optional[asyncio.Lock] = None
+        self.flusher_task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.last_flush_duration = 0.0
+    
+    def _split_history(self, text: str) -> Optional[tuple]:
+        """(data tanpa history, teks array history) dari file yang ditulis json.dump(indent=4)"""
+        start = text.find(self.HISTORY_MARKER)
+        if start < 0:
+            return None
+        array_start = start + len(self.HISTORY_MARKER) - 1
+        # Entry history ter-indent lebih dalam, jadi ']' level atas pertama adalah penutupnya
+        close = text.find('\n    ]', array_start)
+        if text.startswith('[]', array_start) or close < 0:
+            return None
+        array_end = close + len('\n    ]')
+        data = json.loads(text[:array_start] + '[]' + text[array_end:])
+        return data, text[array_start:array_end]
+    
+    def _read(self, filename: str) -> Optional[dict]:
+        try:
+            with open(filename, 'r') as f:
+                text = f.read()
+            split = self._split_history(text)
+            if split is None:
+                return json.loads(text)
+            data, self.history_text = split
+            self.history_source = filename
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading {filename}: {e}")
+            return None
     
     def load(self) -> dict:
-        """Load data dari file"""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
+        """Load data dari file, fallback ke .tmp jika file utama rusak"""
+        data = self._read(self.filename)
+        if data is None and os.path.exists(self.tmp_filename):
+            # Crash saat menulis in-place: .tmp berisi salinan lengkap terakhir
+            data = self._read(self.tmp_filename)
+            if data is not None:
+                print(f"Recovered data from {self.tmp_filename}")
+        if data is None and os.path.exists(self.filename):
+            # Simpan file rusak supaya tidak langsung tertimpa data kosong
+            self._preserve_corrupt(self.filename, "Data file unreadable")
+        if data is not None:
+            return data
         return {
             "history": [],
             "alerts": [],
@@ -57,85 +594,3619 @@ class DataStore:
             "stats_summary": {}
         }
     
-    def save(self):
-        """Save data ke file"""
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.data, f, indent=4)
-        except Exception as e:
-            print(f"Error saving data: {e}")
+    def _preserve_corrupt(self, filename: str, reason: str):
+        """Salin file rusak ke .corrupt-<ts> sebelum flush berikutnya menimpanya"""
+        corrupt = f"{filename}.corrupt-{int(time.time())}"
+        try:
+            with open(filename, 'rb') as src, open(corrupt, 'wb') as dst:
+                dst.write(src.read())
+            print(f"{reason}, kept a copy at {corrupt}")
+        except OSError as e:
+            print(f"Error preserving corrupt data file: {e}")
+    
+    def _history_failed(self, error: ValueError):
+        """History tidak bisa di-parse: file asli disimpan, history lanjut dari yang sudah ada"""
+        print(f"Error loading history: {error}")
+        # Loader selalu selesai sebelum flush pertama, jadi file asal belum tertimpa
+        self._preserve_corrupt(self.history_source, "History unreadable")
+    
+    def _parse_tail(self, text: str) -> tuple:
+        """(entry terbaru, teks array sisanya) dari history yang belum di-parse"""
+        split = len(text)
+        for _ in range(self.TAIL_ENTRIES):
+            split = text.rfind(self.ENTRY_SEPARATOR, 0, split)
+            if split < 0:
+                return json.loads(text), None
+        tail = json.loads('[\n        {' + text[split + len(self.ENTRY_SEPARATOR):])
+        return tail, text[:split] + '\n        }\n    ]'
+    
+    def _merge_history(self, older: list):
+        """Sisipkan history hasil load di depan entry yang ditambahkan sejak startup"""
+        self.data["history"] = (older + self.data["history"])[-self.max_history:]
+        self.history_seq += 1
+    
+    async def _parse_history(self) -> bool:
+        """Parse dan merge history bertahap; False jika finish_history_sync() sudah mendahului"""
+        try:
+            tail, rest = await asyncio.to_thread(self._parse_tail, self.history_text)
+            with self.history_lock:
+                # finish_history_sync() mungkin sudah merge semuanya selama parse
+                if self.history_complete:
+                    return False
+                self._merge_history(tail)
+                # Yang belum di-merge tinggal sisanya, kalau-kalau shutdown di tengah jalan
+                self.history_text = rest
+            STARTUP_TIMER.mark(f"history tail loaded ({len(tail)} entries)")
+            if rest is not None:
+                older = await asyncio.to_thread(json.loads, rest)
+                with self.history_lock:
+                    if self.history_complete:
+                        return False
+                    self._merge_history(older)
+        except ValueError as e:
+            with self.history_lock:
+                if self.history_complete:
+                    return False
+                self._history_failed(e)
+        with self.history_lock:
+            self.history_text = None
+            self.history_complete = True
+        return True
+    
+    async def _load_history(self):
+        if await self._parse_history():
+            self.series.backfill(self.data["history"])
+        self.history_event.set()
+        STARTUP_TIMER.mark(f"history loaded ({len(self.data['history'])} entries)")
+    
+    def start_history_loader(self):
+        """Mulai parse history di background (dipanggil dari dalam event loop)"""
+        if self.history_event is None:
+            self.history_event = asyncio.Event()
+        if self.history_complete:
+            self.history_event.set()
+        elif self.history_task is None:
+            self.history_task = asyncio.create_task(self._load_history())
+    
+    def history_covers(self, seconds: float) -> bool:
+        """True jika history yang sudah di-load mencakup window ini"""
+        if self.history_complete:
+            return True
+        history = self.data["history"]
+        if not history:
+            return False
+        cutoff = (datetime.datetime.now() - datetime.timedelta(seconds=seconds)).isoformat()
+        return history[0]["timestamp"] <= cutoff
+    
+    async def wait_history(self, seconds: Optional[float] = None):
+        """Tunggu history selesai di-load, kecuali bagian yang sudah ada cukup"""
+        if seconds is not None and self.history_covers(seconds):
+            return
+        self.start_history_loader()
+        await self.history_event.wait()
+    
+    def finish_history_sync(self):
+        """Parse sisa history secara sinkron (shutdown sebelum loader selesai)"""
+        with self.history_lock:
+            if self.history_complete:
+                return
+            try:
+                # Hanya bagian yang belum di-merge oleh loader
+                if self.history_text is not None:
+                    self._merge_history(json.loads(self.history_text))
+            except ValueError as e:
+                self._history_failed(e)
+            self.history_text = None
+            self.history_complete = True
+        self.series.backfill(self.data["history"])
+    
+    def save(self):
+        """Tandai dirty (write-behind), atau tulis langsung jika flusher belum jalan"""
+        if self.write_behind:
+            self.dirty = True
+        else:
+            self.flush()
+    
+    def _snapshot(self) -> dict:
+        """Salinan dangkal untuk diserialisasi di thread lain.
+        
+        Entry history/alert tidak diubah setelah ditambahkan, jadi cukup
+        list dan dict level atas yang disalin.
+        """
+        snapshot = {}
+        for key, value in self.data.items():
+            if isinstance(value, list):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = dict(value)
+            snapshot[key] = value
+        # History ditulis paling akhir supaya startup bisa melewatinya
+        snapshot["history"] = snapshot.pop("history", [])
+        return snapshot
+    
+    def _write(self, data: dict):
+        """Tulis ke .tmp, fsync, lalu rename atomik ke file utama"""
+        started = time.perf_counter()
+        # Block series ditulis dulu; jika crash di antaranya, backfill dari JSON lama mengisi ulang
+        self.series.write_pending()
+        if time.time() - self.series.last_compact > SeriesStore.COMPACT_INTERVAL:
+            self.series.compact(CONFIG["history_retention_days"] * 86400)
+        with open(self.tmp_filename, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.replace(self.tmp_filename, self.filename)
+        except OSError:
+            # File bind-mount (Docker) tidak bisa di-rename: tulis ulang in-place,
+            # .tmp tetap ada sebagai cadangan untuk load() jika crash di tengah
+            with open(self.tmp_filename, 'rb') as src, open(self.filename, 'wb') as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+        else:
+            directory = os.open(os.path.dirname(os.path.abspath(self.filename)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self.flushes += 1
+        self.last_flush_duration = time.perf_counter() - started
+    
+    def flush(self, seal: bool = False):
+        """Tulis sekarang secara sinkron (startup/shutdown)"""
+        # History dulu, supaya backfill masuk sebelum block di-seal
+        self.finish_history_sync()
+        if seal:
+            # Shutdown: block yang belum penuh ikut ditulis
+            self.series.seal_all()
+        self.dirty = False
+        try:
+            self._write(self._snapshot())
+        except Exception as e:
+            self.dirty = True
+            print(f"Error saving data: {e}")
+    
+    async def flush_async(self):
+        """Tulis sekarang di worker thread, tanpa menahan event loop"""
+        if self.flush_lock is None:
+            self.flush_lock = asyncio.Lock()
+        # Jangan menimpa file sebelum history lama selesai di-load
+        await self.wait_history()
+        async with self.flush_lock:
+            # Mutasi setelah titik ini menandai dirty lagi untuk flush berikutnya
+            self.dirty = False
+            snapshot = self._snapshot()
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except Exception as e:
+                self.dirty = True
+                print(f"Error saving data: {e}")
+    
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(max(CONFIG["save_interval"], 1))
+            if self.dirty:
+                await self.flush_async()
+    
+    def start_flusher(self):
+        """Aktifkan write-behind (dipanggil dari dalam event loop)"""
+        self.write_behind = True
+        if self.flusher_task is None or self.flusher_task.done():
+            self.flusher_task = asyncio.create_task(self._flusher())
+    
+    def add_history(self, stats: dict):
+        """Tambah history entry (max max_history)"""
+        now = datetime.datetime.now()
+        self.data["history"].append({
+            "timestamp": now.isoformat(),
+            "stats": stats
+        })
+        if self.history_complete:
+            self.series.append(int(now.timestamp()), stats)
+        # Selama history lama belum di-load, series diisi lewat backfill setelahnya:
+        # sample lebih baru yang masuk duluan membuat backfill melewati entry lama
+        # Keep only last max_history entries
+        if len(self.data["history"]) > self.max_history:
+            self.data["history"] = self.data["history"][-self.max_history:]
+        self.history_seq += 1
+        self.save()
+    
+    def add_alert(self, alert_type: str, message: str, value: float):
+        """Tambah alert log"""
+        self.data["alerts"].append({
+            "timestamp": datetime.datetime.now().isoformat(),
+            "type": alert_type,
+            "message": message,
+            "value": value
+        })
+        if len(self.data["alerts"]) > 500:
+            self.data["alerts"] = self.data["alerts"][-500:]
+        self.alert_seq += 1
+        self.save()
+    
+    def add_audit_log(self, user: str, command: str, success: bool):
+        """Tambah audit log"""
+        self.data["audit_logs"].append({
+            "timestamp": datetime.datetime.now().isoformat(),
+            "user": user,
+            "command": command,
+            "success": success
+        })
+        if len(self.data["audit_logs"]) > 500:
+            self.data["audit_logs"] = self.data["audit_logs"][-500:]
+        self.save()
+    
+    @staticmethod
+    def _history_start(history: list, cutoff: str) -> int:
+        """Index entry pertama setelah cutoff (binary search, history terurut waktu)"""
+        # Timestamp ISO dengan format sama bisa dibandingkan sebagai string
+        lo, hi = 0, len(history)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if history[mid]["timestamp"] > cutoff:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+    
+    def get_history(self, hours: int = 24) -> list:
+        """Get history untuk X jam terakhir"""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat()
+        history = self.data["history"]
+        return history[self._history_start(history, cutoff):]
+
+class NetworkMonitor:
+    def __init__(self):
+        self.last_bytes_sent = 0
+        self.last_bytes_recv = 0
+        self.last_check_time = time.time()
+        self.current_sent_rate = 0
+        self.current_recv_rate = 0
+        self.peak_sent_rate = 0
+        self.peak_recv_rate = 0
+        
+    def update_rates(self, bytes_sent, bytes_recv):
+        current_time = time.time()
+        time_diff = current_time - self.last_check_time
+        
+        if self.last_bytes_sent > 0 and time_diff > 0:
+            sent_diff = bytes_sent - self.last_bytes_sent
+            recv_diff = bytes_recv - self.last_bytes_recv
+            
+            self.current_sent_rate = sent_diff / time_diff / 1024  # KB/s
+            self.current_recv_rate = recv_diff / time_diff / 1024  # KB/s
+            
+            # Update peaks
+            self.peak_sent_rate = max(self.peak_sent_rate, self.current_sent_rate)
+            self.peak_recv_rate = max(self.peak_recv_rate, self.current_recv_rate)
+        
+        self.last_bytes_sent = bytes_sent
+        self.last_bytes_recv = bytes_recv
+        self.last_check_time = current_time
+
+class ProcFile:
+    """File /proc yang tetap terbuka, dibaca ulang dengan pread ke buffer yang dipakai ulang"""
+    def __init__(self, path: str, size: int = 4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buffer = bytearray(size)
+    
+    def read(self) -> bytes:
+        """Baca isi file dari offset 0"""
+        while True:
+            n = os.preadv(self.fd, [self.buffer], 0)
+            if n < len(self.buffer):
+                return bytes(memoryview(self.buffer)[:n])
+            # Buffer kurang besar (misal /proc/stat di host banyak core)
+            self.buffer = bytearray(len(self.buffer) * 2)
+    
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+class ProcFastPath:
+    """Reader /proc cepat untuk sampler: parse field yang dipakai saja, tanpa namedtuple psutil"""
+    SECTOR_SIZE = 512
+    MEMINFO_KEYS = (b'MemTotal:', b'MemFree:', b'MemAvailable:', b'Buffers:', b'Cached:', b'SwapTotal:', b'SwapFree:')
+    
+    def __init__(self):
+        self.files: Dict[str, ProcFile] = {}
+        self.last_cpu = None
+        self.last_per_cpu = []
+        self.block_devices = set()
+        self.block_devices_at = 0
+    
+    @staticmethod
+    def available() -> bool:
+        """Hanya di Linux dengan os.preadv"""
+        return hasattr(os, 'preadv') and os.path.exists('/proc/stat')
+    
+    def _read(self, name: str) -> bytes:
+        proc_file = self.files.get(name)
+        if proc_file is None:
+            proc_file = ProcFile(f'/proc/{name}')
+            self.files[name] = proc_file
+        return proc_file.read()
+    
+    def cpu_times(self) -> tuple:
+        """(total, [per_cpu]) dalam bentuk (busy, total) jiffies"""
+        total = None
+        per_cpu = []
+        for line in self._read('stat').split(b'\n'):
+            if not line.startswith(b'cpu'):
+                break
+            fields = line.split()
+            values = [int(v) for v in fields[1:9]]
+            # guest/guest_nice sudah termasuk di user/nice, jadi tidak dihitung
+            tot = sum(values)
+            busy = tot - values[3] - (values[4] if len(values) > 4 else 0)
+            if fields[0] == b'cpu':
+                total = (busy, tot)
+            else:
+                per_cpu.append((busy, tot))
+        return total, per_cpu
+    
+    @staticmethod
+    def _percent(last: tuple, current: tuple) -> float:
+        busy_delta = current[0] - last[0]
+        total_delta = current[1] - last[1]
+        if total_delta <= 0:
+            return 0.0
+        return round(min(max(busy_delta / total_delta * 100, 0.0), 100.0), 1)
+    
+    @staticmethod
+    def psutil_busy_total(times) -> tuple:
+        """(busy, total) dari psutil.cpu_times() dengan rumus psutil (guest tidak dihitung)"""
+        total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+        return total - times.idle - getattr(times, 'iowait', 0), total
+    
+    def cpu_percent(self) -> tuple:
+        """(usage, per_core) sejak panggilan sebelumnya, sama seperti psutil.cpu_percent(None)"""
+        total, per_cpu = self.cpu_times()
+        usage = self._percent(self.last_cpu, total) if self.last_cpu else 0.0
+        if len(self.last_per_cpu) == len(per_cpu):
+            per_core = [self._percent(last, cur) for last, cur in zip(self.last_per_cpu, per_cpu)]
+        else:
+            per_core = [0.0] * len(per_cpu)
+        self.last_cpu = total
+        self.last_per_cpu = per_cpu
+        return usage, per_core
+    
+    def meminfo(self) -> dict:
+        """Memory dan swap dalam bytes + persentase (rumus sama dengan psutil)"""
+        values = {}
+        for line in self._read('meminfo').split(b'\n'):
+            key, _, rest = line.partition(b' ')
+            if key in self.MEMINFO_KEYS:
+                values[key] = int(rest.split()[0]) * 1024
+                if len(values) == len(self.MEMINFO_KEYS):
+                    break
+        
+        total = values[b'MemTotal:']
+        available = values.get(b'MemAvailable:', values[b'MemFree:'] + values.get(b'Buffers:', 0) + values.get(b'Cached:', 0))
+        swap_total = values.get(b'SwapTotal:', 0)
+        swap_used = swap_total - values.get(b'SwapFree:', 0)
+        return {
+            "total": total,
+            "available": available,
+            "used": total - available,
+            "percent": round((total - available) / total * 100, 1) if total else 0.0,
+            "swap_total": swap_total,
+            "swap_used": swap_used,
+            "swap_percent": round(swap_used / swap_total * 100, 1) if swap_total else 0.0
+        }
+    
+    def loadavg(self) -> tuple:
+        """Load average 1/5/15 menit"""
+        fields = self._read('loadavg').split()
+        return float(fields[0]), float(fields[1]), float(fields[2])
+    
+    def net_bytes(self) -> tuple:
+        """(bytes_sent, bytes_recv) semua interface, sama seperti psutil.net_io_counters()"""
+        sent = recv = 0
+        for line in self._read('net/dev').split(b'\n')[2:]:
+            _, colon, rest = line.rpartition(b':')
+            if not colon:
+                continue
+            fields = rest.split()
+            recv += int(fields[0])
+            sent += int(fields[8])
+        return sent, recv
+    
+    def disk_bytes(self) -> tuple:
+        """(read_bytes, write_bytes) untuk device di /sys/block (tanpa partisi)"""
+        now = time.time()
+        if now - self.block_devices_at > 60:
+            try:
+                self.block_devices = {name.encode() for name in os.listdir('/sys/block')}
+            except OSError:
+                self.block_devices = set()
+            self.block_devices_at = now
+        
+        read_bytes = write_bytes = 0
+        for line in self._read('diskstats').split(b'\n'):
+            fields = line.split()
+            if len(fields) < 14 or fields[2].replace(b'/', b'!') not in self.block_devices:
+                continue
+            read_bytes += int(fields[5]) * self.SECTOR_SIZE
+            write_bytes += int(fields[9]) * self.SECTOR_SIZE
+        return read_bytes, write_bytes
+    
+    def verify(self) -> List[str]:
+        """Bandingkan pembacaan dengan psutil, return daftar yang tidak cocok"""
+        problems = []
+        
+        def close_enough(a, b, rel=0.01, absolute=0):
+            return abs(a - b) <= max(abs(b) * rel, absolute)
+        
+        try:
+            memory = self.meminfo()
+            if memory["total"] != psutil.virtual_memory().total:
+                problems.append("meminfo total")
+            if memory["swap_total"] != psutil.swap_memory().total:
+                problems.append("swap total")
+            if not close_enough(memory["percent"], psutil.virtual_memory().percent, absolute=2):
+                problems.append("memory percent")
+            
+            if not all(close_enough(a, b, absolute=0.5) for a, b in zip(self.loadavg(), os.getloadavg())):
+                problems.append("loadavg")
+            
+            # Persentase sejak boot dari counter yang sama: jiffies /proc vs detik psutil
+            total, per_cpu = self.cpu_times()
+            psutil_total = self.psutil_busy_total(psutil.cpu_times())
+            psutil_per_cpu = [self.psutil_busy_total(t) for t in psutil.cpu_times(percpu=True)]
+            if len(per_cpu) != psutil.cpu_count(logical=True) or len(per_cpu) != len(psutil_per_cpu):
+                problems.append("cpu count")
+            if not close_enough(self._percent((0, 0), total), self._percent((0, 0), psutil_total), absolute=1):
+                problems.append("cpu percent")
+            if not all(
+                close_enough(self._percent((0, 0), ours), self._percent((0, 0), theirs), absolute=1)
+                for ours, theirs in zip(per_cpu, psutil_per_cpu)
+            ):
+                problems.append("per-core cpu percent")
+            
+            sent, recv = self.net_bytes()
+            net_io = psutil.net_io_counters()
+            if not (close_enough(sent, net_io.bytes_sent, absolute=1024**2) and
+                    close_enough(recv, net_io.bytes_recv, absolute=1024**2)):
+                problems.append("net/dev bytes")
+            
+            read_bytes, write_bytes = self.disk_bytes()
+            disk_io = psutil.disk_io_counters()
+            if disk_io and not (close_enough(read_bytes, disk_io.read_bytes, absolute=1024**2) and
+                                close_enough(write_bytes, disk_io.write_bytes, absolute=1024**2)):
+                problems.append("diskstats bytes")
+        except Exception as e:
+            problems.append(f"error: {e}")
+        
+        return problems
+    
+    def close(self):
+        for proc_file in self.files.values():
+            proc_file.close()
+        self.files.clear()
+
+class CoreHistory:
+    """Ring buffer usage per core: satu baris bytes lebar tetap per sample.
+    
+    Nilai disimpan sebagai uint8 (unit setengah persen), jadi 128 core x 900
+    sample cukup ~115 KB tanpa objek float per nilai. Sejak kapan tiap core
+    di atas threshold core_hot dilacak incremental saat append.
+    """
+    SCALE = 2  # Unit per persen
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(capacity, 1)
+        self._reset(0)
+    
+    def _reset(self, cores: int):
+        self.cores = cores
+        self.buffer = bytearray(self.capacity * cores)
+        self.timestamps = [0.0] * self.capacity
+        self.head = 0  # Index baris berikutnya
+        self.count = 0
+        self.hot_since: List[Optional[float]] = [None] * cores
+    
+    def append(self, timestamp: float, per_core: List[float]):
+        if len(per_core) != self.cores:
+            # Jumlah core berubah (hotplug): mulai ulang
+            self._reset(len(per_core))
+        scale = self.SCALE
+        limit = 100 * scale
+        row = bytes(min(int(value * scale + 0.5), limit) for value in per_core)
+        start = self.head * self.cores
+        self.buffer[start:start + self.cores] = row
+        self.timestamps[self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        
+        hot = CONFIG['thresholds'].get('core_hot', 95) * scale
+        if max(row, default=0) < hot:
+            # Kasus umum: tidak ada core panas, cukup reset sekali
+            if any(since is not None for since in self.hot_since):
+                self.hot_since = [None] * self.cores
+            return
+        hot_since = self.hot_since
+        for core, value in enumerate(row):
+            if value >= hot:
+                if hot_since[core] is None:
+                    hot_since[core] = timestamp
+            else:
+                hot_since[core] = None
+    
+    def rows(self, seconds: float) -> List[memoryview]:
+        """Baris sample selama X detik terakhir, terbaru dulu"""
+        cutoff = time.time() - seconds
+        view = memoryview(self.buffer)
+        rows = []
+        for offset in range(1, self.count + 1):
+            index = (self.head - offset) % self.capacity
+            if self.timestamps[index] < cutoff:
+                break
+            rows.append(view[index * self.cores:(index + 1) * self.cores])
+        return rows
+    
+    def peaks(self, seconds: float) -> List[float]:
+        """Usage tertinggi per core selama X detik terakhir (%)"""
+        rows = self.rows(seconds)
+        if not rows:
+            return []
+        peak = bytes(rows[0])
+        for row in rows[1:]:
+            peak = bytes(map(max, peak, row))
+        return [value / self.SCALE for value in peak]
+    
+    def pinned(self, seconds: float, now: float = None) -> List[tuple]:
+        """(core, sejak) untuk core yang terus di atas core_hot minimal X detik"""
+        now = now or time.time()
+        return [
+            (core, since) for core, since in enumerate(self.hot_since)
+            if since is not None and now - since >= seconds
+        ]
+    
+    def latest(self, core: int) -> float:
+        if not self.count:
+            return 0.0
+        index = (self.head - 1) % self.capacity
+        return self.buffer[index * self.cores + core] / self.SCALE
+    
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
+
+class MetricSampler:
+    """Sampling metric murah dengan interval adaptif, terpisah dari refresh embed"""
+    NEAR_RATIO = 0.9  # Dianggap mendekati threshold di atas 90% dari nilainya
+    IDLE_RATIO = 0.5  # Dianggap idle jika semua metric di bawah 50% threshold
+    HOT_HOLD = 30  # Tetap sampling cepat selama 30 detik setelah mendekati threshold
+    
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.buffers: Dict[str, deque] = {}
+        self.per_core: List[float] = []
+        self.interval = CONFIG["sample_interval_max"]
+        self.slowdown = 1  # Pengali interval & pembagi buffer saat over budget
+        self.core_history = CoreHistory(self._buffer_len())
+        self.hot_until = 0
+        self.last_sample_time = 0
+        self.sample_count = 0
+        self.running = False
+        self.last_disk_io = None
+        
+        # Fast path /proc hanya dipakai jika hasilnya cocok dengan psutil
+        self.fast_path: Optional[ProcFastPath] = None
+        if CONFIG["fast_proc"] and ProcFastPath.available():
+            fast_path = ProcFastPath()
+            problems = fast_path.verify()
+            if problems:
+                print(f"/proc fast path disabled, mismatch with psutil: {', '.join(problems)}")
+                fast_path.close()
+            else:
+                self.fast_path = fast_path
+        
+        # Prime cpu_percent supaya sample pertama tidak 0.0
+        if self.fast_path:
+            self.fast_path.cpu_percent()
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+    
+    def _buffer_len(self) -> int:
+        """Jumlah sample maksimum per metric"""
+        return max(1, int(CONFIG["sample_window"] / max(CONFIG["sample_interval_min"], 1) / self.slowdown))
+    
+    def _sample_fast(self, values: dict):
+        """Sample CPU, memory, network dan disk IO lewat /proc fast path"""
+        values["cpu"], self.per_core = self.fast_path.cpu_percent()
+        memory = self.fast_path.meminfo()
+        values["memory"] = memory["percent"]
+        values["swap"] = memory["swap_percent"]
+        bytes_sent, bytes_recv = self.fast_path.net_bytes()
+        self._update_network(values, bytes_sent, bytes_recv)
+        self._update_disk_io(values, *self.fast_path.disk_bytes())
+    
+    def _update_network(self, values: dict, bytes_sent: int, bytes_recv: int):
+        network = self.monitor.network_monitor
+        network.update_rates(bytes_sent, bytes_recv)
+        values["net_sent"] = network.current_sent_rate
+        values["net_recv"] = network.current_recv_rate
+    
+    def _update_disk_io(self, values: dict, read_bytes: int, write_bytes: int):
+        """Rate disk IO (KB/s) dari selisih counter"""
+        now = time.time()
+        if self.last_disk_io:
+            last_time, last_read, last_write = self.last_disk_io
+            time_diff = now - last_time
+            if time_diff > 0:
+                values["disk_read"] = max(read_bytes - last_read, 0) / time_diff / 1024
+                values["disk_write"] = max(write_bytes - last_write, 0) / time_diff / 1024
+        self.last_disk_io = (now, read_bytes, write_bytes)
+    
+    def sample(self) -> dict:
+        """Ambil satu sample metric murah"""
+        values = {}
+        if self.fast_path:
+            try:
+                self._sample_fast(values)
+                return self._sample_cached(values)
+            except Exception as e:
+                print(f"/proc fast path failed, falling back to psutil: {e}")
+                self.fast_path.close()
+                self.fast_path = None
+                values = {}
+        
+        try:
+            values["cpu"] = psutil.cpu_percent(interval=None)
+            self.per_core = psutil.cpu_percent(interval=None, percpu=True)
+        except Exception as e:
+            print(f"Error sampling CPU: {e}")
+        
+        try:
+            values["memory"] = psutil.virtual_memory().percent
+            values["swap"] = psutil.swap_memory().percent
+        except Exception as e:
+            print(f"Error sampling memory: {e}")
+        
+        try:
+            net_io = psutil.net_io_counters()
+            self._update_network(values, net_io.bytes_sent, net_io.bytes_recv)
+            disk_io = psutil.disk_io_counters()
+            if disk_io:
+                self._update_disk_io(values, disk_io.read_bytes, disk_io.write_bytes)
+        except Exception:
+            pass
+        
+        return self._sample_cached(values)
+    
+    def _sample_cached(self, values: dict) -> dict:
+        """Tambahkan metric dari cache collector"""
+        # Disk dan temperature diambil dari cache collector supaya
+        # mount yang hang tidak menahan loop sampling
+        disk = self.monitor.get_disk_info()
+        if disk["total"] > 0:
+            values["disk"] = disk["percentage"]
+        
+        temperature = self.monitor.get_temperature()["current"]
+        if temperature > 0:
+            values["temperature"] = temperature
+        
+        return values
+    
+    def record(self, values: dict, timestamp: float = None):
+        """Simpan sample ke ring buffer"""
+        timestamp = timestamp or time.time()
+        maxlen = self._buffer_len()
+        for metric, value in values.items():
+            buffer = self.buffers.get(metric)
+            if buffer is None or buffer.maxlen != maxlen:
+                buffer = deque(buffer or [], maxlen=maxlen)
+                self.buffers[metric] = buffer
+            buffer.append((timestamp, value))
+        if self.per_core:
+            self.core_history.append(timestamp, self.per_core)
+        self.last_sample_time = timestamp
+        self.sample_count += 1
+    
+    def next_interval(self, values: dict) -> int:
+        """Hitung interval berikutnya berdasarkan jarak ke threshold"""
+        fast = CONFIG["sample_interval_min"]
+        slow = max(CONFIG["sample_interval_max"], fast)
+        thresholds = CONFIG["thresholds"]
+        
+        ratios = [
+            values[metric] / thresholds[metric]
+            for metric in thresholds
+            if metric in values and thresholds[metric] > 0
+        ]
+        now = time.time()
+        if any(ratio >= self.NEAR_RATIO for ratio in ratios):
+            self.hot_until = now + self.HOT_HOLD
+        
+        if now < self.hot_until:
+            return fast
+        if all(ratio < self.IDLE_RATIO for ratio in ratios):
+            return slow
+        return max(fast, (fast + slow) // 2)
+    
+    def window(self, metric: str, seconds: float) -> list:
+        """Ambil nilai metric selama X detik terakhir"""
+        buffer = self.buffers.get(metric)
+        if not buffer:
+            return []
+        cutoff = time.time() - seconds
+        values = []
+        for timestamp, value in reversed(buffer):
+            if timestamp < cutoff:
+                break
+            values.append(value)
+        return values
+    
+    def latest(self, metric: str, default=None):
+        """Nilai sample terakhir"""
+        buffer = self.buffers.get(metric)
+        return buffer[-1][1] if buffer else default
+    
+    def peak(self, metric: str, seconds: float, default=None):
+        """Nilai tertinggi selama X detik terakhir"""
+        values = self.window(metric, seconds)
+        return max(values) if values else default
+    
+    def average(self, metric: str, seconds: float, default=None):
+        """Rata-rata selama X detik terakhir"""
+        values = self.window(metric, seconds)
+        return sum(values) / len(values) if values else default
+    
+    async def run(self):
+        """Loop sampling, tick disejajarkan ke batas wall-clock"""
+        self.running = True
+        try:
+            while True:
+                try:
+                    values = self.sample()
+                    self.record(values)
+                    self.interval = self.next_interval(values) * self.slowdown
+                except Exception as e:
+                    print(f"Error in sampler: {e}")
+                
+                # Sleep sampai kelipatan interval berikutnya supaya tidak drift
+                now = time.time()
+                delay = self.interval - (now % self.interval)
+                if delay < 0.05:
+                    delay += self.interval
+                await asyncio.sleep(delay)
+        finally:
+            self.running = False
+
+class Collector:
+    """Base class untuk collector metric.
+    
+    Subclass menentukan nama, interval, timeout dan executor:
+    - "loop": collect() dipanggil langsung di event loop (harus murah atau async)
+    - "thread": collect() dijalankan di thread pool
+    - "subprocess": command() dijalankan sebagai subprocess lalu hasilnya di-parse()
+    """
+    name = "collector"
+    interval = 30
+    timeout = 10
+    executor = "thread"
+    
+    def __init__(self, monitor=None):
+        self.monitor = monitor
+    
+    def enabled(self) -> bool:
+        """Collector hanya jalan jika enabled"""
+        return True
+    
+    def default(self):
+        """Nilai sebelum collect pertama berhasil"""
+        return {}
+    
+    def collect(self):
+        """Ambil data (executor loop/thread)"""
+        raise NotImplementedError
+    
+    def command(self) -> Optional[List[str]]:
+        """Command untuk executor subprocess"""
+        return None
+    
+    def parse(self, returncode: int, stdout: str):
+        """Parse output command untuk executor subprocess"""
+        raise NotImplementedError
+
+class CpuCollector(Collector):
+    """Info CPU statis + frekuensi (usage dari sampler)"""
+    name = "cpu"
+    interval = 10
+    timeout = 5
+    executor = "loop"
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.model = None
+    
+    def default(self):
+        return {
+            "model": "Unknown Processor",
+            "cores_physical": 1,
+            "cores_logical": 2,
+            "frequency": "N/A"
+        }
+    
+    def _read_model(self) -> str:
+        """Baca nama CPU sekali saja"""
+        try:
+            with open('/proc/cpuinfo', 'r') as f:
+                for line in f:
+                    if 'model name' in line:
+                        return line.split(':')[1].strip()
+        except:
+            return platform.processor() or f"{platform.machine()} Processor"
+        return "Unknown Processor"
+    
+    def collect(self) -> dict:
+        if self.model is None:
+            self.model = self._read_model()
+        
+        cpu_freq = psutil.cpu_freq()
+        cpu_count_physical = psutil.cpu_count(logical=False)
+        cpu_count_logical = psutil.cpu_count(logical=True)
+        
+        return {
+            "model": self.model,
+            "cores_physical": cpu_count_physical or cpu_count_logical // 2,
+            "cores_logical": cpu_count_logical,
+            "frequency": cpu_freq.current if cpu_freq else "N/A"
+        }
+
+class MemoryCollector(Collector):
+    name = "memory"
+    interval = 5
+    timeout = 5
+    executor = "loop"
+    
+    def default(self):
+        return {
+            "total": 0,
+            "used": 0,
+            "available": 0,
+            "percentage": 0,
+            "swap_total": 0,
+            "swap_used": 0,
+            "swap_percentage": 0
+        }
+    
+    def collect(self) -> dict:
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        
+        return {
+            "total": memory.total / (1024**3),
+            "used": memory.used / (1024**3),
+            "available": memory.available / (1024**3),
+            "percentage": memory.percent,
+            "swap_total": swap.total / (1024**3),
+            "swap_used": swap.used / (1024**3),
+            "swap_percentage": swap.percent
+        }
+
+class DiskCollector(Collector):
+    """disk_usage bisa hang di mount NFS, jadi jalan di thread"""
+    name = "disk"
+    interval = 10
+    timeout = 10
+    executor = "thread"
+    
+    def default(self):
+        return {
+            "total": 0,
+            "used": 0,
+            "free": 0,
+            "percentage": 0,
+            "total_display": "0 GB",
+            "used_display": "0 GB",
+            "read_bytes": 0,
+            "write_bytes": 0
+        }
+    
+    def collect(self) -> dict:
+        try:
+            disk = psutil.disk_usage('/')
+            io_counters = psutil.disk_io_counters()
+        except Exception:
+            disk = psutil.disk_usage('C:\\')
+            io_counters = None
+        
+        total_gb = disk.total / (1024**3)
+        used_gb = disk.used / (1024**3)
+        
+        if total_gb > 1000:
+            total_display = f"{total_gb / 1024:.2f} TB"
+            used_display = f"{used_gb:.2f} GB"
+        else:
+            total_display = f"{total_gb:.2f} GB"
+            used_display = f"{used_gb:.2f} GB"
+        
+        return {
+            "total": total_gb,
+            "used": used_gb,
+            "free": disk.free / (1024**3),
+            "percentage": (disk.used / disk.total) * 100,
+            "total_display": total_display,
+            "used_display": used_display,
+            "read_bytes": io_counters.read_bytes if io_counters else 0,
+            "write_bytes": io_counters.write_bytes if io_counters else 0
+        }
+
+class DirSizeCollector(Collector):
+    """Scan ukuran direktori di disk_scan_roots secara incremental di background.
+    
+    Tiap direktori di-cache dengan mtime-nya: jika mtime tidak berubah, isi
+    direktori tidak di-list ulang (hanya subdirektori yang di-stat untuk cek
+    perubahan di bawahnya). File yang membesar di tempat tidak mengubah mtime
+    direktori, jadi tiap FULL_EVERY scan semua direktori di-list ulang.
+    Scan dibatasi disk_scan_rate entry/detik dan tidak menyeberang filesystem.
+    
+    Scan throttled bisa berjalan lama, jadi dijalankan di thread daemon sendiri
+    supaya tidak menahan thread pool collector; collect() hanya memulai scan
+    tiap disk_scan_interval dan mengembalikan hasil terakhir.
+    """
+    name = "dirsize"
+    executor = "loop"
+    interval = 60  # Cek scan selesai; scan baru dimulai tiap disk_scan_interval
+    
+    FULL_EVERY = 6  # Scan; sekali full rescan untuk tangkap file yang membesar
+    THROTTLE_BATCH = 256  # Entry per cek throttle
+    DOMINANT_RATIO = 0.8  # Direktori disembunyikan jika satu anaknya >= rasio ini
+    TOP_N = 10
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        # path -> (mtime_ns, ukuran file langsung, tuple subdirektori)
+        self.cache: Dict[str, tuple] = {}
+        self.sizes: Dict[str, int] = {}
+        self.previous: Dict[str, int] = {}
+        self.previous_time = None
+        self.scans = 0
+        self.thread: Optional[threading.Thread] = None
+        self.scan_started = 0.0
+        self.latest: Optional[dict] = None
+        self.scan_error: Optional[str] = None
+    
+    def enabled(self) -> bool:
+        return bool(CONFIG["disk_scan_roots"])
+    
+    def default(self):
+        return {"scanned": None, "roots": [], "top": [], "growth": [], "stats": {}}
+    
+    def _throttle(self, stats: dict, started: float):
+        """Tidur supaya laju entry tidak melebihi disk_scan_rate"""
+        rate = CONFIG["disk_scan_rate"]
+        if rate:
+            ahead = stats["entries"] / rate - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+    
+    def _scan_dir(self, path: str, device: int, full: bool, stats: dict, started: float, sizes: dict) -> int:
+        """Ukuran total subtree path (iteratif, tanpa batas rekursi Python)"""
+        # Stack (path, sudah diproses?) untuk post-order: anak dihitung dulu
+        stack = [(path, False)]
+        while stack:
+            current, done = stack.pop()
+            if done:
+                own, subdirs = self.cache[current][1:]
+                sizes[current] = own + sum(sizes.get(child, 0) for child in subdirs)
+                continue
+            
+            try:
+                st = os.stat(current, follow_symlinks=False)
+            except OSError:
+                continue
+            if st.st_dev != device:
+                continue  # Mount lain (mis. /proc, volume terpisah)
+            cached = self.cache.get(current)
+            if cached is not None and cached[0] == st.st_mtime_ns and not full:
+                stats["reused"] += 1
+            else:
+                own = 0
+                subdirs = []
+                try:
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            stats["entries"] += 1
+                            if stats["entries"] % self.THROTTLE_BATCH == 0:
+                                self._throttle(stats, started)
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.path)
+                                elif entry.is_file(follow_symlinks=False):
+                                    # st_blocks: ukuran yang benar-benar terpakai (sparse file)
+                                    entry_stat = entry.stat(follow_symlinks=False)
+                                    own += getattr(entry_stat, "st_blocks", 0) * 512 or entry_stat.st_size
+                            except OSError:
+                                continue
+                except OSError:
+                    stats["errors"] += 1
+                cached = (st.st_mtime_ns, own, tuple(subdirs))
+                self.cache[current] = cached
+                stats["listed"] += 1
+            
+            stack.append((current, True))
+            stack.extend((child, False) for child in cached[2])
+        return sizes.get(path, 0)
+    
+    def _depth(self, path: str, root: str) -> int:
+        if path == root:
+            return 0
+        return path[len(root):].strip(os.sep).count(os.sep) + 1
+    
+    def _distinct(self, values: Dict[str, float], roots: List[str]) -> List[tuple]:
+        """Top direktori, lewati parent yang nilainya hampir semua dari satu anak"""
+        max_depth = CONFIG["disk_scan_depth"]
+        ranked = []
+        for path, value in values.items():
+            if value <= 0 or path in roots:
+                continue
+            root = next((r for r in roots if path.startswith(r.rstrip(os.sep) + os.sep)), None)
+            if root is None or self._depth(path, root) > max_depth:
+                continue
+            cached = self.cache.get(path)
+            children = cached[2] if cached else ()
+            if self._depth(path, root) < max_depth and any(
+                values.get(child, 0) >= value * self.DOMINANT_RATIO for child in children
+            ):
+                continue
+            ranked.append((path, value))
+        ranked.sort(key=lambda item: -item[1])
+        return ranked[:self.TOP_N]
+    
+    def _run_scan(self):
+        try:
+            self.latest = self.scan()
+        except Exception as e:
+            self.scan_error = str(e) or e.__class__.__name__
+    
+    def collect(self) -> dict:
+        """Mulai scan di thread sendiri jika sudah waktunya, kembalikan hasil terakhir"""
+        now = time.time()
+        if self.thread is not None and self.thread.is_alive():
+            # Scan throttled boleh selama satu interval sebelum dianggap hang
+            if now - self.scan_started > CONFIG["disk_scan_interval"]:
+                raise RuntimeError(f"scan running for {now - self.scan_started:.0f}s")
+        else:
+            if self.scan_error is not None:
+                error, self.scan_error = self.scan_error, None
+                raise RuntimeError(error)
+            if now - self.scan_started >= CONFIG["disk_scan_interval"]:
+                self.scan_started = now
+                self.thread = threading.Thread(target=self._run_scan, name="dirsize-scan", daemon=True)
+                self.thread.start()
+        return self.latest if self.latest is not None else self.default()
+    
+    def scan(self) -> dict:
+        """Satu scan semua root (di thread scan)"""
+        started = time.monotonic()
+        full = self.scans % self.FULL_EVERY == 0
+        stats = {"entries": 0, "listed": 0, "reused": 0, "errors": 0}
+        roots = [os.path.abspath(root) for root in CONFIG["disk_scan_roots"]]
+        sizes: Dict[str, int] = {}
+        root_sizes = {}
+        for root in roots:
+            try:
+                device = os.stat(root).st_dev
+            except OSError:
+                continue
+            root_sizes[root] = self._scan_dir(root, device, full, stats, started, sizes)
+        
+        # Buang cache direktori yang sudah tidak ada
+        for path in [p for p in self.cache if p not in sizes]:
+            del self.cache[path]
+        
+        now = time.time()
+        growth = []
+        if self.previous_time is not None:
+            hours = max((now - self.previous_time) / 3600, 1 / 3600)
+            deltas = {path: size - self.previous.get(path, 0) for path, size in sizes.items() if path in self.previous}
+            growth = [
+                (path, delta / hours, delta)
+                for path, delta in self._distinct(deltas, roots)
+            ]
+        self.previous = sizes
+        self.previous_time = now
+        self.scans += 1
+        
+        stats["duration"] = time.monotonic() - started
+        stats["dirs"] = len(sizes)
+        stats["full"] = full
+        return {
+            "scanned": now,
+            "roots": sorted(root_sizes.items(), key=lambda item: -item[1]),
+            "top": self._distinct(sizes, roots),
+            "growth": growth,
+            "stats": stats
+        }
+
+class NetworkCollector(Collector):
+    """Counter network + jumlah koneksi (net_connections mahal di host sibuk)"""
+    name = "network"
+    interval = 15
+    timeout = 10
+    executor = "thread"
+    
+    def default(self):
+        return {
+            "bytes_sent": 0,
+            "bytes_recv": 0,
+            "connections": 0
+        }
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.count_connections = True  # Dimatikan ResourceGovernor saat over budget
+    
+    def collect(self) -> dict:
+        net_io = psutil.net_io_counters()
+        return {
+            "bytes_sent": net_io.bytes_sent,
+            "bytes_recv": net_io.bytes_recv,
+            "connections": len(psutil.net_connections()) if self.count_connections else None
+        }
+
+class SysfsTemperatureReader:
+    """Baca sensor suhu langsung dari sysfs dengan file descriptor yang di-cache"""
+    HWMON_PATH = '/sys/class/hwmon'
+    THERMAL_PATH = '/sys/class/thermal'
+    REDISCOVER_INTERVAL = 600  # Scan ulang sensor tiap 10 menit
+    
+    def __init__(self):
+        self.sensors: List[dict] = []
+        self.discovered_at = 0
+    
+    @staticmethod
+    def _read_text(path: str, default=None):
+        try:
+            with open(path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return default
+    
+    def _read_millidegrees(self, path: str) -> Optional[float]:
+        value = self._read_text(path)
+        try:
+            return int(value) / 1000 if value else None
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _classify(label: str) -> str:
+        """Kelompokkan sensor: package, core atau other"""
+        lowered = label.lower()
+        if lowered.startswith('package') or lowered in ('tctl', 'tdie'):
+            return 'package'
+        if lowered.startswith('core') or lowered.startswith('tccd'):
+            return 'core'
+        return 'other'
+    
+    def close(self):
+        """Tutup semua file descriptor sensor"""
+        for sensor in self.sensors:
+            try:
+                os.close(sensor["fd"])
+            except OSError:
+                pass
+        self.sensors = []
+    
+    def discover(self):
+        """Scan hwmon (atau thermal_zone sebagai fallback) dan buka temp*_input"""
+        self.close()
+        sensors = []
+        
+        try:
+            hwmon_dirs = sorted(os.listdir(self.HWMON_PATH))
+        except OSError:
+            hwmon_dirs = []
+        
+        for hwmon in hwmon_dirs:
+            base = os.path.join(self.HWMON_PATH, hwmon)
+            chip = self._read_text(os.path.join(base, 'name'), hwmon)
+            try:
+                entries = sorted(os.listdir(base))
+            except OSError:
+                continue
+            for entry in entries:
+                if not (entry.startswith('temp') and entry.endswith('_input')):
+                    continue
+                prefix = entry[:-len('_input')]
+                label = self._read_text(os.path.join(base, f'{prefix}_label'), f'{chip} {prefix}')
+                sensors.append({
+                    "path": os.path.join(base, entry),
+                    "chip": chip,
+                    "label": label,
+                    "kind": self._classify(label),
+                    "high": self._read_millidegrees(os.path.join(base, f'{prefix}_max')),
+                    "critical": self._read_millidegrees(os.path.join(base, f'{prefix}_crit'))
+                })
+        
+        if not sensors:
+            try:
+                zones = sorted(os.listdir(self.THERMAL_PATH))
+            except OSError:
+                zones = []
+            for zone in zones:
+                if not zone.startswith('thermal_zone'):
+                    continue
+                base = os.path.join(self.THERMAL_PATH, zone)
+                label = self._read_text(os.path.join(base, 'type'), zone)
+                sensors.append({
+                    "path": os.path.join(base, 'temp'),
+                    "chip": zone,
+                    "label": label,
+                    "kind": 'package' if 'pkg' in label.lower() or 'cpu' in label.lower() else 'other',
+                    "high": None,
+                    "critical": None
+                })
+        
+        for sensor in sensors:
+            try:
+                sensor["fd"] = os.open(sensor["path"], os.O_RDONLY)
+                self.sensors.append(sensor)
+            except OSError:
+                continue
+        
+        self.discovered_at = time.time()
+    
+    def read(self) -> Optional[dict]:
+        """Baca semua sensor dengan os.pread; None jika tidak ada sensor sysfs"""
+        # Tanpa sensor (VM/container) juga hanya di-scan ulang tiap REDISCOVER_INTERVAL
+        if time.time() - self.discovered_at > self.REDISCOVER_INTERVAL:
+            self.discover()
+        if not self.sensors:
+            return None
+        
+        readings = []
+        stale = False
+        for sensor in self.sensors:
+            try:
+                raw = os.pread(sensor["fd"], 16, 0)
+                readings.append((sensor, int(raw) / 1000))
+            except (OSError, ValueError):
+                # Sensor hilang (hot-unplug/driver reload), scan ulang di tick berikutnya
+                stale = True
+        if stale:
+            self.discovered_at = 0
+        if not readings:
+            return None
+        
+        hottest, hottest_value = max(readings, key=lambda r: r[1])
+        return {
+            "current": hottest_value,
+            "high": hottest["high"] or 100,
+            "critical": hottest["critical"] or 100,
+            "hottest": hottest["label"],
+            "hottest_chip": hottest["chip"],
+            "packages": [(s["label"], v) for s, v in readings if s["kind"] == 'package'],
+            "cores": [(s["label"], v) for s, v in readings if s["kind"] == 'core'],
+            "sensors": len(readings)
+        }
+
+class TemperatureCollector(Collector):
+    """Suhu dari sysfs (fallback ke psutil di non-Linux), alert pakai sensor terpanas"""
+    name = "temperature"
+    interval = 5
+    timeout = 5
+    executor = "thread"
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.reader = SysfsTemperatureReader()
+        self.psutil_empty_at = 0  # psutil juga tidak punya sensor: jangan scan tiap tick
+    
+    def default(self):
+        return {"current": 0, "high": 0, "critical": 0, "hottest": None, "hottest_chip": None,
+                "packages": [], "cores": [], "sensors": 0}
+    
+    def collect(self) -> dict:
+        result = self.reader.read()
+        if result is not None:
+            return result
+        
+        if not hasattr(psutil, 'sensors_temperatures'):
+            return self.default()
+        if time.time() - self.psutil_empty_at < self.reader.REDISCOVER_INTERVAL:
+            return self.default()
+        temps = psutil.sensors_temperatures()
+        entries = [(name, entry) for name, group in temps.items() for entry in group]
+        if not entries:
+            self.psutil_empty_at = time.time()
+            return self.default()
+        
+        name, hottest = max(entries, key=lambda e: e[1].current)
+        return {
+            "current": hottest.current,
+            "high": hottest.high if hottest.high else 100,
+            "critical": hottest.critical if hottest.critical else 100,
+            "hottest": hottest.label or name,
+            "hottest_chip": name,
+            "packages": [(e.label or n, e.current) for n, e in entries if (e.label or '').lower().startswith('package')],
+            "cores": [(e.label, e.current) for n, e in entries if (e.label or '').lower().startswith('core')],
+            "sensors": len(entries)
+        }
+
+class PressureCollector(Collector):
+    """Metric saturasi kernel: PSI, load per core, file descriptor dan conntrack"""
+    name = "pressure"
+    interval = 5
+    timeout = 5
+    executor = "loop"
+    PSI_RESOURCES = ('cpu', 'memory', 'io')
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.files: Dict[str, ProcFile] = {}
+        self.missing = set()
+    
+    def default(self):
+        return {
+            "psi": {},
+            "load": (0, 0, 0),
+            "load_per_core": 0,
+            "fd_allocated": 0,
+            "fd_max": 0,
+            "fd_percent": 0,
+            "conntrack_count": 0,
+            "conntrack_max": 0,
+            "conntrack_percent": 0
+        }
+    
+    def _read(self, path: str) -> Optional[bytes]:
+        """Baca file kecil dengan handle persisten, None jika tidak ada"""
+        if path in self.missing:
+            return None
+        proc_file = self.files.get(path)
+        if proc_file is None:
+            try:
+                proc_file = ProcFile(path, size=512)
+            except OSError:
+                self.missing.add(path)
+                return None
+            self.files[path] = proc_file
+        return proc_file.read()
+    
+    @staticmethod
+    def _parse_psi(data: bytes) -> dict:
+        """Parse 'some avg10=.. avg60=.. avg300=.. total=..' per baris"""
+        result = {}
+        for line in data.split(b'\n'):
+            fields = line.split()
+            if not fields:
+                continue
+            values = {}
+            for field in fields[1:]:
+                key, _, value = field.partition(b'=')
+                if key != b'total':
+                    values[key.decode()] = float(value)
+            result[fields[0].decode()] = values
+        return result
+    
+    def collect(self) -> dict:
+        result = self.default()
+        
+        for resource in self.PSI_RESOURCES:
+            data = self._read(f'/proc/pressure/{resource}')
+            if data:
+                result["psi"][resource] = self._parse_psi(data)
+        
+        load = os.getloadavg() if hasattr(os, 'getloadavg') else (0, 0, 0)
+        cores = psutil.cpu_count(logical=True) or 1
+        result["load"] = load
+        result["load_per_core"] = load[0] / cores
+        
+        data = self._read('/proc/sys/fs/file-nr')
+        if data:
+            allocated, unused, maximum = (int(v) for v in data.split()[:3])
+            result["fd_allocated"] = allocated - unused
+            result["fd_max"] = maximum
+            result["fd_percent"] = (allocated - unused) / maximum * 100 if maximum else 0
+        
+        count = self._read('/proc/sys/net/netfilter/nf_conntrack_count')
+        maximum = self._read('/proc/sys/net/netfilter/nf_conntrack_max')
+        if count and maximum:
+            result["conntrack_count"] = int(count)
+            result["conntrack_max"] = int(maximum)
+            result["conntrack_percent"] = int(count) / int(maximum) * 100 if int(maximum) else 0
+        
+        return result
+
+class CgroupCollector(Collector):
+    """Pemakaian resource per container/service dari file cgroup v2"""
+    name = "cgroups"
+    interval = 10
+    timeout = 10
+    executor = "thread"
+    REDISCOVER_INTERVAL = 60
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.root = self._find_root()
+        self.cgroups: Dict[str, dict] = {}  # path -> {"kind", "key"}
+        self.files: Dict[str, ProcFile] = {}
+        self.last: Dict[str, tuple] = {}  # path -> (time, usage_usec, rbytes, wbytes)
+        self.discovered_at = 0
+        # ID container tanpa cgroup -> jeda rediscovery (backoff, mis. container rootless)
+        self.unresolved: Dict[str, float] = {}
+    
+    @staticmethod
+    def _find_root() -> Optional[str]:
+        """Mount cgroup v2 (unified penuh atau hybrid)"""
+        for path in ('/sys/fs/cgroup', '/sys/fs/cgroup/unified'):
+            if os.path.exists(os.path.join(path, 'cgroup.controllers')):
+                return path
+        return None
+    
+    def enabled(self) -> bool:
+        return self.root is not None and bool(CONFIG["monitor_docker"] or CONFIG["monitor_services"])
+    
+    def default(self):
+        return {"containers": {}, "services": {}}
+    
+    @staticmethod
+    def _classify(dirname: str) -> Optional[tuple]:
+        """Kenali cgroup container docker atau unit systemd dari nama direktori"""
+        # systemd driver: docker-<id>.scope, cgroupfs driver: /docker/<id>
+        if dirname.startswith('docker-') and dirname.endswith('.scope'):
+            return ('container', dirname[len('docker-'):-len('.scope')])
+        if len(dirname) == 64 and all(c in '0123456789abcdef' for c in dirname):
+            return ('container', dirname)
+        if dirname.endswith('.service'):
+            return ('service', dirname[:-len('.service')])
+        return None
+    
+    def discover(self):
+        """Walk hierarki cgroup sekali, cache path yang relevan"""
+        for proc_file in self.files.values():
+            proc_file.close()
+        self.files.clear()
+        self.cgroups = {}
+        
+        for dirpath, dirnames, _ in os.walk(self.root):
+            match = self._classify(os.path.basename(dirpath))
+            if match:
+                self.cgroups[dirpath] = {"kind": match[0], "key": match[1]}
+                # Jangan turun ke sub-cgroup container/service
+                dirnames[:] = []
+        
+        self.last = {path: value for path, value in self.last.items() if path in self.cgroups}
+        self.discovered_at = time.time()
+    
+    def _read(self, path: str) -> Optional[bytes]:
+        proc_file = self.files.get(path)
+        if proc_file is None:
+            try:
+                proc_file = ProcFile(path, size=1024)
+            except OSError:
+                return None
+            self.files[path] = proc_file
+        return proc_file.read()
+    
+    def _read_cgroup(self, path: str, now: float) -> Optional[dict]:
+        """CPU, memory, memory pressure dan IO untuk satu cgroup"""
+        cpu_stat = self._read(os.path.join(path, 'cpu.stat'))
+        if cpu_stat is None:
+            return None
+        usage_usec = 0
+        for line in cpu_stat.split(b'\n'):
+            if line.startswith(b'usage_usec '):
+                usage_usec = int(line.split()[1])
+                break
+        
+        memory = self._read(os.path.join(path, 'memory.current'))
+        pressure = self._read(os.path.join(path, 'memory.pressure'))
+        memory_pressure = 0.0
+        if pressure:
+            psi = PressureCollector._parse_psi(pressure)
+            memory_pressure = psi.get('some', {}).get('avg10', 0.0)
+        
+        rbytes = wbytes = 0
+        io_stat = self._read(os.path.join(path, 'io.stat'))
+        if io_stat:
+            for field in io_stat.split():
+                if field.startswith(b'rbytes='):
+                    rbytes += int(field[7:])
+                elif field.startswith(b'wbytes='):
+                    wbytes += int(field[7:])
+        
+        entry = {
+            "cpu": 0.0,
+            "memory": int(memory) if memory else 0,
+            "memory_pressure": memory_pressure,
+            "io_read": 0.0,
+            "io_write": 0.0
+        }
+        last = self.last.get(path)
+        if last:
+            time_diff = now - last[0]
+            if time_diff > 0:
+                # Persen dari satu core, sama seperti docker stats
+                entry["cpu"] = max(usage_usec - last[1], 0) / 1e6 / time_diff * 100
+                entry["io_read"] = max(rbytes - last[2], 0) / time_diff
+                entry["io_write"] = max(wbytes - last[3], 0) / time_diff
+        self.last[path] = (now, usage_usec, rbytes, wbytes)
+        return entry
+    
+    def _track_unresolved(self, missing: set, rediscovered: bool):
+        """Perbarui backoff rediscovery untuk container yang belum ketemu cgroup-nya"""
+        unresolved = {}
+        for container_id in missing:
+            delay = self.unresolved.get(container_id)
+            if delay is None and not rediscovered:
+                delay = 0  # Baru muncul: walk sekali di tick berikutnya
+            elif rediscovered:
+                # Masih belum ketemu setelah walk: gandakan jeda, maksimal interval biasa
+                delay = min(max((delay or 0) * 2, self.interval), self.REDISCOVER_INTERVAL)
+            unresolved[container_id] = delay
+        self.unresolved = unresolved
+    
+    def collect(self) -> dict:
+        now = time.time()
+        due = min(self.unresolved.values(), default=self.REDISCOVER_INTERVAL)
+        rediscovered = now - self.discovered_at >= due
+        if rediscovered:
+            self.discover()
+        
+        # Map ID container -> nama dari cache docker collector
+        names = {}
+        if self.monitor:
+            for container in self.monitor.get_docker_stats():
+                names[container["id"]] = container["name"]
+        services = set(CONFIG["monitor_services"])
+        
+        result = self.default()
+        vanished = False
+        resolved = set()
+        for path, cgroup in self.cgroups.items():
+            if cgroup["kind"] == 'service' and cgroup["key"] not in services:
+                continue
+            try:
+                entry = self._read_cgroup(path, now)
+            except (OSError, ValueError):
+                entry = None
+            if entry is None:
+                vanished = True
+                continue
+            
+            if cgroup["kind"] == 'container':
+                container_id = cgroup["key"]
+                short_id = next((i for i in names if container_id.startswith(i)), None)
+                resolved.add(short_id)
+                result["containers"][names.get(short_id, container_id[:12])] = entry
+            else:
+                result["services"][cgroup["key"]] = entry
+        
+        # Cgroup hilang: scan ulang di tick berikutnya. Container tanpa cgroup
+        # dicoba ulang dengan backoff supaya tidak walk seluruh hierarki tiap tick
+        self._track_unresolved(set(names) - resolved, rediscovered)
+        if vanished:
+            self.discovered_at = 0
+        return result
+
+class SpaceSaving:
+    """Top-k heavy hitter dengan algoritma Space-Saving (memory tetap = capacity)"""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[tuple, float] = {}
+    
+    def add(self, key: tuple, amount: float):
+        if key in self.counts:
+            self.counts[key] += amount
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = amount
+        else:
+            # Ganti counter terkecil, key baru mewarisi nilainya (overestimate terbatas)
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            self.counts[key] = floor + amount
+
+class TopKMax:
+    """Simpan k nilai maksimum terbesar per key (untuk peak RSS)"""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[tuple, float] = {}
+    
+    def add(self, key: tuple, value: float):
+        if key in self.counts:
+            self.counts[key] = max(self.counts[key], value)
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = value
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            if value > self.counts[victim]:
+                del self.counts[victim]
+                self.counts[key] = value
+
+class HeavyHitterTracker:
+    """Akumulasi CPU-seconds, peak RSS dan IO bytes per (nama, cmdline, cgroup) per jam"""
+    EPOCH = 3600
+    
+    def __init__(self, capacity: int = 100, hours: int = 24):
+        self.capacity = capacity
+        self.epochs: deque = deque(maxlen=hours + 1)
+        self.lock = threading.Lock()
+    
+    def _current(self, now: float) -> dict:
+        start = int(now // self.EPOCH) * self.EPOCH
+        if not self.epochs or self.epochs[-1]["start"] != start:
+            self.epochs.append({
+                "start": start,
+                "cpu": SpaceSaving(self.capacity),
+                "io": SpaceSaving(self.capacity),
+                "rss": TopKMax(self.capacity)
+            })
+        return self.epochs[-1]
+    
+    def ingest(self, samples: list, now: float = None):
+        """samples: list (key, cpu_seconds, rss_bytes, io_bytes) sejak scan sebelumnya"""
+        now = now or time.time()
+        with self.lock:
+            epoch = self._current(now)
+            for key, cpu_seconds, rss, io_bytes in samples:
+                if cpu_seconds > 0:
+                    epoch["cpu"].add(key, cpu_seconds)
+                if io_bytes > 0:
+                    epoch["io"].add(key, io_bytes)
+                if rss > 0:
+                    epoch["rss"].add(key, rss)
+    
+    def top(self, metric: str, seconds: float, count: int = 10) -> list:
+        """Top consumer untuk metric (cpu, io, rss) selama X detik terakhir"""
+        cutoff = time.time() - seconds
+        merged: Dict[tuple, float] = {}
+        with self.lock:
+            for epoch in self.epochs:
+                if epoch["start"] + self.EPOCH <= cutoff:
+                    continue
+                for key, value in epoch[metric].counts.items():
+                    if metric == "rss":
+                        merged[key] = max(merged.get(key, 0), value)
+                    else:
+                        merged[key] = merged.get(key, 0) + value
+        return sorted(merged.items(), key=lambda item: item[1], reverse=True)[:count]
+
+class ReportAggregator:
+    """Agregat berjalan per periode laporan (daily/weekly), diupdate tiap tick.
+    
+    Tiap metric menyimpan [count, sum, min, max, histogram] dengan histogram
+    nilai yang dibulatkan ke 2 angka penting, jadi avg/p95/max laporan dihitung
+    dari agregat tanpa membaca history. Batas periode memakai waktu lokal
+    (env TZ) dan report_time/report_weekday.
+    """
+    PERIODS = ("daily", "weekly")
+    WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+    DOCKER_UNITS = {
+        "second": 1, "minute": 60, "hour": 3600, "day": 86400,
+        "week": 604800, "month": 2592000, "year": 31536000
+    }
+    
+    def __init__(self, data_store):
+        self.data_store = data_store
+        saved = data_store.data.get("reports", {})
+        self.current: Dict[str, Optional[dict]] = {period: saved.get(period) for period in self.PERIODS}
+        # Laporan terakhir yang sudah selesai per periode (untuk dikirim / !report last)
+        self.last: Dict[str, dict] = data_store.data.setdefault("reports_last", {})
+        # State deteksi restart (hanya di memory)
+        self.service_state: Dict[str, tuple] = {}
+        self.container_uptime: Dict[str, float] = {}
+    
+    def period_start(self, period: str, now: datetime.datetime) -> datetime.datetime:
+        """Awal periode yang sedang berjalan (waktu lokal)"""
+        try:
+            hour, minute = (int(part) for part in CONFIG["report_time"].split(":"))
+        except ValueError:
+            hour, minute = 9, 0
+        start = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if period == "weekly":
+            day = CONFIG["report_weekday"][:3].lower()
+            weekday = self.WEEKDAYS.index(day) if day in self.WEEKDAYS else 0
+            start -= datetime.timedelta(days=(start.weekday() - weekday) % 7)
+            if start > now:
+                start -= datetime.timedelta(days=7)
+        elif start > now:
+            start -= datetime.timedelta(days=1)
+        return start
+    
+    @staticmethod
+    def _new(start: datetime.datetime) -> dict:
+        return {"start": start.timestamp(), "metrics": {}, "alerts": {}, "restarts": {}, "disk": None}
+    
+    def roll(self, now: datetime.datetime = None) -> List[str]:
+        """Tutup periode yang sudah lewat batasnya; return periode yang baru selesai"""
+        now = now or datetime.datetime.now()
+        finished = []
+        for period in self.PERIODS:
+            start = self.period_start(period, now)
+            current = self.current[period]
+            if current is not None and current["start"] == start.timestamp():
+                continue
+            if current is not None and current["metrics"]:
+                report = self.build(period, current, start.timestamp())
+                # Periode yang tidak dijadwalkan tidak perlu dikirim
+                report["posted"] = period not in CONFIG["report_schedule"]
+                self.last[period] = report
+                finished.append(period)
+            self.current[period] = self._new(start)
+        if finished:
+            self.persist()
+        return finished
+    
+    @staticmethod
+    def _bin(value: float) -> str:
+        return f"{value:.2g}"
+    
+    def _add(self, acc: dict, key: str, value: float):
+        metric = acc["metrics"].get(key)
+        if metric is None:
+            metric = acc["metrics"][key] = [0, 0.0, value, value, {}]
+        metric[0] += 1
+        metric[1] += value
+        if value < metric[2]:
+            metric[2] = value
+        if value > metric[3]:
+            metric[3] = value
+        hist = metric[4]
+        bin_key = self._bin(value)
+        hist[bin_key] = hist.get(bin_key, 0) + 1
+    
+    def observe(self, stats: dict, snapshot: dict):
+        """Update agregat semua periode dengan satu tick"""
+        self.roll(snapshot["time"])
+        restarts = self._detect_restarts(snapshot)
+        disk_used = snapshot["disk"]["used"]
+        now_ts = snapshot["time"].timestamp()
+        for acc in self.current.values():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self._add(acc, key, float(value))
+            for name in restarts:
+                acc["restarts"][name] = acc["restarts"].get(name, 0) + 1
+            if disk_used:
+                if acc["disk"] is None:
+                    acc["disk"] = [now_ts, disk_used, now_ts, disk_used]
+                else:
+                    acc["disk"][2:] = [now_ts, disk_used]
+        self.persist()
+    
+    def record_alert(self, alert_type: str):
+        for acc in self.current.values():
+            if acc is not None:
+                acc["alerts"][alert_type] = acc["alerts"].get(alert_type, 0) + 1
+    
+    @classmethod
+    def _docker_uptime(cls, status: str) -> Optional[float]:
+        """Detik dari status docker ps seperti 'Up 3 hours (healthy)'"""
+        match = re.match(r"Up (Less than a second|About an? (\w+)|(\d+) (\w+))", status)
+        if not match:
+            return None
+        if match.group(1) == "Less than a second":
+            return 0.0
+        if match.group(2):
+            return float(cls.DOCKER_UNITS.get(match.group(2), 0))
+        return int(match.group(3)) * cls.DOCKER_UNITS.get(match.group(4).rstrip("s"), 0)
+    
+    def _detect_restarts(self, snapshot: dict) -> List[str]:
+        """Nama service/container yang restart sejak tick sebelumnya"""
+        restarted = []
+        for name, service in snapshot["services"].items():
+            previous = self.service_state.get(name)
+            count = service.get("restarts")
+            if previous is not None:
+                was_active, previous_count = previous
+                # NRestarts systemd untuk auto-restart, transisi inactive -> active untuk sisanya
+                if count is not None and previous_count is not None and count > previous_count:
+                    restarted.extend([name] * (count - previous_count))
+                elif service["active"] and not was_active:
+                    restarted.append(name)
+            self.service_state[name] = (service["active"], count)
+        
+        for container in snapshot["containers"]:
+            name = container["name"]
+            uptime = self._docker_uptime(container["status"])
+            previous = self.container_uptime.get(name)
+            if uptime is None:
+                if container["status"].startswith("Restarting") and previous is not None and previous >= 0:
+                    restarted.append(name)
+                    uptime = -1.0  # Hitung sekali selama masih restarting
+                else:
+                    continue
+            elif previous is not None and 0 <= uptime < previous:
+                restarted.append(name)
+            self.container_uptime[name] = uptime
+        return restarted
+    
+    @staticmethod
+    def _percentile(hist: dict, count: int, fraction: float) -> float:
+        target = fraction * count
+        seen = 0
+        for value, hits in sorted(((float(k), v) for k, v in hist.items())):
+            seen += hits
+            if seen >= target:
+                return value
+        return 0.0
+    
+    def build(self, period: str, acc: dict, end: float = None) -> dict:
+        """Ringkasan laporan dari agregat (O(jumlah metric × bin), tanpa history)"""
+        end = end or time.time()
+        metrics = {}
+        for key, (count, total, low, high, hist) in acc["metrics"].items():
+            metrics[key] = {
+                "avg": total / count,
+                "p95": self._percentile(hist, count, 0.95),
+                "max": high,
+                "min": low,
+                "samples": count
+            }
+        disk = None
+        if acc["disk"]:
+            first_ts, first_used, last_ts, last_used = acc["disk"]
+            days = (last_ts - first_ts) / 86400
+            disk = {
+                "start_gb": first_used,
+                "end_gb": last_used,
+                "growth_gb_per_day": (last_used - first_used) / days if days > 0 else 0.0
+            }
+        return {
+            "period": period,
+            "start": acc["start"],
+            "end": end,
+            "samples": max((m[0] for m in acc["metrics"].values()), default=0),
+            "metrics": metrics,
+            "alerts": dict(sorted(acc["alerts"].items(), key=lambda item: -item[1])),
+            "restarts": dict(sorted(acc["restarts"].items(), key=lambda item: -item[1])),
+            "disk": disk
+        }
+    
+    def report(self, period: str, last: bool = False) -> Optional[dict]:
+        """Laporan periode sekarang (sejauh ini) atau periode terakhir yang selesai"""
+        if last:
+            return self.last.get(period)
+        self.roll()
+        acc = self.current[period]
+        return self.build(period, acc) if acc["metrics"] else None
+    
+    def persist(self):
+        """Salin agregat ke DataStore (flusher serialize salinan di thread lain)"""
+        self.data_store.data["reports"] = {
+            period: {
+                "start": acc["start"],
+                "metrics": {key: metric[:4] + [dict(metric[4])] for key, metric in acc["metrics"].items()},
+                "alerts": dict(acc["alerts"]),
+                "restarts": dict(acc["restarts"]),
+                "disk": list(acc["disk"]) if acc["disk"] else None
+            }
+            for period, acc in self.current.items() if acc is not None
+        }
+        self.data_store.save()
+
+class IncidentManager:
+    """Kelompokkan alert yang berdekatan jadi satu incident, state disimpan di DataStore.
+    
+    Alert yang fire dalam incident_window detik sejak anggota terakhir incident
+    open mulai (atau kembali) fire ikut masuk incident itu; alert lama yang
+    terus fire tidak memperpanjang window. Incident resolve jika semua alert
+    anggotanya sudah clear selama incident_resolve_after detik. Cooldown per tipe
+    alert ikut disimpan, jadi restart tidak memicu alert duplikat.
+    """
+    COOLDOWN = 300  # Detik sebelum tipe alert yang sama boleh membuka alert baru
+    KEEP_CLOSED = 50
+    
+    def __init__(self, data_store):
+        self.data_store = data_store
+        saved = data_store.data.get("incidents", {})
+        self.open: List[dict] = saved.get("open", [])
+        self.closed: List[dict] = saved.get("closed", [])
+        self.cooldowns: Dict[str, float] = saved.get("cooldowns", {})
+        self.next_id = saved.get("next_id", 1)
+    
+    def can_fire(self, alert_type: str, now: float) -> bool:
+        """Cek dan catat cooldown per tipe alert"""
+        if now - self.cooldowns.get(alert_type, 0) < self.COOLDOWN:
+            return False
+        self.cooldowns[alert_type] = now
+        return True
+    
+    def _member(self, alert_type: str) -> Optional[dict]:
+        for incident in self.open:
+            member = incident["alerts"].get(alert_type)
+            if member is not None:
+                return member
+        return None
+    
+    def _correlate(self, now: float) -> Optional[dict]:
+        """Incident open terbaru yang masih dalam correlation window"""
+        for incident in reversed(self.open):
+            # State lama belum punya "activated"
+            if now - incident.get("activated", incident["opened"]) <= CONFIG["incident_window"]:
+                return incident
+        return None
+    
+    def process(self, firing: List[tuple], now: float = None) -> tuple:
+        """Proses alert yang sedang fire: (alert baru, incident yang berubah)"""
+        now = now or time.time()
+        firing_types = {alert_type for alert_type, _, _ in firing}
+        changed: Dict[int, dict] = {}
+        new_alerts = []
+        
+        # Anggota yang sudah tidak fire ditandai clear
+        for incident in self.open:
+            for alert_type, member in incident["alerts"].items():
+                if member["active"] and alert_type not in firing_types:
+                    member["active"] = False
+                    member["cleared"] = now
+                    changed[incident["id"]] = incident
+        
+        for alert_type, message, value in firing:
+            member = self._member(alert_type)
+            if member is not None:
+                incident = next(i for i in self.open if member is i["alerts"].get(alert_type))
+                if not member["active"]:
+                    # Fire lagi sebelum incident resolve: tetap di incident yang sama
+                    member["active"] = True
+                    member["cleared"] = None
+                    member["count"] += 1
+                    incident["activated"] = now
+                    changed[incident["id"]] = incident
+                member.update(message=message, value=value, last=now, peak=max(member["peak"], value))
+                incident["updated"] = now
+                continue
+            
+            if not self.can_fire(alert_type, now):
+                continue
+            incident = self._correlate(now)
+            if incident is None:
+                incident = {
+                    "id": self.next_id,
+                    "opened": now,
+                    "updated": now,
+                    "activated": now,  # Terakhir ada anggota yang mulai fire
+                    "resolved": None,
+                    "duration": None,
+                    "message_id": None,
+                    "alerts": {}
+                }
+                self.next_id += 1
+                self.open.append(incident)
+            incident["alerts"][alert_type] = {
+                "message": message,
+                "value": value,
+                "peak": value,
+                "first": now,
+                "last": now,
+                "cleared": None,
+                "active": True,
+                "count": 1
+            }
+            incident["updated"] = now
+            incident["activated"] = now
+            changed[incident["id"]] = incident
+            new_alerts.append((alert_type, message, value))
+        
+        # Resolve incident yang semua anggotanya sudah clear cukup lama
+        for incident in list(self.open):
+            members = incident["alerts"].values()
+            if any(member["active"] for member in members):
+                continue
+            cleared = max(member["cleared"] for member in members)
+            if now - cleared >= CONFIG["incident_resolve_after"]:
+                incident["resolved"] = cleared
+                incident["duration"] = cleared - incident["opened"]
+                self.open.remove(incident)
+                self.closed.append(incident)
+                changed[incident["id"]] = incident
+        self.closed = self.closed[-self.KEEP_CLOSED:]
+        
+        # Cooldown yang sudah lewat tidak perlu disimpan
+        self.cooldowns = {key: ts for key, ts in self.cooldowns.items() if now - ts < self.COOLDOWN}
+        if changed or new_alerts or firing:
+            self.persist()
+        return new_alerts, list(changed.values())
+    
+    def persist(self):
+        """Salin state ke DataStore (lewat JSON supaya nested dict tidak ikut termutasi)"""
+        self.data_store.data["incidents"] = json.loads(json.dumps({
+            "open": self.open,
+            "closed": self.closed,
+            "cooldowns": self.cooldowns,
+            "next_id": self.next_id
+        }))
+        self.data_store.save()
+
+class ProcessCollector(Collector):
+    """Top processes by CPU usage, sekaligus feed heavy-hitter tracker"""
+    name = "processes"
+    interval = 15
+    timeout = 10
+    executor = "thread"
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.last_counters: Dict[int, tuple] = {}  # pid -> (cpu_seconds, io_bytes)
+        self.cgroups: Dict[int, str] = {}
+        self.last_scan = 0
+    
+    def default(self):
+        return []
+    
+    def _cgroup(self, pid: int) -> str:
+        """Nama cgroup pendek untuk pid (di-cache selama pid hidup)"""
+        cgroup = self.cgroups.get(pid)
+        if cgroup is None:
+            cgroup = ""
+            try:
+                with open(f'/proc/{pid}/cgroup', 'r') as f:
+                    for line in f:
+                        path = line.strip().split(':', 2)[-1]
+                        if path and path != '/':
+                            cgroup = path.rstrip('/').rsplit('/', 1)[-1]
+                            if cgroup.startswith('docker-') and cgroup.endswith('.scope'):
+                                cgroup = cgroup[:len('docker-') + 12]
+                            break
+            except OSError:
+                pass
+            self.cgroups[pid] = cgroup
+        return cgroup
+    
+    def collect(self) -> list:
+        now = time.time()
+        processes = []
+        samples = []
+        counters = {}
+        attrs = ['pid', 'name', 'cpu_percent', 'memory_percent', 'cpu_times',
+                 'memory_info', 'cmdline', 'io_counters', 'create_time']
+        for proc in psutil.process_iter(attrs):
+            try:
+                info = proc.info
+                processes.append({
+                    'name': info['name'],
+                    'cpu': info['cpu_percent'] or 0,
+                    'memory': info['memory_percent'] or 0
+                })
+                
+                pid = info['pid']
+                cpu_total = sum(info['cpu_times'][:2]) if info['cpu_times'] else 0
+                io = info['io_counters']
+                io_total = io.read_bytes + io.write_bytes if io else 0
+                counters[pid] = (cpu_total, io_total)
+                
+                last = self.last_counters.get(pid)
+                if last:
+                    cpu_delta = max(cpu_total - last[0], 0)
+                    io_delta = max(io_total - last[1], 0)
+                elif self.last_scan and (info['create_time'] or 0) >= self.last_scan:
+                    # Process baru sejak scan terakhir, semua pemakaiannya masuk interval ini
+                    cpu_delta, io_delta = cpu_total, io_total
+                else:
+                    cpu_delta = io_delta = 0
+                
+                cmdline = " ".join(info['cmdline'] or []).replace('\n', ' ').replace('`', "'")[:80] or info['name']
+                key = (info['name'], cmdline, self._cgroup(pid))
+                rss = info['memory_info'].rss if info['memory_info'] else 0
+                samples.append((key, cpu_delta, rss, io_delta))
+            except:
+                continue
+        
+        # Hanya simpan counter pid yang masih hidup supaya memory tetap
+        self.last_counters = counters
+        self.cgroups = {pid: cgroup for pid, cgroup in self.cgroups.items() if pid in counters}
+        self.last_scan = now
+        
+        if self.monitor is not None:
+            self.monitor.heavy_hitters.ingest(samples, now)
+        
+        # Sort by CPU usage
+        processes.sort(key=lambda x: x['cpu'], reverse=True)
+        return processes[:10]
+
+class ProcEventCollector(Collector):
+    """Tangkap process berumur pendek lewat netlink proc connector (fork/exec/exit).
+    
+    Butuh root/CAP_NET_ADMIN; tanpa itu fallback ke sampling daftar pid di /proc,
+    yang hanya melihat process yang masih hidup saat di-scan.
+    
+    comm dan stat dibaca langsung saat event (process/zombie bisa segera hilang
+    atau pid dipakai ulang); agregasi, termasuk mencari nama parent yang belum
+    dilacak, ditunda ke batch dengan pembacaan /proc di worker thread.
+    """
+    name = "proc_events"
+    interval = 10
+    timeout = 5
+    executor = "loop"
+    
+    NETLINK_CONNECTOR = 11
+    CN_IDX_PROC = 1
+    CN_VAL_PROC = 1
+    PROC_CN_MCAST_LISTEN = 1
+    PROC_EVENT_FORK = 0x00000001
+    PROC_EVENT_EXEC = 0x00000002
+    PROC_EVENT_EXIT = 0x80000000
+    NLMSG_HEADER = struct.Struct("=IHHII")
+    CN_MSG = struct.Struct("=IIIIHH")
+    EVENT_HEADER = struct.Struct("=IIQ")
+    
+    SHORT_LIVED = 5  # Detik; process yang exit lebih cepat dihitung short-lived
+    MAX_TRACKED = 32768  # Batas pid yang dilacak (event exit bisa hilang)
+    MAX_KEYS = 500  # Batas key (parent, command) per menit
+    BUCKETS = 15  # Menit agregat yang disimpan
+    BATCH = 256  # Datagram maksimum per callback supaya loop tidak tertahan
+    RESOLVE_BATCH = 256  # Record agregasi per batch di worker thread
+    MAX_QUEUED = 8192  # Batas antrean agregasi; lebih dari ini dihitung dropped
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.mode = None  # "netlink" atau "sampling"
+        self.sock = None
+        # pid -> (start, command, parent atau None jika belum diketahui, ppid)
+        self.live: OrderedDict = OrderedDict()
+        # (waktu, command, parent, ppid, execs, short_lived, cpu) belum diagregasi
+        self.queue: deque = deque()
+        self.resolver: Optional[asyncio.Task] = None
+        self.buckets: deque = deque(maxlen=self.BUCKETS)
+        self.known_pids = set()
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.dropped = 0
+    
+    def enabled(self) -> bool:
+        return CONFIG["proc_events"]
+    
+    def default(self):
+        return {"mode": None, "exec_rate": 0, "short_lived": 0, "short_cpu": 0.0, "top": []}
+    
+    def _bucket(self, now: float) -> dict:
+        minute = int(now // 60) * 60
+        if not self.buckets or self.buckets[-1]["minute"] != minute:
+            self.buckets.append({"minute": minute, "execs": 0, "short_lived": 0, "short_cpu": 0.0, "keys": {}})
+        return self.buckets[-1]
+    
+    def _count(self, now: float, key: tuple, execs: int = 0, short_lived: int = 0, cpu: float = 0.0):
+        bucket = self._bucket(now)
+        bucket["execs"] += execs
+        bucket["short_lived"] += short_lived
+        bucket["short_cpu"] += cpu
+        keys = bucket["keys"]
+        if key not in keys and len(keys) >= self.MAX_KEYS:
+            key = ("other", "other")
+        entry = keys.setdefault(key, [0, 0, 0.0])
+        entry[0] += execs
+        entry[1] += short_lived
+        entry[2] += cpu
+    
+    @staticmethod
+    def _read_proc(pid: int, name: str) -> Optional[bytes]:
+        """Satu pread tanpa file object (dipanggil langsung dari callback event)"""
+        try:
+            fd = os.open(f'/proc/{pid}/{name}', os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return None
+        try:
+            return os.pread(fd, 1024, 0)
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+    
+    def _read_comm(self, pid: int) -> Optional[str]:
+        data = self._read_proc(pid, 'comm')
+        return data.decode(errors='replace').strip() if data else None
+    
+    def _read_stat(self, pid: int) -> Optional[tuple]:
+        """(ppid, cpu_seconds) dari /proc/pid/stat"""
+        data = self._read_proc(pid, 'stat')
+        if not data:
+            return None
+        # comm bisa berisi spasi/kurung, parse setelah ')' terakhir
+        fields = data[data.rfind(b')') + 2:].split()
+        return int(fields[1]), (int(fields[11]) + int(fields[12])) / self.clock_ticks
+    
+    def _remember(self, pid: int, entry: tuple):
+        """Simpan pid yang dilacak, buang yang tertua di atas MAX_TRACKED"""
+        self.live[pid] = entry
+        self.live.move_to_end(pid)
+        while len(self.live) > self.MAX_TRACKED:
+            self.live.popitem(last=False)
+            self.dropped += 1
+    
+    def _track(self, pid: int, now: float, start: float = None):
+        """Catat exec: comm dan stat dibaca sekarang, selagi process masih ada"""
+        command = self._read_comm(pid) or "?"
+        stat = self._read_stat(pid)
+        ppid = stat[0] if stat else 0
+        parent = self.live.get(ppid)
+        parent_name = parent[1] if parent else None  # Dicari di worker thread
+        self._remember(pid, (start or now, command, parent_name, ppid))
+        self._defer(now, command, parent_name, ppid, execs=1)
+    
+    def _exited(self, pid: int, now: float, window: float, zombie: bool):
+        entry = self.live.pop(pid, None)
+        if entry and now - entry[0] < window:
+            # Saat event exit, /proc/pid/stat masih bisa dibaca (zombie)
+            stat = self._read_stat(pid) if zombie else None
+            self._defer(now, entry[1], entry[2], entry[3], short_lived=1, cpu=stat[1] if stat else 0.0)
+    
+    def _defer(self, now: float, command: str, parent: Optional[str], ppid: int,
+               execs: int = 0, short_lived: int = 0, cpu: float = 0.0):
+        """Antrikan agregasi; nama parent yang belum diketahui dicari per batch"""
+        if len(self.queue) >= self.MAX_QUEUED:
+            self.dropped += 1
+            return
+        self.queue.append((now, command, parent, ppid, execs, short_lived, cpu))
+        if self.resolver is None:
+            self.resolver = asyncio.get_running_loop().create_task(self._drain())
+    
+    def _resolve(self, records: list) -> list:
+        """Nama parent untuk satu batch record (di worker thread)"""
+        names: Dict[int, Optional[str]] = {}
+        parents = []
+        for _, _, parent, ppid, _, _, _ in records:
+            if parent is None:
+                if ppid not in names:
+                    names[ppid] = self._read_comm(ppid) if ppid else None
+                parent = names[ppid] or "?"
+            parents.append(parent)
+        return parents
+    
+    async def _drain(self):
+        """Agregasi antrean per batch sampai kosong"""
+        try:
+            while self.queue:
+                batch = [self.queue.popleft() for _ in range(min(len(self.queue), self.RESOLVE_BATCH))]
+                if any(record[2] is None for record in batch):
+                    parents = await asyncio.to_thread(self._resolve, batch)
+                else:
+                    parents = [record[2] for record in batch]
+                for (now, command, _, _, execs, short_lived, cpu), parent in zip(batch, parents):
+                    self._count(now, (parent, command), execs=execs, short_lived=short_lived, cpu=cpu)
+        finally:
+            self.resolver = None
+    
+    # ----- netlink -----
+    def _start_netlink(self) -> bool:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_CONNECTOR)
+            sock.bind((os.getpid(), self.CN_IDX_PROC))
+            payload = self.CN_MSG.pack(self.CN_IDX_PROC, self.CN_VAL_PROC, 0, 0, 4, 0)
+            payload += struct.pack("=I", self.PROC_CN_MCAST_LISTEN)
+            sock.send(self.NLMSG_HEADER.pack(self.NLMSG_HEADER.size + len(payload), 3, 0, 0, os.getpid()) + payload)
+            sock.setblocking(False)
+            asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+        except (OSError, AttributeError) as e:
+            print(f"Proc connector unavailable ({e}), falling back to sampling")
+            return False
+        self.sock = sock
+        return True
+    
+    def _on_readable(self):
+        """Proses event yang tersedia, maksimal BATCH per callback"""
+        for _ in range(self.BATCH):
+            try:
+                data = self.sock.recv(4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                # ENOBUFS: event terlalu banyak, sebagian hilang
+                self.dropped += 1
+                return
+            offset = 0
+            while offset + self.NLMSG_HEADER.size <= len(data):
+                length = self.NLMSG_HEADER.unpack_from(data, offset)[0]
+                if length < self.NLMSG_HEADER.size:
+                    break
+                self._handle_event(data, offset + self.NLMSG_HEADER.size + self.CN_MSG.size)
+                offset += (length + 3) & ~3
+    
+    def _handle_event(self, data: bytes, offset: int):
+        if offset + self.EVENT_HEADER.size > len(data):
+            return
+        what = self.EVENT_HEADER.unpack_from(data, offset)[0]
+        body = offset + self.EVENT_HEADER.size
+        now = time.time()
+        
+        if what == self.PROC_EVENT_FORK:
+            parent_tgid, child_pid, child_tgid = struct.unpack_from("=III", data, body + 4)
+            if child_pid == child_tgid:
+                parent = self.live.get(parent_tgid)
+                command = parent[1] if parent else "?"
+                self._remember(child_tgid, (now, command, command if parent else None, parent_tgid))
+        
+        elif what == self.PROC_EVENT_EXEC:
+            pid, tgid = struct.unpack_from("=II", data, body)
+            self._track(tgid, now, start=self.live.get(tgid, (now,))[0])
+        
+        elif what == self.PROC_EVENT_EXIT:
+            pid, tgid = struct.unpack_from("=II", data, body)
+            if pid != tgid:
+                return  # Thread exit, bukan process
+            self._exited(tgid, now, self.SHORT_LIVED, zombie=True)
+    
+    # ----- sampling fallback -----
+    def _sample(self, now: float):
+        """Bandingkan daftar pid dengan scan sebelumnya"""
+        pids = {int(name) for name in os.listdir('/proc') if name.isdigit()}
+        if self.known_pids:
+            for pid in pids - self.known_pids:
+                self._track(pid, now)
+            for pid in self.known_pids - pids:
+                self._exited(pid, now, self.SHORT_LIVED + self.interval, zombie=False)
+        self.known_pids = pids
+    
+    def close(self):
+        if self.sock is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self.sock.fileno())
+            except RuntimeError:
+                pass
+            self.sock.close()
+            self.sock = None
+        if self.resolver is not None:
+            self.resolver.cancel()
+            self.resolver = None
+        self.queue.clear()
+    
+    def collect(self) -> dict:
+        now = time.time()
+        if self.mode is None:
+            self.mode = "netlink" if self._start_netlink() else "sampling"
+        if self.mode == "sampling":
+            self._sample(now)
+        
+        # Agregat 5 menit terakhir, rate per menit
+        cutoff = now - 300
+        recent = [b for b in self.buckets if b["minute"] + 60 > cutoff]
+        minutes = max(min((now - recent[0]["minute"]) / 60, 5), 1) if recent else 1
+        totals: Dict[tuple, list] = {}
+        for bucket in recent:
+            for key, (execs, short_lived, cpu) in bucket["keys"].items():
+                entry = totals.setdefault(key, [0, 0, 0.0])
+                entry[0] += execs
+                entry[1] += short_lived
+                entry[2] += cpu
+        top = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:5]
+        
+        return {
+            "mode": self.mode,
+            "exec_rate": sum(b["execs"] for b in recent) / minutes,
+            "short_lived": sum(b["short_lived"] for b in recent),
+            "short_cpu": sum(b["short_cpu"] for b in recent),
+            "top": [(parent, command, execs / minutes) for (parent, command), (execs, _, _) in top],
+            "dropped": self.dropped
+        }
+
+class ProbeCollector(Collector):
+    """Probe TCP connect, HTTP dan DNS ke target di CONFIG["probes"] secara konkuren.
+    
+    Tiap target: {"name", "type": tcp|http|dns, "target", "timeout", "expect_status", "history"}.
+    History hanya menyimpan probe_success gabungan; success/p50/p95 per target
+    ikut disimpan hanya jika target itu "history": true.
+    Jumlah probe yang jalan bersamaan dibatasi probe_concurrency; HTTP memakai
+    satu ClientSession dengan connection pool.
+    """
+    name = "probes"
+    executor = "loop"
+    
+    LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # ms, terakhir = lebih
+    RECENT = 60  # Hasil terakhir per target untuk success rate/percentile
+    DEFAULT_TIMEOUT = 5
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.state: Dict[str, dict] = {}
+    
+    @property
+    def interval(self) -> int:
+        return CONFIG["probe_interval"]
+    
+    @property
+    def timeout(self) -> float:
+        # Semua batch harus sempat selesai walau setiap probe kena timeout
+        probes = CONFIG["probes"]
+        longest = max((p.get("timeout", self.DEFAULT_TIMEOUT) for p in probes), default=self.DEFAULT_TIMEOUT)
+        batches = math.ceil(len(probes) / max(CONFIG["probe_concurrency"], 1))
+        return batches * longest + 5
+    
+    def enabled(self) -> bool:
+        return bool(CONFIG["probes"])
+    
+    def default(self):
+        return {"targets": {}, "up": 0, "total": 0}
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=CONFIG["probe_concurrency"], ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+    
+    async def probe_tcp(self, target: str, timeout: float):
+        host, _, port = target.rpartition(':')
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host.strip('[]'), int(port)), timeout)
+        writer.close()
+        await writer.wait_closed()
+    
+    async def probe_http(self, target: str, timeout: float, expect_status: Optional[int] = None):
+        session = await self._get_session()
+        async with session.get(target, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=False) as response:
+            if expect_status is not None and response.status != expect_status:
+                raise ValueError(f"HTTP {response.status}, expected {expect_status}")
+            if expect_status is None and response.status >= 400:
+                raise ValueError(f"HTTP {response.status}")
+    
+    async def probe_dns(self, target: str, timeout: float):
+        loop = asyncio.get_running_loop()
+        if not await asyncio.wait_for(loop.getaddrinfo(target, None), timeout):
+            raise ValueError("no addresses")
+    
+    async def run_probe(self, probe: dict) -> tuple:
+        """(ok, latency ms, error) untuk satu target"""
+        kind = probe.get("type", "tcp")
+        timeout = probe.get("timeout", self.DEFAULT_TIMEOUT)
+        started = time.perf_counter()
+        try:
+            if kind == "http":
+                await self.probe_http(probe["target"], timeout, probe.get("expect_status"))
+            elif kind == "dns":
+                await self.probe_dns(probe["target"], timeout)
+            else:
+                await self.probe_tcp(probe["target"], timeout)
+        except asyncio.TimeoutError:
+            return False, None, f"timeout after {timeout}s"
+        except (OSError, aiohttp.ClientError, ValueError) as e:
+            return False, None, str(e) or e.__class__.__name__
+        return True, (time.perf_counter() - started) * 1000, None
+    
+    def record(self, name: str, probe: dict, ok: bool, latency: Optional[float], error: Optional[str]):
+        state = self.state.get(name)
+        if state is None:
+            state = {"hist": [0] * (len(self.LATENCY_BUCKETS) + 1), "recent": deque(maxlen=self.RECENT),
+                     "consecutive_failures": 0}
+            self.state[name] = state
+        state["recent"].append((ok, latency))
+        if ok:
+            index = next((i for i, edge in enumerate(self.LATENCY_BUCKETS) if latency <= edge), len(self.LATENCY_BUCKETS))
+            state["hist"][index] += 1
+            state["consecutive_failures"] = 0
+        else:
+            state["consecutive_failures"] += 1
+        
+        latencies = sorted(l for success, l in state["recent"] if success)
+        return {
+            "type": probe.get("type", "tcp"),
+            "target": probe["target"],
+            "ok": ok,
+            "latency": latency,
+            "error": error,
+            "success_rate": sum(1 for success, _ in state["recent"] if success) / len(state["recent"]) * 100,
+            "p50": latencies[len(latencies) // 2] if latencies else None,
+            "p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else None,
+            "consecutive_failures": state["consecutive_failures"],
+            "hist": list(state["hist"])
+        }
+    
+    async def collect(self) -> dict:
+        probes = CONFIG["probes"]
+        semaphore = asyncio.Semaphore(max(CONFIG["probe_concurrency"], 1))
+        
+        async def bounded(probe):
+            async with semaphore:
+                return await self.run_probe(probe)
+        
+        results = await asyncio.gather(*(bounded(p) for p in probes))
+        targets = {}
+        for probe, (ok, latency, error) in zip(probes, results):
+            name = probe.get("name") or probe["target"]
+            targets[name] = self.record(name, probe, ok, latency, error)
+        
+        # Target yang dihapus dari config tidak disimpan lagi
+        for name in list(self.state):
+            if name not in targets:
+                del self.state[name]
+        
+        return {"targets": targets, "up": sum(1 for t in targets.values() if t["ok"]), "total": len(targets)}
+    
+    def close(self):
+        if self.session is not None and not self.session.closed:
+            asyncio.get_running_loop().create_task(self.session.close())
+        self.session = None
+
+class InotifyWatcher:
+    """Watch direktori lewat inotify (ctypes), catat file yang berubah.
+    
+    Yang di-watch direktori, bukan file, supaya file baru hasil rotasi ikut terlihat.
+    """
+    IN_MODIFY = 0x00000002
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct("=iIII")
+    
+    def __init__(self):
+        # Import di sini: ctypes hanya perlu jika log tailing aktif
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}  # wd -> direktori
+        self.overflow = False
+    
+    def watch(self, directory: str) -> bool:
+        if directory in self.watches.values():
+            return True
+        mask = self.IN_MODIFY | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        wd = self._add_watch(self.fd, directory.encode(), mask)
+        if wd < 0:
+            return False
+        self.watches[wd] = directory
+        return True
+    
+    def changed(self) -> set:
+        """Path yang berubah sejak panggilan terakhir (non-blocking)"""
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + self.EVENT.size <= len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+                offset += self.EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    self.overflow = True
+                elif wd in self.watches and name:
+                    paths.add(os.path.join(self.watches[wd], name.decode(errors='replace')))
+        return paths
+    
+    def close(self):
+        os.close(self.fd)
+
+class LogTailCollector(Collector):
+    """Tail log file secara incremental dan hitung event per pattern per menit.
+    
+    Hanya byte baru sejak offset terakhir yang dibaca (offset disimpan di DataStore),
+    maksimal MAX_BYTES per file per run; sisanya dilanjutkan run berikutnya.
+    Perubahan file dideteksi lewat inotify, fallback ke polling os.stat.
+    """
+    name = "logs"
+    interval = 10
+    timeout = 30
+    executor = "thread"
+    
+    # Log default untuk service di monitor_services (dipakai jika file-nya ada)
+    SERVICE_LOGS = {
+        "nginx": ["/var/log/nginx/error.log"],
+        "apache2": ["/var/log/apache2/error.log"],
+        "httpd": ["/var/log/httpd/error_log"],
+        "mysql": ["/var/log/mysql/error.log"],
+        "mariadb": ["/var/log/mysql/error.log", "/var/log/mariadb/mariadb.log"],
+        "postgresql": ["/var/log/postgresql/postgresql-main.log"],
+        "redis-server": ["/var/log/redis/redis-server.log"],
+        "php-fpm": ["/var/log/php-fpm/error.log"],
+    }
+    DEFAULT_PATTERNS = {
+        "error": r"(?i)\berror\b|\[error\]",
+        "critical": r"(?i)\b(crit|critical|fatal|emerg|alert|panic)\b",
+    }
+    CHUNK = 256 * 1024  # Byte per read
+    MAX_BYTES = 4 * 1024 * 1024  # Byte maksimum per file per run
+    MAX_PARTIAL = 64 * 1024  # Sisa baris tanpa newline yang ditahan
+    BUCKETS = 15  # Menit agregat yang disimpan
+    POLL_EVERY = 6  # Run; file tanpa event inotify tetap di-stat sesekali
+    
+    def __init__(self, monitor=None):
+        super().__init__(monitor)
+        self.files: Dict[str, dict] = {}
+        self.compiled: Dict[tuple, re.Pattern] = {}
+        self.buckets: deque = deque(maxlen=self.BUCKETS)
+        self.watcher: Optional[InotifyWatcher] = None
+        self.mode = None  # "inotify" atau "polling"
+        self.runs = 0
+        if monitor is not None:
+            # Key dibuat sekarang; nanti hanya di-assign ulang dari thread collector
+            self.offsets = monitor.data_store.data.setdefault("log_offsets", {})
+        else:
+            self.offsets = {}
+    
+    def enabled(self) -> bool:
+        return bool(self.targets())
+    
+    def default(self):
+        return {"mode": None, "rates": {}, "files": {}}
+    
+    def targets(self) -> Dict[str, tuple]:
+        """path -> (label, {pattern name: regex}) dari log_files + monitor_services"""
+        targets = {}
+        for service in CONFIG["monitor_services"]:
+            for path in self.SERVICE_LOGS.get(service, []):
+                if os.path.exists(path):
+                    targets[path] = (service, self.DEFAULT_PATTERNS)
+        for entry in CONFIG["log_files"]:
+            label = entry.get("name") or os.path.basename(entry["path"])
+            targets[entry["path"]] = (label, entry.get("patterns") or self.DEFAULT_PATTERNS)
+        return targets
+    
+    def _pattern(self, name: str, regex: str) -> re.Pattern:
+        key = (name, regex)
+        if key not in self.compiled:
+            # Dicocokkan langsung ke chunk bytes, lihat _count_lines
+            self.compiled[key] = re.compile(regex.encode(), re.MULTILINE)
+        return self.compiled[key]
+    
+    @staticmethod
+    def _count_lines(pattern: re.Pattern, chunk: bytes) -> int:
+        """Jumlah baris yang cocok; baris dengan beberapa match tetap satu event"""
+        count = 0
+        position = 0
+        while True:
+            match = pattern.search(chunk, position)
+            if match is None:
+                return count
+            count += 1
+            # Chunk selalu diakhiri newline, lanjut dari baris berikutnya
+            position = chunk.find(b"\n", match.start()) + 1
+            if position == 0:
+                return count
+    
+    def _bucket(self, now: float) -> dict:
+        minute = int(now // 60) * 60
+        if not self.buckets or self.buckets[-1]["minute"] != minute:
+            self.buckets.append({"minute": minute, "counts": {}})
+        return self.buckets[-1]["counts"]
+    
+    def _open(self, path: str, state: dict, offset: int):
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        state.update(fd=fd, inode=os.fstat(fd).st_ino, offset=offset, partial=b"")
+    
+    def _close(self, state: dict):
+        if state.get("fd") is not None:
+            os.close(state["fd"])
+            state["fd"] = None
+    
+    def _drain(self, state: dict, label: str, patterns: dict, now: float):
+        """Baca byte baru dari offset, maksimal MAX_BYTES, hitung match per pattern"""
+        counts = self._bucket(now)
+        budget = self.MAX_BYTES
+        while budget > 0:
+            data = os.pread(state["fd"], min(self.CHUNK, budget), state["offset"])
+            if not data:
+                break
+            state["offset"] += len(data)
+            budget -= len(data)
+            data = state["partial"] + data
+            end = data.rfind(b"\n") + 1
+            state["partial"] = data[end:][-self.MAX_PARTIAL:]
+            chunk = data[:end]
+            if not chunk:
+                continue
+            for name, regex in patterns.items():
+                found = self._count_lines(self._pattern(name, regex), chunk)
+                if found:
+                    key = f"{label}:{name}"
+                    counts[key] = counts.get(key, 0) + found
+        return budget <= 0  # True jika masih ada backlog
+    
+    def _tail(self, path: str, label: str, patterns: dict, now: float):
+        state = self.files.setdefault(path, {"fd": None, "inode": None, "offset": 0, "partial": b"", "backlog": False})
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        
+        if state["fd"] is None:
+            if st is None:
+                return
+            saved = self.offsets.get(path)
+            if saved and saved[0] == st.st_ino and saved[1] <= st.st_size:
+                offset = saved[1]
+            else:
+                # File baru dilihat: mulai dari akhir, jangan hitung isi lama
+                offset = st.st_size if not saved else 0
+            self._open(path, state, offset)
+        elif st is None or st.st_ino != state["inode"]:
+            # Rotasi: habiskan sisa file lama dulu, lalu pindah ke file baru dari awal
+            state["backlog"] = self._drain(state, label, patterns, now)
+            if state["backlog"]:
+                return
+            self._close(state)
+            if st is None:
+                return
+            self._open(path, state, 0)
+        elif st.st_size < state["offset"]:
+            # Truncate (copytruncate): mulai ulang dari awal
+            state["offset"] = 0
+            state["partial"] = b""
+        
+        state["backlog"] = self._drain(state, label, patterns, now)
+    
+    def collect(self) -> dict:
+        now = time.time()
+        targets = self.targets()
+        self.runs += 1
+        
+        if self.mode is None:
+            try:
+                self.watcher = InotifyWatcher()
+                self.mode = "inotify"
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable ({e}), falling back to stat polling")
+                self.mode = "polling"
+        
+        changed = None
+        if self.watcher is not None:
+            for path in targets:
+                self.watcher.watch(os.path.dirname(path) or ".")
+            changed = self.watcher.changed()
+            if self.watcher.overflow or self.runs % self.POLL_EVERY == 0:
+                changed = None  # Event bisa hilang, cek semua file
+                self.watcher.overflow = False
+        
+        for path, (label, patterns) in targets.items():
+            state = self.files.get(path)
+            if changed is not None and state and state["fd"] is not None and not state["backlog"] and path not in changed:
+                continue
+            try:
+                self._tail(path, label, patterns, now)
+            except OSError as e:
+                print(f"Error tailing {path}: {e}")
+        
+        for path in list(self.files):
+            if path not in targets:
+                self._close(self.files.pop(path))
+        
+        # Assign dict baru sekaligus, DataStore.save bisa jalan bersamaan di event loop
+        self.offsets = {path: [state["inode"], state["offset"]] for path, state in self.files.items() if state["fd"] is not None}
+        if self.monitor is not None:
+            self.monitor.data_store.data["log_offsets"] = self.offsets
+        
+        # Rate = jumlah event di menit terakhir yang sudah lengkap
+        minute = int(now // 60) * 60
+        last = next((b["counts"] for b in self.buckets if b["minute"] == minute - 60), {})
+        current = self.buckets[-1]["counts"] if self.buckets and self.buckets[-1]["minute"] == minute else {}
+        keys = {f"{label}:{name}" for label, patterns in targets.values() for name in patterns}
+        return {
+            "mode": self.mode,
+            "rates": {key: last.get(key, 0) for key in sorted(keys)},
+            "current": {key: current.get(key, 0) for key in sorted(keys)},
+            "files": {
+                path: {"offset": state["offset"], "backlog": state["backlog"]}
+                for path, state in self.files.items()
+            }
+        }
+    
+    def close(self):
+        for state in self.files.values():
+            self._close(state)
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+class DockerCollector(Collector):
+    name = "docker"
+    interval = 30
+    timeout = 10
+    executor = "subprocess"
+    
+    def enabled(self) -> bool:
+        return CONFIG["monitor_docker"]
+    
+    def default(self):
+        return []
+    
+    def command(self) -> Optional[List[str]]:
+        return ['docker', 'ps', '--format', '{{.Names}}|{{.Status}}|{{.ID}}']
+    
+    def parse(self, returncode: int, stdout: str) -> list:
+        if returncode != 0:
+            raise RuntimeError(f"docker ps exited with {returncode}")
+        containers = []
+        for line in stdout.strip().split('\n'):
+            if line:
+                parts = line.split('|')
+                if len(parts) >= 3:
+                    containers.append({
+                        "name": parts[0],
+                        "status": parts[1],
+                        "id": parts[2]
+                    })
+        return containers
+
+class ServiceCollector(Collector):
+    """Status dan jumlah auto-restart semua monitor_services dengan satu panggilan systemctl"""
+    name = "services"
+    interval = 30
+    timeout = 10
+    executor = "subprocess"
+    
+    def enabled(self) -> bool:
+        return bool(CONFIG["monitor_services"])
+    
+    def default(self):
+        return {}
+    
+    def command(self) -> Optional[List[str]]:
+        return ['systemctl', 'show', '--property=ActiveState,NRestarts', '--', *CONFIG["monitor_services"]]
+    
+    def parse(self, returncode: int, stdout: str) -> dict:
+        # systemctl show mencetak satu blok KEY=value per unit (dipisah baris kosong), sesuai urutan argumen
+        blocks = [block for block in stdout.strip().split('\n\n') if block.strip()]
+        services = {}
+        for i, service_name in enumerate(CONFIG["monitor_services"]):
+            properties = {}
+            if i < len(blocks):
+                for line in blocks[i].splitlines():
+                    key, _, value = line.partition('=')
+                    properties[key.strip()] = value.strip()
+            state = properties.get("ActiveState", "unknown")
+            is_active = state == 'active'
+            restarts = properties.get("NRestarts", "")
+            services[service_name] = {
+                "name": service_name,
+                "status": "running" if is_active else ("unknown" if state == "unknown" else "stopped"),
+                "active": is_active,
+                "restarts": int(restarts) if restarts.isdigit() else None
+            }
+        return services
+
+class CollectorManager:
+    """Jalankan collector secara terisolasi, masing-masing dengan interval dan timeout sendiri"""
+    def __init__(self, max_workers: int = 4):
+        self.collectors: Dict[str, Collector] = {}
+        self.results: Dict[str, dict] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector")
+        # Diatur ResourceGovernor saat bot over budget
+        self.interval_scale = 1
+        self.suspended = set()
+    
+    def register(self, collector: Collector):
+        """Daftarkan collector"""
+        self.collectors[collector.name] = collector
+        self.results[collector.name] = {
+            "value": collector.default(),
+            "updated": 0,
+            "started": 0,
+            "error": None,
+            "duration": 0,
+            "runs": 0,
+            "failures": 0
+        }
+        if self.tasks and collector.name not in self.tasks:
+            self.tasks[collector.name] = asyncio.create_task(self._loop(collector))
+    
+    def get(self, name: str, default=None):
+        """Nilai terakhir yang berhasil (atau default collector)"""
+        result = self.results.get(name)
+        if result is None:
+            return default
+        return result["value"]
+    
+    def failing(self) -> Dict[str, dict]:
+        """Collector yang run terakhirnya gagal"""
+        return {
+            name: result for name, result in self.results.items()
+            if result["error"] and self.collectors[name].enabled()
+        }
+    
+    async def _execute(self, collector: Collector):
+        """Jalankan satu collect sesuai executor-nya"""
+        loop = asyncio.get_running_loop()
+        
+        if collector.executor == "subprocess":
+            argv = collector.command()
+            if not argv:
+                return collector.default()
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), collector.timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+            return collector.parse(proc.returncode, stdout.decode(errors='replace'))
+        
+        if collector.executor == "thread":
+            future = loop.run_in_executor(self.thread_pool, collector.collect)
+            self.in_flight[collector.name] = future
+            # shield: thread yang hang tidak bisa di-cancel, biarkan selesai sendiri
+            return await asyncio.wait_for(asyncio.shield(future), collector.timeout)
+        
+        if asyncio.iscoroutinefunction(collector.collect):
+            return await asyncio.wait_for(collector.collect(), collector.timeout)
+        return collector.collect()
+    
+    async def run_once(self, collector: Collector):
+        """Collect sekali, simpan hasil atau error tanpa mengganggu collector lain"""
+        result = self.results[collector.name]
+        
+        previous = self.in_flight.get(collector.name)
+        if previous is not None and not previous.done():
+            # Run sebelumnya masih jalan, jangan tumpuk thread baru
+            if time.time() - result["started"] > collector.timeout:
+                result["error"] = f"hung for {time.time() - result['started']:.0f}s"
+                result["failures"] += 1
+            return
+        
+        result["started"] = time.time()
+        started = time.perf_counter()
+        try:
+            value = await self._execute(collector)
+            result["value"] = value
+            result["updated"] = time.time()
+            result["error"] = None
+        except asyncio.TimeoutError:
+            result["error"] = f"timeout after {collector.timeout}s"
+            result["failures"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result["error"] = str(e) or e.__class__.__name__
+            result["failures"] += 1
+        finally:
+            result["duration"] = time.perf_counter() - started
+            result["runs"] += 1
+    
+    async def _loop(self, collector: Collector):
+        """Loop per collector, disejajarkan ke kelipatan interval"""
+        while True:
+            if collector.enabled() and collector.name not in self.suspended:
+                await self.run_once(collector)
+            interval = max(collector.interval, 1) * self.interval_scale
+            await asyncio.sleep(interval - (time.time() % interval))
+    
+    async def refresh(self, *names: str):
+        """Paksa collect sekarang (semua atau collector tertentu)"""
+        targets = [
+            c for c in self.collectors.values()
+            if (not names or c.name in names) and c.enabled() and c.name not in self.suspended
+        ]
+        await asyncio.gather(*(self.run_once(c) for c in targets))
+        
+        # Tunggu juga run yang sudah jalan duluan dari loop collector
+        pending = [f for f in self.in_flight.values() if not f.done()]
+        if pending:
+            await asyncio.wait([asyncio.shield(f) for f in pending])
+    
+    def start(self):
+        """Start loop semua collector"""
+        for name, collector in self.collectors.items():
+            task = self.tasks.get(name)
+            if task is None or task.done():
+                self.tasks[name] = asyncio.create_task(self._loop(collector))
+    
+    async def wait_ready(self, names: tuple, timeout: float):
+        """Tunggu run pertama collector tertentu selesai (maksimal timeout detik)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(self.results[name]["runs"] for name in names if self.collectors[name].enabled()):
+                return
+            await asyncio.sleep(0.05)
+    
+    def stop(self):
+        """Stop semua loop collector"""
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+        for collector in self.collectors.values():
+            if hasattr(collector, 'close'):
+                collector.close()
+        self.thread_pool.shutdown(wait=False)
+
+class ResourceGovernor:
+    """Jaga pemakaian CPU/RSS bot sendiri di bawah budget dengan degradasi bertahap.
+    
+    Level 1: interval collector & sampler diperpanjang
+    Level 2: + scan process/direktori dan hitung koneksi dimatikan
+    Level 3: + history di memory diperkecil
+    Naik satu level jika over budget OVER_CHECKS kali berturut-turut, turun
+    satu level jika di bawah RECOVER_RATIO budget RECOVER_CHECKS kali berturut-turut.
+    """
+    LEVELS = (
+        "normal",
+        "longer collection intervals",
+        "process/directory scans and connection counts disabled",
+        "reduced in-memory history"
+    )
+    OVER_CHECKS = 2
+    RECOVER_CHECKS = 5
+    RECOVER_RATIO = 0.7
+    EXPENSIVE_COLLECTORS = ("processes", "dirsize")
+    REDUCED_HISTORY = 250
+    
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.process = psutil.Process()
+        self.process.cpu_percent(interval=None)
+        self.level = 0
+        self.over = 0
+        self.under = 0
+        self.last = {"cpu": 0.0, "rss": 0, "traced": None, "traced_peak": None}
+        self.tracemalloc = None
+        if CONFIG["budget_tracemalloc"]:
+            # Import hanya jika diaktifkan
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    
+    def measure(self) -> dict:
+        """CPU% (per satu core) dan RSS proses bot"""
+        with self.process.oneshot():
+            self.last = {
+                "cpu": self.process.cpu_percent(interval=None),
+                "rss": self.process.memory_info().rss,
+                "traced": None,
+                "traced_peak": None
+            }
+        if self.tracemalloc is not None and self.tracemalloc.is_tracing():
+            self.last["traced"], self.last["traced_peak"] = self.tracemalloc.get_traced_memory()
+        return self.last
+    
+    def over_budget(self, usage: dict) -> Optional[str]:
+        """Alasan over budget, atau None"""
+        cpu_budget = CONFIG["budget_cpu"]
+        rss_budget = CONFIG["budget_rss_mb"] * 1024 * 1024
+        if cpu_budget and usage["cpu"] > cpu_budget:
+            return f"CPU {usage['cpu']:.1f}% > {cpu_budget}%"
+        if rss_budget and usage["rss"] > rss_budget:
+            return f"RSS {usage['rss'] / 1024 / 1024:.0f} MB > {CONFIG['budget_rss_mb']} MB"
+        return None
+    
+    def within_recovery(self, usage: dict) -> bool:
+        cpu_budget = CONFIG["budget_cpu"]
+        rss_budget = CONFIG["budget_rss_mb"] * 1024 * 1024
+        return (
+            (not cpu_budget or usage["cpu"] < cpu_budget * self.RECOVER_RATIO)
+            and (not rss_budget or usage["rss"] < rss_budget * self.RECOVER_RATIO)
+        )
+    
+    def apply(self, level: int):
+        """Terapkan semua langkah degradasi sampai level ini"""
+        monitor = self.monitor
+        monitor.collectors.interval_scale = 2 if level >= 1 else 1
+        monitor.sampler.slowdown = 2 if level >= 1 else 1
+        
+        expensive = level >= 2
+        monitor.collectors.suspended = set(self.EXPENSIVE_COLLECTORS) if expensive else set()
+        monitor.collectors.collectors["network"].count_connections = not expensive
+        
+        reduced = level >= 3
+        monitor.data_store.max_history = self.REDUCED_HISTORY if reduced else 1000
+        if reduced:
+            history = monitor.data_store.data["history"]
+            if len(history) > self.REDUCED_HISTORY:
+                monitor.data_store.data["history"] = history[-self.REDUCED_HISTORY:]
+            monitor.sampler.slowdown = 4
+        self.level = level
+    
+    def check(self) -> Optional[str]:
+        """Ukur dan naik/turun level; return pesan jika level berubah"""
+        if not CONFIG["budget_cpu"] and not CONFIG["budget_rss_mb"]:
+            if self.level:
+                self.apply(0)
+                return "Resource budget disabled: restored normal operation"
+            return None
+        
+        usage = self.measure()
+        reason = self.over_budget(usage)
+        if reason:
+            self.over += 1
+            self.under = 0
+        elif self.within_recovery(usage):
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+        
+        if reason and self.over >= self.OVER_CHECKS and self.level < len(self.LEVELS) - 1:
+            self.apply(self.level + 1)
+            self.over = 0
+            return f"Over resource budget ({reason}): degraded to level {self.level} ({self.LEVELS[self.level]})"
+        if self.under >= self.RECOVER_CHECKS and self.level > 0:
+            self.apply(self.level - 1)
+            self.under = 0
+            return (
+                f"Back under resource budget (CPU {usage['cpu']:.1f}%, RSS {usage['rss'] / 1024 / 1024:.0f} MB): "
+                f"recovered to level {self.level} ({self.LEVELS[self.level]})"
+            )
+        return None
+
+class ResponseCache:
+    """Cache response yang sudah dibangun, key berisi sequence data terakhir.
+    
+    Request identik di antara tick langsung dapat hasil yang sama, dan request
+    bersamaan untuk key yang sama digabung menjadi satu komputasi.
+    """
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.pending: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+    
+    async def get_or_build(self, key: tuple, builder):
+        """Ambil dari cache, tunggu build yang sedang jalan, atau build baru"""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        
+        if key in self.pending:
+            self.coalesced += 1
+            pending = self.pending[key]
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # Yang menunggu sendiri yang dicancel
+                # Build yang ditunggu dicancel, build ulang di sini
+                return await self.get_or_build(key, builder)
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        try:
+            value = builder()
+            if asyncio.iscoroutine(value):
+                value = await value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Tandai sudah dibaca jika tidak ada yang menunggu
+            raise
+        except BaseException:
+            # Builder dicancel: yang menunggu build ulang, jangan dibiarkan hang
+            future.cancel()
+            raise
+        finally:
+            self.pending.pop(key, None)
+        
+        self.entries[key] = value
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        future.set_result(value)
+        return value
+    
+    def hit_rate(self) -> float:
+        """Persentase request yang tidak perlu build ulang"""
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total * 100 if total else 0.0
+
+class RouteRateLimiter:
+    """Batasi request per route Discord (misal edit per channel) supaya tidak kena 429"""
+    def __init__(self, limit: int = 5, per: float = 5.0):
+        self.limit = limit
+        self.per = per
+        self.calls: Dict[str, deque] = {}
+    
+    def delay(self, route: str) -> float:
+        """Detik sampai route punya jatah (0 = bisa sekarang), tanpa memakai jatah"""
+        calls = self.calls.get(route)
+        if not calls:
+            return 0.0
+        now = time.monotonic()
+        while calls and now - calls[0] >= self.per:
+            calls.popleft()
+        if len(calls) < self.limit:
+            return 0.0
+        return self.per - (now - calls[0])
+    
+    def take(self, route: str):
+        """Pakai satu jatah route"""
+        self.calls.setdefault(route, deque()).append(time.monotonic())
+    
+    async def acquire(self, route: str):
+        """Tunggu sampai route punya jatah request"""
+        while True:
+            delay = self.delay(route)
+            if delay <= 0:
+                self.take(route)
+                return
+            await asyncio.sleep(delay)
+
+class OutboundScheduler:
+    """Satu antrian untuk semua request REST keluar ke Discord.
+    
+    Job diambil berdasarkan prioritas (alert > reply command > edit dashboard),
+    tapi hanya jika bucket route-nya masih punya jatah; route yang penuh
+    tidak menahan job di route lain. Edit dashboard dengan key yang sama
+    di-coalesce: job yang masih antri cukup diganti dengan konten terbaru.
+    """
+    ALERT = 0
+    REPLY = 1
+    DASHBOARD = 2
+    CLASSES = ("alert", "reply", "dashboard")
+    WORKERS = 4
+    MAX_QUEUE = 500  # Edit dashboard ditolak jika antrian sepenuh ini
+    SCAN = 50  # Job yang dicek per kelas saat mencari route yang punya jatah
+    
+    def __init__(self):
+        self.queues = [deque() for _ in self.CLASSES]
+        self.pending: Dict[str, dict] = {}  # coalesce key -> job yang masih antri
+        self.routes = RouteRateLimiter()
+        self.global_bucket = RouteRateLimiter(limit=40, per=1.0)  # Di bawah limit global Discord 50/s
+        self.in_flight = [0] * len(self.CLASSES)
+        self.stats = [
+            {"sent": 0, "errors": 0, "coalesced": 0, "rejected": 0, "max_wait": 0.0, "waits": deque(maxlen=200)}
+            for _ in self.CLASSES
+        ]
+        self.wakeup: Optional[asyncio.Event] = None
+        self.workers: List[asyncio.Task] = []
+    
+    def _ensure_started(self):
+        if not self.workers:
+            self.wakeup = asyncio.Event()
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.WORKERS)]
+    
+    def submit(self, priority: int, route: str, factory, coalesce: Optional[str] = None) -> asyncio.Future:
+        """Antrikan factory() (coroutine REST), hasilnya lewat future"""
+        self._ensure_started()
+        
+        job = self.pending.get(coalesce) if coalesce is not None else None
+        if job is not None:
+            # Konten lama belum terkirim, cukup kirim yang terbaru
+            job["factory"] = factory
+            self.stats[priority]["coalesced"] += 1
+            return job["future"]
+        
+        future = asyncio.get_running_loop().create_future()
+        if priority == self.DASHBOARD and sum(len(q) for q in self.queues) >= self.MAX_QUEUE:
+            self.stats[priority]["rejected"] += 1
+            future.set_result(None)
+            return future
+        
+        job = {"route": route, "factory": factory, "future": future, "coalesce": coalesce,
+               "priority": priority, "queued": time.monotonic()}
+        self.queues[priority].append(job)
+        if coalesce is not None:
+            self.pending[coalesce] = job
+        self.wakeup.set()
+        return future
+    
+    def dashboard_limit(self) -> int:
+        """Edit dashboard bersamaan; minimal satu worker selalu tersisa untuk alert/reply"""
+        return max(min(CONFIG["dashboard_concurrency"], self.WORKERS - 1), 1)
+    
+    def _next_job(self) -> tuple:
+        """(job, None) jika ada yang bisa jalan, atau (None, detik sampai ada jatah)"""
+        wait = self.global_bucket.delay("global")
+        if wait > 0:
+            return None, wait
+        
+        wait = None
+        for priority, queue in enumerate(self.queues):
+            if priority == self.DASHBOARD and self.in_flight[priority] >= self.dashboard_limit():
+                continue
+            for index, job in enumerate(queue):
+                if index >= self.SCAN:
+                    break
+                delay = self.routes.delay(job["route"])
+                if delay <= 0:
+                    del queue[index]
+                    self.routes.take(job["route"])
+                    self.global_bucket.take("global")
+                    return job, None
+                wait = delay if wait is None else min(wait, delay)
+        return None, wait
+    
+    async def _worker(self):
+        while True:
+            job, wait = self._next_job()
+            if job is None:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            if job["coalesce"] is not None:
+                # Edit yang datang mulai sekarang masuk job baru
+                self.pending.pop(job["coalesce"], None)
+            
+            priority = job["priority"]
+            stats = self.stats[priority]
+            waited = time.monotonic() - job["queued"]
+            stats["waits"].append(waited)
+            stats["max_wait"] = max(stats["max_wait"], waited)
+            
+            self.in_flight[priority] += 1
+            try:
+                result = await job["factory"]()
+                stats["sent"] += 1
+                if not job["future"].done():
+                    job["future"].set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats["errors"] += 1
+                if not job["future"].done():
+                    job["future"].set_exception(e)
+            finally:
+                self.in_flight[priority] -= 1
+                # Slot dashboard bisa terbuka, bangunkan worker lain
+                self.wakeup.set()
+    
+    def summary(self) -> List[dict]:
+        """Statistik per kelas prioritas untuk !internals"""
+        rows = []
+        for priority, name in enumerate(self.CLASSES):
+            stats = self.stats[priority]
+            waits = sorted(stats["waits"])
+            rows.append({
+                "class": name,
+                "queued": len(self.queues[priority]),
+                "in_flight": self.in_flight[priority],
+                "sent": stats["sent"],
+                "errors": stats["errors"],
+                "coalesced": stats["coalesced"],
+                "rejected": stats["rejected"],
+                "p95_wait": waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+                "max_wait": stats["max_wait"]
+            })
+        return rows
+    
+    def stop(self):
+        for task in self.workers:
+            task.cancel()
+        self.workers = []
+    
+    # Helper untuk call site yang umum
+    def send(self, channel, *args, priority: int = REPLY, **kwargs) -> asyncio.Future:
+        return self.submit(priority, f"channel:{channel.id}", lambda: channel.send(*args, **kwargs))
+    
+    def reply(self, message, *args, **kwargs) -> asyncio.Future:
+        return self.submit(self.REPLY, f"channel:{message.channel.id}", lambda: message.reply(*args, **kwargs))
+    
+    def react(self, message, emoji: str) -> asyncio.Future:
+        return self.submit(self.REPLY, f"reaction:{message.channel.id}", lambda: message.add_reaction(emoji))
+    
+    def followup(self, interaction, *args, **kwargs) -> asyncio.Future:
+        return self.submit(self.REPLY, f"interaction:{interaction.id}", lambda: interaction.followup.send(*args, **kwargs))
+
+class DashboardRegistry:
+    """Fan-out satu snapshot ke banyak dashboard (channel, view_mode)"""
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.messages: Dict[str, discord.PartialMessage] = {}
+    
+    @property
+    def message_ids(self) -> dict:
+        """Message ID per dashboard, disimpan supaya restart edit pesan lama"""
+        return self.monitor.data_store.data.setdefault("dashboards", {})
+    
+    @staticmethod
+    def key(channel_id: int, view_mode: str) -> str:
+        # Dashboard utama per channel saja: !config view tetap mengedit pesan yang sama
+        if channel_id == CONFIG["channel_id"] and view_mode == CONFIG["view_mode"]:
+            return str(channel_id)
+        return f"{channel_id}:{view_mode}"
+    
+    def _prune(self, keys: set):
+        """Lupakan message ID dashboard yang tidak lagi jadi target"""
+        stored = self.message_ids
+        primary = str(CONFIG["channel_id"])
+        changed = False
+        for key in [k for k in stored if k not in keys]:
+            message_id = stored.pop(key)
+            self.messages.pop(key, None)
+            changed = True
+            # Key lama "channel:view" milik channel utama: pesannya tetap dipakai
+            if key.split(":")[0] == primary and primary in keys and primary not in stored:
+                stored[primary] = message_id
+        if changed:
+            self.monitor.data_store.save()
+    
+    def targets(self) -> List[tuple]:
+        """Semua (channel_id, view_mode), channel utama dulu"""
+        targets = []
+        if CONFIG["channel_id"]:
+            targets.append((CONFIG["channel_id"], CONFIG["view_mode"]))
+        for dashboard in CONFIG["dashboards"]:
+            target = (int(dashboard["channel_id"]), dashboard.get("view_mode", CONFIG["view_mode"]))
+            if target not in targets:
+                targets.append(target)
+        return targets
+    
+    def reset(self):
+        """Lupakan pesan lama, publish berikutnya kirim pesan baru"""
+        self.messages.clear()
+        self.message_ids.clear()
+        self.monitor.data_store.save()
+    
+    async def publish(self, snapshot: dict):
+        """Render sekali per view mode, lalu antrikan edit semua dashboard.
+        
+        Concurrency dibatasi scheduler (dashboard_concurrency); edit yang belum
+        terkirim diganti dengan snapshot yang lebih baru.
+        """
+        targets = self.targets()
+        self._prune({self.key(channel_id, view_mode) for channel_id, view_mode in targets})
+        embeds = {}
+        for _, view_mode in targets:
+            if view_mode not in embeds:
+                embeds[view_mode] = self.monitor.render_stats_embed(snapshot, view_mode)
+        
+        outbound = self.monitor.outbound
+        results = await asyncio.gather(
+            *(
+                outbound.submit(
+                    outbound.DASHBOARD,
+                    f"channel:{channel_id}",
+                    lambda channel_id=channel_id, view_mode=view_mode: self._publish_one(
+                        channel_id, view_mode, embeds[view_mode]
+                    ),
+                    coalesce=self.key(channel_id, view_mode)
+                )
+                for channel_id, view_mode in targets
+            ),
+            return_exceptions=True
+        )
+        for (channel_id, view_mode), result in zip(targets, results):
+            if isinstance(result, Exception):
+                print(f"Error updating dashboard {channel_id} ({view_mode}): {result}")
+    
+    async def _publish_one(self, channel_id: int, view_mode: str, embed: discord.Embed):
+        """Edit pesan dashboard yang ada, atau kirim baru"""
+        channel = self.monitor.client.get_channel(channel_id)
+        if not channel:
+            print(f"Channel {channel_id} tidak ditemukan!")
+            return
+        
+        key = self.key(channel_id, view_mode)
+        view = StatsView(self.monitor)
+        
+        message = self.messages.get(key)
+        if message is None and key in self.message_ids:
+            message = channel.get_partial_message(self.message_ids[key])
+        
+        if message is not None:
+            try:
+                # Update pesan yang sudah ada
+                await message.edit(embed=embed, view=view)
+                self.messages[key] = message
+                return
+            except discord.NotFound:
+                # Pesan sudah dihapus, kirim yang baru
+                self.messages.pop(key, None)
+        
+        # Kirim pesan baru
+        message = await channel.send(embed=embed, view=view)
+        self.messages[key] = message
+        self.message_ids[key] = message.id
+        self.monitor.data_store.save()
+        print(f"Stats message sent to {channel_id} ({view_mode})!")
+
+class ChartRenderer:
+    """Render line chart ke PNG tanpa dependency (raster RGB + zlib).
+    
+    Tiap titik adalah (min, avg, max) satu bucket: band min-max digambar
+    redup di belakang garis avg. Teks (judul, skala) ditaruh di embed.
+    """
+    WIDTH = 640
+    HEIGHT = 200
+    PAD = 6
+    BACKGROUND = (0x2b, 0x2d, 0x31)
+    GRID = (0x40, 0x44, 0x4b)
+    BAND = (0x3b, 0x5b, 0x7a)
+    LINE = (0x58, 0xb9, 0xff)
+    THRESHOLD = (0xed, 0x42, 0x45)
+    SPARKS = "▁▂▃▄▅▆▇█"
     
-    def add_history(self, stats: dict):
-        """Tambah history entry (max 1000)"""
-        self.data["history"].append({
-            "timestamp": datetime.datetime.now().isoformat(),
-            "stats": stats
-        })
-        # Keep only last 1000 entries
-        if len(self.data["history"]) > 1000:
-            self.data["history"] = self.data["history"][-1000:]
-        self.save()
+    def __init__(self):
+        self.pixels = bytearray()
     
-    def add_alert(self, alert_type: str, message: str, value: float):
-        """Tambah alert log"""
-        self.data["alerts"].append({
-            "timestamp": datetime.datetime.now().isoformat(),
-            "type": alert_type,
-            "message": message,
-            "value": value
-        })
-        if len(self.data["alerts"]) > 500:
-            self.data["alerts"] = self.data["alerts"][-500:]
-        self.save()
+    def _fill(self, color: tuple):
+        self.pixels = bytearray(bytes(color) * (self.WIDTH * self.HEIGHT))
     
-    def add_audit_log(self, user: str, command: str, success: bool):
-        """Tambah audit log"""
-        self.data["audit_logs"].append({
-            "timestamp": datetime.datetime.now().isoformat(),
-            "user": user,
-            "command": command,
-            "success": success
-        })
-        if len(self.data["audit_logs"]) > 500:
-            self.data["audit_logs"] = self.data["audit_logs"][-500:]
-        self.save()
+    def _set(self, x: int, y: int, color: tuple):
+        if 0 <= x < self.WIDTH and 0 <= y < self.HEIGHT:
+            index = (y * self.WIDTH + x) * 3
+            self.pixels[index:index + 3] = bytes(color)
     
-    def get_history(self, hours: int = 24) -> list:
-        """Get history untuk X jam terakhir"""
-        cutoff = datetime.datetime.now() - datetime.timedelta(hours=hours)
-        return [
-            entry for entry in self.data["history"]
-            if datetime.datetime.fromisoformat(entry["timestamp"]) > cutoff
-        ]
-
-class NetworkMonitor:
-    def __init__(self):
-        self.last_bytes_sent = 0
-        self.last_bytes_recv = 0
-        self.last_check_time = time.time()
-        self.current_sent_rate = 0
-        self.current_recv_rate = 0
-        self.peak_sent_rate = 0
-        self.peak_recv_rate = 0
+    def _vline(self, x: int, y0: int, y1: int, color: tuple):
+        for y in range(min(y0, y1), max(y0, y1) + 1):
+            self._set(x, y, color)
+    
+    def _hline(self, y: int, color: tuple, dash: int = 0):
+        for x in range(self.WIDTH):
+            if not dash or (x // dash) % 2 == 0:
+                self._set(x, y, color)
+    
+    def _line(self, x0: int, y0: int, x1: int, y1: int, color: tuple):
+        """Bresenham, tebal 2 px"""
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+        error = dx + dy
+        while True:
+            self._set(x0, y0, color)
+            self._set(x0, y0 + 1, color)
+            if x0 == x1 and y0 == y1:
+                break
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x0 += sx
+            if doubled <= dx:
+                error += dx
+                y0 += sy
+    
+    def _png(self) -> bytes:
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
         
-    def update_rates(self, bytes_sent, bytes_recv):
-        current_time = time.time()
-        time_diff = current_time - self.last_check_time
+        stride = self.WIDTH * 3
+        raw = b"".join(b"\x00" + bytes(self.pixels[y * stride:(y + 1) * stride]) for y in range(self.HEIGHT))
+        header = struct.pack(">IIBBBBB", self.WIDTH, self.HEIGHT, 8, 2, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+    
+    def render(self, points: List[Optional[tuple]], low: float, high: float,
+               threshold: Optional[float] = None) -> bytes:
+        """PNG dari list (min, avg, max) per bucket, None = tidak ada data"""
+        self._fill(self.BACKGROUND)
+        top, bottom = self.PAD, self.HEIGHT - self.PAD - 1
+        span = (high - low) or 1
         
-        if self.last_bytes_sent > 0 and time_diff > 0:
-            sent_diff = bytes_sent - self.last_bytes_sent
-            recv_diff = bytes_recv - self.last_bytes_recv
-            
-            self.current_sent_rate = sent_diff / time_diff / 1024  # KB/s
-            self.current_recv_rate = recv_diff / time_diff / 1024  # KB/s
-            
-            # Update peaks
-            self.peak_sent_rate = max(self.peak_sent_rate, self.current_sent_rate)
-            self.peak_recv_rate = max(self.peak_recv_rate, self.current_recv_rate)
+        def y_of(value: float) -> int:
+            return bottom - int(round((min(max(value, low), high) - low) / span * (bottom - top)))
         
-        self.last_bytes_sent = bytes_sent
-        self.last_bytes_recv = bytes_recv
-        self.last_check_time = current_time
+        for fraction in (0.25, 0.5, 0.75):
+            self._hline(y_of(low + span * fraction), self.GRID)
+        if threshold is not None and low < threshold < high:
+            self._hline(y_of(threshold), self.THRESHOLD, dash=6)
+        
+        count = max(len(points), 1)
+        previous = None
+        for index, point in enumerate(points):
+            x0 = index * self.WIDTH // count
+            x1 = max((index + 1) * self.WIDTH // count - 1, x0)
+            if point is None:
+                previous = None
+                continue
+            minimum, average, maximum = point
+            for x in range(x0, x1 + 1):
+                self._vline(x, y_of(minimum), y_of(maximum), self.BAND)
+            current = ((x0 + x1) // 2, y_of(average))
+            if previous is not None:
+                self._line(previous[0], previous[1], current[0], current[1], self.LINE)
+            else:
+                self._line(current[0], current[1], current[0], current[1], self.LINE)
+            previous = current
+        return self._png()
+    
+    @classmethod
+    def sparkline(cls, values: List[Optional[float]], low: float, high: float, width: int = 60) -> str:
+        """Sparkline unicode, dirata-rata ke maksimal width karakter"""
+        if len(values) > width:
+            size = len(values) / width
+            grouped = []
+            for i in range(width):
+                group = [v for v in values[int(i * size):int((i + 1) * size)] if v is not None]
+                grouped.append(sum(group) / len(group) if group else None)
+            values = grouped
+        span = (high - low) or 1
+        levels = len(cls.SPARKS) - 1
+        return "".join(
+            " " if v is None else cls.SPARKS[int(round((min(max(v, low), high) - low) / span * levels))]
+            for v in values
+        )
 
 class StatsView(View):
     """Interactive buttons untuk stats"""
@@ -158,6 +4229,16 @@ class StatsView(View):
         await interaction.response.defer()
         await self.monitor.send_alert_summary(interaction)
     
+    @discord.ui.button(label="📈 Graph", style=discord.ButtonStyle.secondary, custom_id="graph")
+    async def graph_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.defer()
+        await self.monitor.send_graph(interaction, "cpu", "6h")
+    
+    @discord.ui.button(label="🐳 Containers", style=discord.ButtonStyle.secondary, custom_id="containers")
+    async def containers_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.defer()
+        await self.monitor.send_resource_list(interaction, "containers" if CONFIG["monitor_docker"] else "services")
+    
     @discord.ui.button(label="⚙️ Config", style=discord.ButtonStyle.secondary, custom_id="config")
     async def config_button(self, interaction: discord.Interaction, button: Button):
         if not self.monitor.is_admin(interaction.user):
@@ -166,6 +4247,56 @@ class StatsView(View):
         await interaction.response.defer()
         await self.monitor.send_config_info(interaction)
 
+class ResourceListView(View):
+    """Daftar container/service per halaman, dirender dari snapshot dashboard terakhir"""
+    def __init__(self, monitor, kind: str = "containers", sort: str = "status"):
+        super().__init__(timeout=600)
+        self.monitor = monitor
+        self.kind = kind
+        self.sort = sort
+        self.page = 0
+        for option in self.sort_select.options:
+            option.default = option.value == sort
+    
+    def render(self) -> discord.Embed:
+        """Embed halaman sekarang, sekalian update state tombol"""
+        embed, self.page, pages = self.monitor.build_resource_page(self.kind, self.sort, self.page)
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= pages - 1
+        self.kind_button.label = "⚙️ Services" if self.kind == "containers" else "🐳 Containers"
+        return embed
+    
+    @discord.ui.select(
+        placeholder="Sort by...",
+        options=[
+            discord.SelectOption(label="Status (unhealthy first)", value="status"),
+            discord.SelectOption(label="CPU usage", value="cpu"),
+            discord.SelectOption(label="Memory usage", value="memory"),
+        ]
+    )
+    async def sort_select(self, interaction: discord.Interaction, select: Select):
+        self.sort = select.values[0]
+        self.page = 0
+        for option in select.options:
+            option.default = option.value == self.sort
+        await interaction.response.edit_message(embed=self.render(), view=self)
+    
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: Button):
+        self.page -= 1
+        await interaction.response.edit_message(embed=self.render(), view=self)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.render(), view=self)
+    
+    @discord.ui.button(label="⚙️ Services", style=discord.ButtonStyle.primary)
+    async def kind_button(self, interaction: discord.Interaction, button: Button):
+        self.kind = "services" if self.kind == "containers" else "containers"
+        self.page = 0
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
 class ServerMonitor:
     def __init__(self):
         # Setup Discord client
@@ -174,12 +4305,27 @@ class ServerMonitor:
         self.client = discord.Client(intents=intents)
         
         # Variables
-        self.status_message: Optional[discord.Message] = None
+        self.dashboards = DashboardRegistry(self)
+        self.last_snapshot: Optional[dict] = None
         self.start_time = datetime.datetime.now()
         self.network_monitor = NetworkMonitor()
         self.data_store = DataStore()
-        self.last_alert_time = {}
-        self.alert_cooldown = 300  # 5 minutes cooldown per alert type
+        self.collectors = CollectorManager()
+        for collector_class in (CpuCollector, MemoryCollector, DiskCollector, NetworkCollector,
+                                TemperatureCollector, PressureCollector, ProcessCollector,
+                                DockerCollector, ServiceCollector, CgroupCollector, ProcEventCollector,
+                                ProbeCollector, LogTailCollector, DirSizeCollector):
+            self.collectors.register(collector_class(self))
+        self.sampler = MetricSampler(self)
+        self.sampler_task: Optional[asyncio.Task] = None
+        self.response_cache = ResponseCache()
+        self.outbound = OutboundScheduler()
+        self.governor = ResourceGovernor(self)
+        self.reports = ReportAggregator(self.data_store)
+        self.incidents = IncidentManager(self.data_store)
+        self.heavy_hitters = HeavyHitterTracker(
+            CONFIG["heavy_hitter_capacity"], CONFIG["heavy_hitter_hours"]
+        )
         
         # Setup events
         self.setup_events()
@@ -197,12 +4343,31 @@ class ServerMonitor:
     def setup_events(self):
         @self.client.event
         async def on_ready():
+            STARTUP_TIMER.mark("connected")
             print(f'Bot logged in as {self.client.user}!')
             print(f'Starting auto-update every {CONFIG["update_interval"]} seconds...')
             
+            # Button di pesan dashboard lama tetap jalan setelah restart
+            self.client.add_view(StatsView(self))
+            
+            # History lama di-load di background, dashboard tidak menunggu
+            self.data_store.start_history_loader()
+            
+            # Start collectors dan sampler (terpisah dari refresh embed)
+            self.data_store.start_flusher()
+            self.collectors.start()
+            if self.sampler_task is None or self.sampler_task.done():
+                self.sampler_task = asyncio.create_task(self.sampler.run())
+            
+            # Snapshot pertama butuh nilai collector inti, bukan default kosong
+            await self.collectors.wait_ready(("cpu", "memory", "disk", "network"), timeout=5)
+            STARTUP_TIMER.mark("collectors ready")
+            
             # Start the monitoring loop
             self.update_stats.start()
             self.check_alerts.start()
+            self.check_budget.start()
+            self.check_reports.start()
         
         @self.client.event
         async def on_message(message):
@@ -210,51 +4375,103 @@ class ServerMonitor:
                 return
             
             cmd = message.content.lower().strip()
+            parts = cmd.split()
+            if not parts:
+                # Attachment/sticker saja, atau tanpa message-content intent
+                return
             
             # Public commands
             if cmd == '!updatestats' or cmd == '!stats':
                 await self.send_or_update_stats()
-                await message.add_reaction('✅')
+                await self.outbound.react(message, '✅')
             
             elif cmd == '!setstats':
-                self.status_message = None
+                self.dashboards.reset()
                 await self.send_or_update_stats()
-                await message.add_reaction('🔄')
+                await self.outbound.react(message, '🔄')
             
             elif cmd.startswith('!history'):
-                parts = cmd.split()
+                if len(parts) > 2 or (len(parts) == 2 and parts[1][0].isalpha()):
+                    await self.send_history_query(message, parts[1:])
+                    return
                 hours = 24
                 if len(parts) > 1:
-                    try:
-                        hours = int(parts[1].replace('h', ''))
-                    except:
-                        pass
+                    # '24', '24h', '7d', '90m': semua lewat parse_duration
+                    seconds = parse_duration(parts[1])
+                    if seconds is None or seconds <= 0 or seconds > CONFIG["history_retention_days"] * 86400:
+                        await self.outbound.reply(message, "Usage: `!history [window]` (e.g. `!history 24h`, `!history 7d`)")
+                        return
+                    hours = max(seconds // 3600, 1)
                 await self.send_history_stats(message, hours)
             
+            elif cmd.startswith('!graph'):
+                if len(parts) < 2:
+                    await self.outbound.reply(message, "Usage: `!graph <metric> [window]` (e.g. `!graph cpu 6h`)")
+                    return
+                await self.send_graph(message, self.HISTORY_ALIASES.get(parts[1], parts[1]), parts[2] if len(parts) > 2 else "6h")
+            
             elif cmd == '!alerts':
                 await self.send_alert_summary(message)
             
+            elif cmd == '!incidents':
+                await self.send_incidents(message)
+            
+            elif cmd.startswith('!top'):
+                await self.send_heavy_hitters(message)
+            
+            elif cmd.startswith('!probes'):
+                await self.send_probe_report(message)
+            
+            elif cmd in ('!disk', '!disk top'):
+                await self.send_disk_report(message)
+            
+            elif cmd.startswith('!report'):
+                await self.send_report(message)
+            
+            elif parts[0] in ('!containers', '!services'):
+                sort = parts[1] if len(parts) > 1 and parts[1] in ('status', 'cpu', 'memory') else "status"
+                await self.send_resource_list(message, parts[0][1:], sort)
+            
             elif cmd == '!help':
                 await self.send_help(message)
             
             # Admin commands
             elif cmd.startswith('!config'):
                 if not self.is_admin(message.author):
-                    await message.reply("❌ Admin only!")
+                    await self.outbound.reply(message, "❌ Admin only!")
                     return
                 await self.handle_config_command(message)
             
             elif cmd == '!audit':
                 if not self.is_admin(message.author):
-                    await message.reply("❌ Admin only!")
+                    await self.outbound.reply(message, "❌ Admin only!")
                     return
                 await self.send_audit_logs(message)
             
             elif cmd.startswith('!service'):
                 if not self.is_admin(message.author):
-                    await message.reply("❌ Admin only!")
+                    await self.outbound.reply(message, "❌ Admin only!")
                     return
                 await self.handle_service_command(message)
+            
+            elif cmd == '!internals':
+                if not self.is_admin(message.author):
+                    await self.outbound.reply(message, "❌ Admin only!")
+                    return
+                await self.send_internals(message)
+            
+            elif cmd == '!flush':
+                if not self.is_admin(message.author):
+                    await self.outbound.reply(message, "❌ Admin only!")
+                    return
+                await self.data_store.flush_async()
+                await self.outbound.reply(message, f"💾 Data flushed in {self.data_store.last_flush_duration * 1000:.0f} ms")
+            
+            elif cmd.startswith('!export'):
+                if not self.is_admin(message.author):
+                    await self.outbound.reply(message, "❌ Admin only!")
+                    return
+                await self.handle_export_command(message)
     
     def get_progress_bar(self, percentage: float, length: int = 10) -> str:
         """Generate progress bar dengan emoji"""
@@ -263,49 +4480,14 @@ class ServerMonitor:
         return f"{bar} {percentage:.1f}%"
     
     def get_temperature(self) -> dict:
-        """Get temperature info"""
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                # Get first available temperature sensor
-                for name, entries in temps.items():
-                    if entries:
-                        return {
-                            "current": entries[0].current,
-                            "high": entries[0].high if entries[0].high else 100,
-                            "critical": entries[0].critical if entries[0].critical else 100
-                        }
-        except:
-            pass
-        return {"current": 0, "high": 0, "critical": 0}
+        """Get temperature info (cache dari collector)"""
+        return self.collectors.get('temperature')
     
     def get_docker_stats(self) -> list:
-        """Get Docker container stats"""
+        """Get Docker container stats (cache dari collector)"""
         if not CONFIG["monitor_docker"]:
             return []
-        
-        try:
-            result = subprocess.run(
-                ['docker', 'ps', '--format', '{{.Names}}|{{.Status}}|{{.ID}}'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                containers = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        parts = line.split('|')
-                        if len(parts) >= 3:
-                            containers.append({
-                                "name": parts[0],
-                                "status": parts[1],
-                                "id": parts[2]
-                            })
-                return containers
-        except:
-            pass
-        return []
+        return self.collectors.get('docker', [])
     
     def get_service_status(self, service_name: str) -> dict:
         """Check service status"""
@@ -329,194 +4511,69 @@ class ServerMonitor:
                 "active": False
             }
     
+    def paused_note(self, collector: str) -> Optional[str]:
+        """Keterangan jika collector ditangguhkan ResourceGovernor (data yang tampil basi)"""
+        if collector in self.collectors.suspended:
+            return f"paused by budget (level {self.governor.level})"
+        return None
+    
     def get_top_processes(self, count: int = 5) -> list:
-        """Get top processes by CPU usage"""
-        try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    info = proc.info
-                    processes.append({
-                        'name': info['name'],
-                        'cpu': info['cpu_percent'],
-                        'memory': info['memory_percent']
-                    })
-                except:
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x['cpu'], reverse=True)
-            return processes[:count]
-        except:
-            return []
+        """Get top processes by CPU usage (cache dari collector)"""
+        return self.collectors.get('processes', [])[:count]
     
     def get_cpu_info(self) -> dict:
         """Mendapatkan informasi CPU dengan temperature"""
+        cpu_info = dict(self.collectors.get('cpu'))
         try:
-            cpu_model = "Unknown Processor"
-            try:
-                with open('/proc/cpuinfo', 'r') as f:
-                    lines = f.readlines()
-                    for line in lines:
-                        if 'model name' in line:
-                            cpu_model = line.split(':')[1].strip()
-                            break
-            except:
-                cpu_model = platform.processor() or f"{platform.machine()} Processor"
-            
-            cpu_freq = psutil.cpu_freq()
-            cpu_count_physical = psutil.cpu_count(logical=False)
-            cpu_count_logical = psutil.cpu_count(logical=True)
-            cpu_usage = psutil.cpu_percent(interval=1)
-            cpu_per_core = psutil.cpu_percent(interval=1, percpu=True)
-            
-            temp_info = self.get_temperature()
-            
-            return {
-                "model": cpu_model,
-                "usage": cpu_usage,
-                "per_core": cpu_per_core,
-                "cores_physical": cpu_count_physical or cpu_count_logical // 2,
-                "cores_logical": cpu_count_logical,
-                "frequency": cpu_freq.current if cpu_freq else "N/A",
-                "temperature": temp_info["current"]
-            }
+            # Pakai sample terakhir dari sampler supaya tidak blocking
+            cpu_usage = self.sampler.latest('cpu')
+            if cpu_usage is not None and self.sampler.per_core:
+                cpu_per_core = self.sampler.per_core
+            else:
+                cpu_usage = psutil.cpu_percent(interval=None)
+                cpu_per_core = psutil.cpu_percent(interval=None, percpu=True)
         except Exception as e:
             print(f"Error getting CPU info: {e}")
-            return {
-                "model": "Unknown Processor",
-                "usage": 0,
-                "per_core": [],
-                "cores_physical": 1,
-                "cores_logical": 2,
-                "frequency": "N/A",
-                "temperature": 0
-            }
+            cpu_usage = 0
+            cpu_per_core = []
+        
+        cpu_info.update({
+            "usage": cpu_usage,
+            "per_core": cpu_per_core,
+            # Peak per core selama satu interval update (untuk heatmap)
+            "core_peaks": self.sampler.core_history.peaks(CONFIG["update_interval"]) or cpu_per_core,
+            "temperature": self.get_temperature()["current"],
+            "temperature_detail": self.get_temperature()
+        })
+        return cpu_info
     
     def get_memory_info(self) -> dict:
-        """Mendapatkan informasi Memory"""
-        try:
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            
-            return {
-                "total": memory.total / (1024**3),
-                "used": memory.used / (1024**3),
-                "available": memory.available / (1024**3),
-                "percentage": memory.percent,
-                "swap_total": swap.total / (1024**3),
-                "swap_used": swap.used / (1024**3),
-                "swap_percentage": swap.percent
-            }
-        except Exception as e:
-            print(f"Error getting memory info: {e}")
-            return {
-                "total": 0,
-                "used": 0,
-                "available": 0,
-                "percentage": 0,
-                "swap_total": 0,
-                "swap_used": 0,
-                "swap_percentage": 0
-            }
+        """Mendapatkan informasi Memory (cache dari collector)"""
+        return self.collectors.get('memory')
     
     def get_disk_info(self) -> dict:
-        """Mendapatkan informasi Disk"""
-        try:
-            disk = psutil.disk_usage('/')
-            io_counters = psutil.disk_io_counters()
-            
-            total_gb = disk.total / (1024**3)
-            used_gb = disk.used / (1024**3)
-            
-            if total_gb > 1000:
-                total_display = f"{total_gb / 1024:.2f} TB"
-                used_display = f"{used_gb:.2f} GB"
-            else:
-                total_display = f"{total_gb:.2f} GB"
-                used_display = f"{used_gb:.2f} GB"
-            
-            return {
-                "total": total_gb,
-                "used": used_gb,
-                "free": disk.free / (1024**3),
-                "percentage": (disk.used / disk.total) * 100,
-                "total_display": total_display,
-                "used_display": used_display,
-                "read_bytes": io_counters.read_bytes if io_counters else 0,
-                "write_bytes": io_counters.write_bytes if io_counters else 0
-            }
-        except:
-            try:
-                disk = psutil.disk_usage('C:\\')
-                total_gb = disk.total / (1024**3)
-                used_gb = disk.used / (1024**3)
-                
-                if total_gb > 1000:
-                    total_display = f"{total_gb / 1024:.2f} TB"
-                    used_display = f"{used_gb:.2f} GB"
-                else:
-                    total_display = f"{total_gb:.2f} GB"
-                    used_display = f"{used_gb:.2f} GB"
-                
-                return {
-                    "total": total_gb,
-                    "used": used_gb,
-                    "free": disk.free / (1024**3),
-                    "percentage": (disk.used / disk.total) * 100,
-                    "total_display": total_display,
-                    "used_display": used_display,
-                    "read_bytes": 0,
-                    "write_bytes": 0
-                }
-            except Exception as e:
-                print(f"Error getting disk info: {e}")
-                return {
-                    "total": 0,
-                    "used": 0,
-                    "free": 0,
-                    "percentage": 0,
-                    "total_display": "0 GB",
-                    "used_display": "0 GB",
-                    "read_bytes": 0,
-                    "write_bytes": 0
-                }
+        """Mendapatkan informasi Disk (cache dari collector)"""
+        return self.collectors.get('disk')
     
     def get_network_info(self) -> dict:
         """Mendapatkan informasi Network"""
-        try:
-            net_io = psutil.net_io_counters()
-            connections = len(psutil.net_connections())
-            
-            self.network_monitor.update_rates(net_io.bytes_sent, net_io.bytes_recv)
-            
-            total_sent = self.format_bytes_network(net_io.bytes_sent)
-            total_recv = self.format_bytes_network(net_io.bytes_recv)
-            
-            return {
-                "bytes_sent": net_io.bytes_sent,
-                "bytes_recv": net_io.bytes_recv,
-                "current_sent": f"{self.network_monitor.current_sent_rate:.2f} KB/s",
-                "current_recv": f"{self.network_monitor.current_recv_rate:.2f} KB/s",
-                "peak_sent": f"{self.network_monitor.peak_sent_rate:.2f} KB/s",
-                "peak_recv": f"{self.network_monitor.peak_recv_rate:.2f} KB/s",
-                "total_sent": total_sent,
-                "total_recv": total_recv,
-                "connections": connections
-            }
-        except Exception as e:
-            print(f"Error getting network info: {e}")
-            return {
-                "bytes_sent": 0,
-                "bytes_recv": 0,
-                "current_sent": "0.00 KB/s",
-                "current_recv": "0.00 KB/s",
-                "peak_sent": "0.00 KB/s",
-                "peak_recv": "0.00 KB/s",
-                "total_sent": "0 B",
-                "total_recv": "0 B",
-                "connections": 0
-            }
+        net_io = self.collectors.get('network')
+        
+        # Rate dihitung oleh sampler jika sedang berjalan
+        if not self.sampler.running and net_io["bytes_sent"]:
+            self.network_monitor.update_rates(net_io["bytes_sent"], net_io["bytes_recv"])
+        
+        return {
+            "bytes_sent": net_io["bytes_sent"],
+            "bytes_recv": net_io["bytes_recv"],
+            "current_sent": f"{self.network_monitor.current_sent_rate:.2f} KB/s",
+            "current_recv": f"{self.network_monitor.current_recv_rate:.2f} KB/s",
+            "peak_sent": f"{self.network_monitor.peak_sent_rate:.2f} KB/s",
+            "peak_recv": f"{self.network_monitor.peak_recv_rate:.2f} KB/s",
+            "total_sent": self.format_bytes_network(net_io["bytes_sent"]),
+            "total_recv": self.format_bytes_network(net_io["bytes_recv"]),
+            "connections": net_io["connections"]
+        }
     
     def format_bytes_network(self, bytes_value: int) -> str:
         """Format bytes untuk network stats"""
@@ -566,15 +4623,42 @@ class ServerMonitor:
         else:
             return 0x00ff00  # Green
     
-    async def create_stats_embed(self) -> discord.Embed:
+    async def collect_snapshot(self) -> dict:
+        """Kumpulkan semua data untuk satu render dashboard"""
+        return {
+            "cpu": self.get_cpu_info(),
+            "memory": self.get_memory_info(),
+            "disk": self.get_disk_info(),
+            "network": self.get_network_info(),
+            "uptime": self.get_uptime(),
+            "ping": await self.get_discord_ping(),
+            "processes": self.get_top_processes(3),
+            "processes_paused": self.paused_note('processes'),
+            "peaks": self.get_window_peaks(CONFIG["update_interval"]),
+            "pressure": self.collectors.get('pressure'),
+            "proc_events": self.collectors.get('proc_events') if CONFIG["proc_events"] else None,
+            "cgroups": self.collectors.get('cgroups'),
+            "probes": self.collectors.get('probes'),
+            "logs": self.collectors.get('logs'),
+            "containers": self.get_docker_stats(),
+            "services": self.collectors.get('services', {}),
+            "failing": self.collectors.failing(),
+            "time": datetime.datetime.now()
+        }
+    
+    async def create_stats_embed(self, view_mode: str = None) -> discord.Embed:
         """Membuat embed dengan statistik server yang lebih lengkap"""
-        cpu_info = self.get_cpu_info()
-        memory_info = self.get_memory_info()
-        disk_info = self.get_disk_info()
-        network_info = self.get_network_info()
-        uptime = self.get_uptime()
-        discord_ping = await self.get_discord_ping()
-        top_processes = self.get_top_processes(3)
+        snapshot = await self.collect_snapshot()
+        return self.render_stats_embed(snapshot, view_mode or CONFIG["view_mode"])
+    
+    def render_stats_embed(self, snapshot: dict, view_mode: str) -> discord.Embed:
+        """Render embed dari snapshot (tanpa collect ulang)"""
+        cpu_info = snapshot["cpu"]
+        memory_info = snapshot["memory"]
+        disk_info = snapshot["disk"]
+        network_info = snapshot["network"]
+        uptime = snapshot["uptime"]
+        cgroups = snapshot["cgroups"]
         
         # Dynamic color
         color = self.get_dynamic_color(
@@ -589,104 +4673,340 @@ class ServerMonitor:
         )
         
         # View mode
-        if CONFIG["view_mode"] == "compact":
+        if view_mode == "compact":
             description = self._create_compact_view(
                 cpu_info, memory_info, disk_info, network_info, uptime
             )
         else:
             description = self._create_detailed_view(
-                cpu_info, memory_info, disk_info, network_info, uptime, top_processes
+                cpu_info, memory_info, disk_info, network_info, uptime,
+                snapshot["processes"], snapshot["peaks"], snapshot["pressure"],
+                snapshot["proc_events"], snapshot["processes_paused"]
             )
         
         embed.description = description
         
         # Additional fields
+        # Yang bermasalah selalu masuk 5 teratas, sisanya lewat !containers / !services
         if CONFIG["monitor_docker"]:
-            containers = self.get_docker_stats()
+            containers = self.list_resources(snapshot, "containers")
             if containers:
-                container_text = "\n".join([
-                    f"• {c['name']}: {c['status']}" for c in containers[:5]
-                ])
+                container_text = "\n".join(self._format_resource(c) for c in containers[:5])
+                if len(containers) > 5:
+                    container_text += f"\n…and {len(containers) - 5} more (`!containers`)"
                 embed.add_field(
-                    name="🐳 Docker Containers",
+                    name=f"🐳 Docker Containers ({len(containers)})",
                     value=container_text,
                     inline=False
                 )
         
         if CONFIG["monitor_services"]:
-            services_text = ""
-            for service in CONFIG["monitor_services"][:5]:
-                status = self.get_service_status(service)
-                emoji = "✅" if status["active"] else "❌"
-                services_text += f"{emoji} {service}: {status['status']}\n"
+            services = self.list_resources(snapshot, "services")
+            services_text = "\n".join(self._format_resource(s) for s in services[:5])
+            if len(services) > 5:
+                services_text += f"\n…and {len(services) - 5} more (`!services`)"
             if services_text:
                 embed.add_field(
-                    name="⚙️ Services",
+                    name=f"⚙️ Services ({len(services)})",
                     value=services_text,
                     inline=False
                 )
         
+        probes = snapshot["probes"]
+        if CONFIG["probes"] and probes["total"]:
+            # Target yang gagal dulu, lalu yang paling lambat
+            ranked = sorted(
+                probes["targets"].items(),
+                key=lambda item: (item[1]["ok"], -(item[1]["latency"] or 0))
+            )
+            probes_text = ""
+            for name, result in ranked[:5]:
+                if result["ok"]:
+                    probes_text += f"✅ {name}: {result['latency']:.0f} ms ({result['success_rate']:.0f}% ok)\n"
+                else:
+                    probes_text += f"❌ {name}: {result['error'][:40]}\n"
+            embed.add_field(
+                name=f"🛰️ Endpoint Probes ({probes['up']}/{probes['total']} up)",
+                value=probes_text,
+                inline=False
+            )
+        
+        logs = snapshot["logs"]
+        active = {key: rate for key, rate in logs["rates"].items() if rate or logs["current"].get(key)}
+        if active:
+            logs_text = "\n".join(
+                f"• {key}: {rate}/min (now {logs['current'].get(key, 0)})"
+                for key, rate in sorted(active.items(), key=lambda item: -item[1])[:5]
+            )
+            embed.add_field(
+                name="📜 Log Events",
+                value=logs_text,
+                inline=False
+            )
+        
+        # Collector yang gagal tetap pakai nilai terakhir, tandai di sini
+        failing = snapshot["failing"]
+        if failing:
+            now_ts = snapshot["time"].timestamp()
+            issues_text = ""
+            for shown, (name, result) in enumerate(failing.items()):
+                age = f"{now_ts - result['updated']:.0f}s ago" if result["updated"] else "never"
+                line = f"• {name}: {result['error'][:60]} (last ok: {age})\n"
+                # Value field embed maksimal 1024 karakter
+                if len(issues_text) + len(line) > 1000:
+                    issues_text += f"… and {len(failing) - shown} more"
+                    break
+                issues_text += line
+            embed.add_field(
+                name="⚠️ Collector Issues",
+                value=issues_text,
+                inline=False
+            )
+        
         # Discord ping
         embed.add_field(
             name="🌐 Discord API Ping",
-            value=f"{discord_ping} ms",
+            value=f"{snapshot['ping']} ms",
             inline=False
         )
         
         # Footer
-        now = datetime.datetime.now()
         embed.set_footer(
-            text=f"🔄 Auto-updates every {CONFIG['update_interval']}s | Last: {now.strftime('%H:%M:%S')}"
+            text=f"🔄 Auto-updates every {CONFIG['update_interval']}s | Last: {snapshot['time'].strftime('%H:%M:%S')}"
         )
         
         return embed
     
-    def _create_detailed_view(self, cpu, mem, disk, net, uptime, processes) -> str:
+    def get_window_peaks(self, seconds: float) -> dict:
+        """Peak tiap metric dari sampler selama X detik terakhir"""
+        peaks = {}
+        for metric in self.sampler.buffers:
+            value = self.sampler.peak(metric, seconds)
+            if value is not None:
+                peaks[metric] = value
+        return peaks
+    
+    RESOURCE_PAGE_SIZE = 15
+    
+    @staticmethod
+    def _container_severity(status: str) -> int:
+        """0 = bermasalah (restarting/unhealthy/exited), 1 = transisi, 2 = sehat"""
+        status = status.lower()
+        if "restarting" in status or "unhealthy" in status or status.startswith(("exited", "dead")):
+            return 0
+        if "starting" in status or "paused" in status or status.startswith(("created", "removing")):
+            return 1
+        return 2
+    
+    def list_resources(self, snapshot: dict, kind: str, sort: str = "status") -> List[dict]:
+        """Container/service dari snapshot + usage cgroup, yang bermasalah selalu di atas"""
+        usage_map = snapshot["cgroups"][kind]
+        entries = []
+        if kind == "containers":
+            for container in snapshot["containers"]:
+                entries.append({
+                    "name": container["name"],
+                    "status": container["status"],
+                    "severity": self._container_severity(container["status"]),
+                    "emoji": None,
+                    "usage": usage_map.get(container["name"]),
+                })
+        else:
+            statuses = snapshot["services"]
+            for service in CONFIG["monitor_services"]:
+                status = statuses.get(service, {"status": "unknown", "active": False})
+                entries.append({
+                    "name": service,
+                    "status": status["status"],
+                    "severity": 2 if status["active"] else 0,
+                    "emoji": "✅" if status["active"] else "❌",
+                    "usage": usage_map.get(service),
+                })
+        
+        if sort == "status":
+            entries.sort(key=lambda e: (e["severity"], e["name"]))
+        else:
+            field = "cpu" if sort == "cpu" else "memory"
+            entries.sort(key=lambda e: (
+                e["severity"] > 0, -(e["usage"][field] if e["usage"] else 0), e["name"]
+            ))
+        return entries
+    
+    def _format_resource(self, entry: dict) -> str:
+        """Satu baris container/service untuk embed"""
+        emoji = entry["emoji"] or ("🔴", "🟡", "🟢")[entry["severity"]]
+        return f"{emoji} {entry['name']}: {entry['status']}{self._format_cgroup_usage(entry['usage'])}"
+    
+    def build_resource_page(self, kind: str, sort: str, page: int) -> tuple:
+        """Embed satu halaman daftar container/service -> (embed, page, pages)"""
+        snapshot = self.last_snapshot
+        entries = self.list_resources(snapshot, kind, sort) if snapshot else []
+        size = self.RESOURCE_PAGE_SIZE
+        pages = max(1, math.ceil(len(entries) / size))
+        page = min(max(page, 0), pages - 1)
+        
+        unhealthy = sum(1 for e in entries if e["severity"] == 0)
+        title = "🐳 Docker Containers" if kind == "containers" else "⚙️ Services"
+        embed = discord.Embed(
+            title=f"{title} ({len(entries)})",
+            description="\n".join(self._format_resource(e) for e in entries[page * size:(page + 1) * size])
+                        or "Nothing to show yet.",
+            color=0xff0000 if unhealthy else 0x00ff00
+        )
+        footer = f"Page {page + 1}/{pages} | Sorted by {sort} | {unhealthy} unhealthy"
+        if snapshot:
+            footer += f" | Snapshot {snapshot['time'].strftime('%H:%M:%S')}"
+        embed.set_footer(text=footer)
+        return embed, page, pages
+    
+    async def send_resource_list(self, ctx, kind: str, sort: str = "status"):
+        """Kirim daftar container/service yang bisa dipaging dan di-sort"""
+        if self.last_snapshot is None:
+            # Belum ada publish; collect_snapshot hanya baca cache collector
+            self.last_snapshot = await self.collect_snapshot()
+        view = ResourceListView(self, kind, sort)
+        embed = view.render()
+        if isinstance(ctx, discord.Interaction):
+            await self.outbound.followup(ctx, embed=embed, view=view, ephemeral=True)
+        else:
+            await self.outbound.send(ctx.channel, embed=embed, view=view)
+    
+    def _format_cgroup_usage(self, usage: Optional[dict]) -> str:
+        """Ringkasan CPU/memory dari cgroup, kosong jika tidak ada"""
+        if not usage:
+            return ""
+        text = f" — {usage['cpu']:.1f}% CPU, {self.format_bytes_network(usage['memory'])}"
+        if usage['memory_pressure'] >= 1:
+            text += f", mem PSI {usage['memory_pressure']:.0f}%"
+        return text
+    
+    CORES_PER_ROW = 64
+    
+    def _format_core_heatmap(self, peaks: List[float]) -> str:
+        """Satu karakter per core (peak selama interval update), 64 core per baris"""
+        if len(peaks) < 2:
+            return ""
+        sparks = ChartRenderer.SPARKS
+        levels = len(sparks) - 1
+        cells = "".join(sparks[int(min(max(value, 0), 100) / 100 * levels + 0.5)] for value in peaks)
+        lines = [
+            f"`{cells[start:start + self.CORES_PER_ROW]}`"
+            for start in range(0, len(cells), self.CORES_PER_ROW)
+        ]
+        hottest = max(range(len(peaks)), key=peaks.__getitem__)
+        lines[-1] += f" max: core {hottest} {peaks[hottest]:.0f}%"
+        return "\n".join(lines) + "\n"
+    
+    def _format_psi(self, pressure: dict, resource: str) -> str:
+        """Baris PSI some/full avg10 untuk satu resource"""
+        psi = pressure.get('psi', {}).get(resource)
+        if not psi:
+            return ""
+        text = f"Pressure: some {psi.get('some', {}).get('avg10', 0):.1f}%"
+        if 'full' in psi:
+            text += f" / full {psi['full'].get('avg10', 0):.1f}%"
+        return text + " (10s)\n"
+    
+    def _create_detailed_view(self, cpu, mem, disk, net, uptime, processes, peaks=None, pressure=None,
+                              proc_events=None, processes_paused=None) -> str:
         """Create detailed view"""
+        peaks = peaks or {}
+        pressure = pressure or {}
         view = "**💻 System Information**\n\n"
         
         # CPU
         view += f"**CPU:** {cpu['model'][:50]}\n"
         view += f"{self.get_progress_bar(cpu['usage'])}\n"
+        if 'cpu' in peaks:
+            view += f"Peak ({CONFIG['update_interval']}s): {peaks['cpu']:.1f}%\n"
+        view += self._format_psi(pressure, 'cpu')
+        if pressure.get('load_per_core'):
+            load = pressure['load']
+            view += f"Load: {load[0]:.2f} / {load[1]:.2f} / {load[2]:.2f} ({pressure['load_per_core']:.2f}/core)\n"
         if cpu['temperature'] > 0:
-            view += f"🌡️ Temp: {cpu['temperature']:.1f}°C\n"
+            view += f"🌡️ Temp: {cpu['temperature']:.1f}°C max"
+            temp_detail = cpu.get('temperature_detail') or {}
+            if temp_detail.get('hottest'):
+                view += f" ({temp_detail['hottest']})"
+            view += "\n"
+            view += self._format_temperature_detail(temp_detail)
         view += f"Cores: {cpu['cores_physical']}P/{cpu['cores_logical']}L"
         if cpu['frequency'] != "N/A":
             view += f" @ {cpu['frequency']:.0f} MHz"
-        view += "\n\n"
+        view += "\n"
+        view += self._format_core_heatmap(cpu.get('core_peaks') or [])
+        view += "\n"
         
         # Memory
         view += f"**💾 Memory**\n"
         view += f"{self.get_progress_bar(mem['percentage'])}\n"
+        if 'memory' in peaks:
+            view += f"Peak ({CONFIG['update_interval']}s): {peaks['memory']:.1f}%\n"
         view += f"Used: {mem['used']:.2f} GB / {mem['total']:.2f} GB\n"
         if mem['swap_total'] > 0:
             view += f"Swap: {mem['swap_used']:.2f} GB / {mem['swap_total']:.2f} GB\n"
+        view += self._format_psi(pressure, 'memory')
         view += "\n"
         
         # Disk
         view += f"**💿 Disk**\n"
         view += f"{self.get_progress_bar(disk['percentage'])}\n"
-        view += f"Used: {disk['used_display']} / {disk['total_display']}\n\n"
+        view += f"Used: {disk['used_display']} / {disk['total_display']}\n"
+        view += self._format_psi(pressure, 'io')
+        if pressure.get('fd_max'):
+            view += f"FDs: {pressure['fd_allocated']:,} / {pressure['fd_max']:,} ({pressure['fd_percent']:.1f}%)\n"
+        view += "\n"
         
         # Network
         view += f"**🌐 Network**\n"
         view += f"↑ {net['current_sent']} (Peak: {net['peak_sent']})\n"
         view += f"↓ {net['current_recv']} (Peak: {net['peak_recv']})\n"
         view += f"Total: ↑{net['total_sent']} ↓{net['total_recv']}\n"
-        view += f"Active Connections: {net['connections']}\n\n"
+        if net['connections'] is not None:
+            view += f"Active Connections: {net['connections']}\n"
+        if pressure.get('conntrack_max'):
+            view += f"Conntrack: {pressure['conntrack_count']:,} / {pressure['conntrack_max']:,} ({pressure['conntrack_percent']:.1f}%)\n"
+        view += "\n"
         
         # Top Processes
         if processes:
-            view += f"**⚡ Top Processes**\n"
+            # Level 2 budget: daftar terakhir sebelum collector ditangguhkan
+            paused = f" (⏸️ {processes_paused}, last known)" if processes_paused else ""
+            view += f"**⚡ Top Processes**{paused}\n"
             for proc in processes:
                 view += f"• {proc['name'][:20]}: {proc['cpu']:.1f}% CPU\n"
             view += "\n"
         
+        # Process churn (short-lived process)
+        if proc_events and proc_events["mode"]:
+            view += f"**🧬 Process Churn** ({proc_events['mode']})\n"
+            view += f"Exec: {proc_events['exec_rate']:.0f}/min | Short-lived (5m): {proc_events['short_lived']}"
+            if proc_events['short_cpu'] > 0:
+                view += f" ({proc_events['short_cpu']:.1f} CPU-s)"
+            view += "\n"
+            for parent, command, rate in proc_events['top'][:3]:
+                view += f"• {parent[:15]} → {command[:15]}: {rate:.0f}/min\n"
+            view += "\n"
+        
         # Uptime
         view += f"**⏰ Uptime:** {uptime}"
         
         return view
     
+    def _format_temperature_detail(self, temp: dict) -> str:
+        """Suhu per-package dan per-core (diringkas jika core banyak)"""
+        text = ""
+        packages = temp.get('packages') or []
+        if packages:
+            text += "Pkg: " + " | ".join(f"{value:.0f}°C" for _, value in packages) + "\n"
+        cores = temp.get('cores') or []
+        if len(cores) > 8:
+            values = [value for _, value in cores]
+            text += f"Cores: min {min(values):.0f}°C / avg {sum(values) / len(values):.0f}°C / max {max(values):.0f}°C\n"
+        elif cores:
+            text += "Cores: " + " ".join(f"{value:.0f}" for _, value in cores) + " °C\n"
+        return text
+    
     def _create_compact_view(self, cpu, mem, disk, net, uptime) -> str:
         """Create compact view"""
         view = f"**CPU:** {cpu['usage']:.1f}% | "
@@ -701,91 +5021,278 @@ class ServerMonitor:
         if not CONFIG["enable_alerts"]:
             return
         
-        cpu_info = self.get_cpu_info()
-        memory_info = self.get_memory_info()
-        disk_info = self.get_disk_info()
+        # Pakai peak dari sampler supaya spike di antara tick tetap tertangkap
+        peaks = self.get_window_peaks(60)
+        if peaks:
+            cpu_usage = peaks.get('cpu', 0)
+            memory_usage = peaks.get('memory', 0)
+            disk_usage = peaks.get('disk', 0)
+            temperature = peaks.get('temperature', 0)
+        else:
+            cpu_info = self.get_cpu_info()
+            cpu_usage = cpu_info['usage']
+            memory_usage = self.get_memory_info()['percentage']
+            disk_usage = self.get_disk_info()['percentage']
+            temperature = cpu_info['temperature']
         
         alerts = []
         
         # Check CPU
-        if cpu_info['usage'] > CONFIG['thresholds']['cpu']:
-            if self._can_send_alert('cpu'):
-                alerts.append(('cpu', f"CPU usage is high: {cpu_info['usage']:.1f}%", cpu_info['usage']))
+        if cpu_usage > CONFIG['thresholds']['cpu']:
+            alerts.append(('cpu', f"CPU usage is high: {cpu_usage:.1f}%", cpu_usage))
         
         # Check Memory
-        if memory_info['percentage'] > CONFIG['thresholds']['memory']:
-            if self._can_send_alert('memory'):
-                alerts.append(('memory', f"Memory usage is high: {memory_info['percentage']:.1f}%", memory_info['percentage']))
+        if memory_usage > CONFIG['thresholds']['memory']:
+            alerts.append(('memory', f"Memory usage is high: {memory_usage:.1f}%", memory_usage))
         
         # Check Disk
-        if disk_info['percentage'] > CONFIG['thresholds']['disk']:
-            if self._can_send_alert('disk'):
-                alerts.append(('disk', f"Disk usage is high: {disk_info['percentage']:.1f}%", disk_info['percentage']))
+        if disk_usage > CONFIG['thresholds']['disk']:
+            alerts.append(('disk', f"Disk usage is high: {disk_usage:.1f}%", disk_usage))
+        
+        # Check Temperature
+        if temperature > CONFIG['thresholds']['temperature']:
+            # Sensor terpanas bisa NVMe/GPU, bukan CPU: sebutkan chip dan sensornya
+            detail = self.get_temperature()
+            chip, hottest = detail.get('hottest_chip'), detail.get('hottest')
+            sensor = hottest or chip
+            if chip and hottest and not hottest.startswith(chip):
+                sensor = f"{chip} {hottest}"
+            sensor_text = f" ({sensor})" if sensor else ""
+            alerts.append(('temperature', f"Temperature is high: {temperature:.1f}°C{sensor_text}", temperature))
+        
+        # Check core imbalance: core pinned lama sementara rata-rata CPU tidak tinggi
+        core_history = self.sampler.core_history
+        pinned = core_history.pinned(CONFIG["core_hot_minutes"] * 60)
+        if pinned and cpu_usage <= CONFIG['thresholds']['cpu']:
+            minutes = (time.time() - min(since for _, since in pinned)) / 60
+            cores_text = ", ".join(f"core {core}" for core, _ in pinned[:8])
+            if len(pinned) > 8:
+                cores_text += f" +{len(pinned) - 8} more"
+            average = self.sampler.average('cpu', minutes * 60, cpu_usage)
+            hottest = max(core_history.latest(core) for core, _ in pinned)
+            alerts.append((
+                'core_imbalance',
+                f"CPU core imbalance: {cores_text} above {CONFIG['thresholds'].get('core_hot', 95)}% "
+                f"for {minutes:.0f} min while average is {average:.1f}%",
+                hottest
+            ))
+        
+        # Check saturasi (PSI, load, fd, conntrack)
+        for alert_type, message, value in self.get_pressure_readings():
+            threshold = CONFIG['thresholds'].get(alert_type)
+            if threshold is not None and value > threshold:
+                alerts.append((alert_type, message, value))
+        
+        # Check endpoint probe
+        if CONFIG["probes"]:
+            limit = CONFIG['thresholds'].get('probe_failures', 3)
+            for name, result in self.collectors.get('probes')["targets"].items():
+                failures = result["consecutive_failures"]
+                if failures >= limit:
+                    alerts.append((
+                        f"probe:{name}",
+                        f"Probe {name} ({result['target']}) failed {failures}x: {result['error']}",
+                        failures
+                    ))
+        
+        # Check event rate log file
+        for key, rate in self.collectors.get('logs')["rates"].items():
+            threshold = self.get_log_threshold(key)
+            if rate > threshold:
+                alerts.append((f"log:{key}", f"Log events are high: {key} {rate}/min", rate))
+        
+        # Kelompokkan ke incident; cooldown dan resolve diurus IncidentManager
+        await self.process_alerts(alerts)
+    
+    def get_log_threshold(self, key: str) -> float:
+        """Threshold event per menit untuk key "label:pattern" """
+        label = key.rsplit(':', 1)[0]
+        for entry in CONFIG["log_files"]:
+            if (entry.get("name") or os.path.basename(entry["path"])) == label and "threshold" in entry:
+                return entry["threshold"]
+        return CONFIG['thresholds'].get('log_rate', 60)
+    
+    def get_pressure_readings(self) -> list:
+        """(threshold key, pesan, nilai) untuk metric saturasi yang tersedia"""
+        pressure = self.collectors.get('pressure')
+        readings = []
+        for resource in PressureCollector.PSI_RESOURCES:
+            psi = pressure['psi'].get(resource)
+            if psi and 'some' in psi:
+                value = psi['some'].get('avg10', 0)
+                readings.append((f'psi_{resource}', f"{resource.upper()} pressure is high: some avg10 {value:.1f}%", value))
+        if pressure['load_per_core']:
+            value = pressure['load_per_core']
+            readings.append(('load_per_core', f"Load average is high: {value:.2f} per core", value))
+        if pressure['fd_max']:
+            value = pressure['fd_percent']
+            readings.append(('fd_usage', f"File descriptor usage is high: {value:.1f}%", value))
+        if pressure['conntrack_max']:
+            value = pressure['conntrack_percent']
+            readings.append(('conntrack', f"Conntrack table usage is high: {value:.1f}%", value))
+        
+        proc_events = self.collectors.get('proc_events')
+        if CONFIG["proc_events"] and proc_events["mode"]:
+            value = proc_events["exec_rate"]
+            culprit = ""
+            if proc_events["top"]:
+                parent, command, _ = proc_events["top"][0]
+                culprit = f" (top: {parent} → {command})"
+            readings.append(('exec_rate', f"Process exec rate is high: {value:.0f}/min{culprit}", value))
+        return readings
+    
+    async def process_alerts(self, firing: List[tuple]):
+        """Catat alert baru dan update pesan incident yang berubah"""
+        new_alerts, changed = self.incidents.process(firing)
+        for alert_type, message, value in new_alerts:
+            self.data_store.add_alert(alert_type, message, value)
+            self.reports.record_alert(alert_type)
+        
+        if CONFIG["alert_channel_id"] == 0:
+            return
+        for incident in changed:
+            try:
+                await self.publish_incident(incident)
+            except Exception as e:
+                print(f"Error sending incident #{incident['id']}: {e}")
+    
+    def build_incident_embed(self, incident: dict) -> discord.Embed:
+        """Embed satu incident beserta semua alert anggotanya"""
+        opened = datetime.datetime.fromtimestamp(incident["opened"])
+        members = incident["alerts"]
+        active = [alert_type for alert_type, member in members.items() if member["active"]]
+        
+        if incident["resolved"]:
+            embed = discord.Embed(
+                title=f"✅ Incident #{incident['id']} resolved",
+                description=f"Lasted {self._format_elapsed(incident['duration'])} "
+                            f"({opened.strftime('%H:%M')} → {datetime.datetime.fromtimestamp(incident['resolved']).strftime('%H:%M')})",
+                color=0x00ff00,
+                timestamp=datetime.datetime.fromtimestamp(incident["resolved"])
+            )
+        else:
+            embed = discord.Embed(
+                title=(
+                    f"🚨 Incident #{incident['id']}: {len(active)} active alert{'s' if len(active) != 1 else ''}"
+                    if active else f"🟠 Incident #{incident['id']}: all alerts cleared, resolving"
+                ),
+                description=f"Open since {opened.strftime('%H:%M')} ({self._format_elapsed(time.time() - incident['opened'])})",
+                color=0xff0000 if active else 0xff6600,
+                timestamp=datetime.datetime.fromtimestamp(incident["updated"])
+            )
         
-        # Check Temperature
-        if cpu_info['temperature'] > CONFIG['thresholds']['temperature']:
-            if self._can_send_alert('temperature'):
-                alerts.append(('temperature', f"CPU temperature is high: {cpu_info['temperature']:.1f}°C", cpu_info['temperature']))
+        for alert_type, member in list(members.items())[:20]:
+            first = datetime.datetime.fromtimestamp(member["first"]).strftime('%H:%M')
+            if member["active"]:
+                state = f"🔴 since {first}"
+            else:
+                state = f"🟢 cleared {datetime.datetime.fromtimestamp(member['cleared']).strftime('%H:%M')}"
+            repeat = f", fired {member['count']}x" if member["count"] > 1 else ""
+            embed.add_field(
+                name=alert_type.upper(),
+                value=f"{member['message'][:200]}\n{state} | peak {member['peak']:.2f}{repeat}",
+                inline=False
+            )
+        if len(members) > 20:
+            embed.add_field(name="…", value=f"{len(members) - 20} more alerts", inline=False)
         
-        # Send alerts
-        for alert_type, message, value in alerts:
-            await self.send_alert(alert_type, message, value)
+        if "disk" in active:
+            # Langsung tunjukkan apa yang memenuhi disk
+            self.add_disk_scan_fields(embed)
+        return embed
     
-    def _can_send_alert(self, alert_type: str) -> bool:
-        """Check if we can send alert (cooldown)"""
-        now = time.time()
-        if alert_type in self.last_alert_time:
-            if now - self.last_alert_time[alert_type] < self.alert_cooldown:
-                return False
-        self.last_alert_time[alert_type] = now
-        return True
+    @staticmethod
+    def _format_elapsed(seconds: float) -> str:
+        minutes = int(seconds // 60)
+        if minutes < 60:
+            return f"{minutes}m"
+        return f"{minutes // 60}h {minutes % 60}m"
     
-    async def send_alert(self, alert_type: str, message: str, value: float):
-        """Send alert to alert channel"""
-        self.data_store.add_alert(alert_type, message, value)
-        
-        if CONFIG["alert_channel_id"] == 0:
+    async def publish_incident(self, incident: dict):
+        """Kirim pesan incident baru, atau edit pesan yang sudah ada"""
+        channel = self.client.get_channel(CONFIG["alert_channel_id"])
+        if not channel:
             return
+        embed = self.build_incident_embed(incident)
         
-        try:
-            channel = self.client.get_channel(CONFIG["alert_channel_id"])
-            if channel:
-                embed = discord.Embed(
-                    title="⚠️ Alert Triggered",
-                    description=message,
-                    color=0xff6600,
-                    timestamp=datetime.datetime.now()
+        if incident["message_id"]:
+            message = channel.get_partial_message(incident["message_id"])
+            try:
+                await self.outbound.submit(
+                    OutboundScheduler.ALERT,
+                    f"channel:{channel.id}",
+                    lambda: message.edit(embed=embed),
+                    coalesce=f"incident:{incident['id']}"
                 )
-                embed.add_field(name="Type", value=alert_type.upper())
-                embed.add_field(name="Value", value=f"{value:.2f}")
-                await channel.send(embed=embed)
-        except Exception as e:
-            print(f"Error sending alert: {e}")
+                return
+            except discord.NotFound:
+                pass  # Pesan dihapus, kirim ulang
+        
+        message = await self.outbound.send(channel, embed=embed, priority=OutboundScheduler.ALERT)
+        if message is not None:
+            incident["message_id"] = message.id
+            self.incidents.persist()
+    
+    async def send_incidents(self, message):
+        """Send incident yang masih open dan yang terakhir resolve"""
+        incidents = self.incidents
+        embed = discord.Embed(title="🚨 Incidents", color=0xff0000 if incidents.open else 0x00ff00)
+        
+        open_text = ""
+        for incident in incidents.open:
+            active = [t for t, member in incident["alerts"].items() if member["active"]]
+            open_text += (
+                f"**#{incident['id']}** {self._format_elapsed(time.time() - incident['opened'])} — "
+                f"{', '.join(active) or 'clearing'} ({len(incident['alerts'])} alerts)\n"
+            )
+        embed.add_field(name="Open", value=open_text or "No open incidents", inline=False)
+        
+        closed_text = ""
+        for incident in reversed(incidents.closed[-5:]):
+            resolved = datetime.datetime.fromtimestamp(incident["resolved"]).strftime('%m/%d %H:%M')
+            closed_text += (
+                f"**#{incident['id']}** {', '.join(incident['alerts'])} — "
+                f"{self._format_elapsed(incident['duration'])}, resolved {resolved}\n"
+            )
+        if closed_text:
+            embed.add_field(name="Recently Resolved", value=closed_text[:1024], inline=False)
+        embed.set_footer(
+            text=f"Window {CONFIG['incident_window']}s | resolves after {CONFIG['incident_resolve_after']}s clear"
+        )
+        await self.outbound.send(message.channel, embed=embed)
     
     async def send_history_stats(self, ctx, hours: int = 24):
         """Send historical stats"""
+        await self.data_store.wait_history(hours * 3600)
+        embed = await self.response_cache.get_or_build(
+            ("history", hours, self.data_store.history_seq),
+            lambda: asyncio.to_thread(self.build_history_embed, hours)
+        )
+        
+        if hasattr(ctx, 'channel'):
+            await self.outbound.send(ctx.channel, embed=embed)
+        else:
+            await self.outbound.followup(ctx, embed=embed, ephemeral=True)
+    
+    def build_history_embed(self, hours: int) -> discord.Embed:
+        """Hitung agregat history dan bangun embed-nya"""
         history = self.data_store.get_history(hours)
         
         if not history:
-            embed = discord.Embed(
+            return discord.Embed(
                 title="📊 Historical Stats",
                 description="No historical data available yet.",
                 color=0xff6600
             )
-            if hasattr(ctx, 'channel'):
-                await ctx.channel.send(embed=embed)
-            else:
-                await ctx.followup.send(embed=embed, ephemeral=True)
-            return
         
         # Calculate averages
         cpu_avg = sum(h['stats']['cpu'] for h in history if 'cpu' in h['stats']) / len(history)
         mem_avg = sum(h['stats']['memory'] for h in history if 'memory' in h['stats']) / len(history)
         disk_avg = sum(h['stats']['disk'] for h in history if 'disk' in h['stats']) / len(history)
         
-        # Find peaks
-        cpu_peak = max(h['stats']['cpu'] for h in history if 'cpu' in h['stats'])
-        mem_peak = max(h['stats']['memory'] for h in history if 'memory' in h['stats'])
+        # Find peaks (pakai peak dari sampler jika ada)
+        cpu_peak = max(h['stats'].get('cpu_peak', h['stats']['cpu']) for h in history if 'cpu' in h['stats'])
+        mem_peak = max(h['stats'].get('memory_peak', h['stats']['memory']) for h in history if 'memory' in h['stats'])
         
         embed = discord.Embed(
             title=f"📊 Historical Stats (Last {hours}h)",
@@ -818,13 +5325,266 @@ class ServerMonitor:
         
         embed.set_footer(text=f"Monitoring since {datetime.datetime.fromisoformat(history[0]['timestamp']).strftime('%Y-%m-%d %H:%M')}")
         
-        if hasattr(ctx, 'channel'):
-            await ctx.channel.send(embed=embed)
+        return embed
+    
+    HISTORY_ALIASES = {"mem": "memory", "temp": "temperature", "load": "load_per_core"}
+    HISTORY_AGGREGATES = ("avg", "max", "min", "p95")
+    HISTORY_MAX_BUCKETS = 60
+    HISTORY_MAX_METRICS = 5
+    HISTORY_EMBED_LIMIT = 4096
+    
+    async def send_history_query(self, message, args: List[str]):
+        """!history <metric,...> <window> [by <bucket>] [avg|max|min|p95]"""
+        # Block series terbaru baru lengkap setelah history JSON selesai di-load
+        await self.data_store.wait_history()
+        usage = (
+            "Usage: `!history <metric,...> <window> [by <bucket>] [avg|max|min|p95]`\n"
+            "e.g. `!history cpu,memory,temperature 7d by 6h p95`"
+        )
+        metrics = [self.HISTORY_ALIASES.get(m, m) for m in args[0].split(',') if m]
+        window_text = args[1] if len(args) > 1 else "24h"
+        window = parse_duration(window_text)
+        bucket = None
+        aggregate = "avg"
+        rest = args[2:]
+        while rest:
+            token = rest.pop(0)
+            if token == "by" and rest:
+                bucket = parse_duration(rest.pop(0))
+            elif token in self.HISTORY_AGGREGATES:
+                aggregate = token
+            else:
+                await self.outbound.reply(message, usage)
+                return
+        
+        if not metrics or not window or window <= 0 or (bucket is not None and bucket <= 0):
+            await self.outbound.reply(message, usage)
+            return
+        max_days = CONFIG["history_retention_days"]
+        if window > max_days * 86400:
+            await self.outbound.reply(message, f"❌ Window too large (max {max_days}d, the history retention)")
+            return
+        if len(metrics) > self.HISTORY_MAX_METRICS:
+            await self.outbound.reply(message, f"❌ At most {self.HISTORY_MAX_METRICS} metrics per query")
+            return
+        known = self.data_store.series.metrics()
+        unknown = [m for m in metrics if m not in known]
+        if unknown:
+            await self.outbound.reply(message, f"❌ Unknown metric: {', '.join(unknown)}. Available: {', '.join(known[:25])}")
+            return
+        
+        # Default: sekitar 12 baris; batasi supaya tabel muat di embed
+        bucket = bucket or max(window // 12, 60)
+        # Dihitung setelah penyejajaran ke jam lokal, yang bisa menambah satu baris
+        rows = self._history_span(int(time.time()), window, bucket)[1]
+        if rows > self.HISTORY_MAX_BUCKETS:
+            await self.outbound.reply(message, f"❌ Too many rows ({rows}); use a larger bucket (max {self.HISTORY_MAX_BUCKETS} rows)")
+            return
+        
+        embed = await self.response_cache.get_or_build(
+            ("history_query", tuple(metrics), window, bucket, aggregate, self.data_store.history_seq),
+            lambda: asyncio.to_thread(self.build_history_table, metrics, window_text, window, bucket, aggregate)
+        )
+        await self.outbound.send(message.channel, embed=embed)
+    
+    def bucket_history(self, metric: str, start: int, end: int, bucket: int, aggregate: str) -> List[Optional[float]]:
+        """Agregat per bucket dalam satu pass terurut waktu atas series metric"""
+        rows = math.ceil((end - start) / bucket)
+        counts = [0] * rows
+        results: List[Optional[float]] = [None] * rows
+        values: List[list] = [[] for _ in range(rows)] if aggregate == "p95" else []
+        
+        for timestamp, value in self.data_store.series.query(metric, start, end):
+            index = min(int((timestamp - start) // bucket), rows - 1)
+            counts[index] += 1
+            if aggregate == "p95":
+                values[index].append(value)
+            elif results[index] is None:
+                results[index] = value
+            elif aggregate == "avg":
+                results[index] += value
+            elif aggregate == "max":
+                results[index] = max(results[index], value)
+            else:
+                results[index] = min(results[index], value)
+        
+        for index in range(rows):
+            if aggregate == "avg" and counts[index]:
+                results[index] /= counts[index]
+            elif aggregate == "p95" and values[index]:
+                ordered = sorted(values[index])
+                results[index] = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return results
+    
+    def build_history_table(self, metrics: List[str], window_text: str, window: int, bucket: int,
+                            aggregate: str) -> discord.Embed:
+        """Tabel agregat per bucket untuk beberapa metric"""
+        now = int(time.time())
+        start = self._history_span(now, window, bucket)[0]
+        columns = {metric: self.bucket_history(metric, start, now + 1, bucket, aggregate) for metric in metrics}
+        
+        time_format = '%m/%d %H:%M' if bucket < 86400 else '%Y-%m-%d'
+        width = max(7, *(min(len(m), 12) for m in metrics))
+        lines = [f"{'time':<11} " + " ".join(f"{m[:12]:>{width}}" for m in metrics)]
+        rows = len(next(iter(columns.values())))
+        for index in range(rows):
+            label = datetime.datetime.fromtimestamp(start + index * bucket).strftime(time_format)
+            cells = []
+            for metric in metrics:
+                value = columns[metric][index]
+                cells.append(f"{'-' if value is None else f'{value:.1f}':>{width}}")
+            lines.append(f"{label:<11} " + " ".join(cells))
+        
+        # Description embed maksimal 4096 karakter: buang baris tertua yang tidak muat
+        omitted = 0
+        while len(lines) > 2 and sum(len(line) + 1 for line in lines) + 7 > self.HISTORY_EMBED_LIMIT:
+            del lines[1]
+            omitted += 1
+        
+        bucket_text = self._format_duration(bucket)
+        embed = discord.Embed(
+            title=f"📊 History: {aggregate} per {bucket_text} (Last {window_text})",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=0x00ff00
+        )
+        if all(value is None for column in columns.values() for value in column):
+            embed.description = "No historical data in this window."
+        footer = "Buckets aligned to local time | '-' = no samples"
+        if omitted:
+            footer += f" | {omitted} oldest rows omitted (embed limit)"
+        embed.set_footer(text=footer)
+        return embed
+    
+    @staticmethod
+    def _history_span(now: int, window: int, bucket: int) -> tuple:
+        """(start, jumlah baris); batas bucket disejajarkan ke jam lokal (mis. 00:00/06:00/12:00 untuk 6h)"""
+        offset = int(datetime.datetime.now().astimezone().utcoffset().total_seconds())
+        start = ((now - window + offset) // bucket) * bucket - offset
+        return start, math.ceil((now + 1 - start) / bucket)
+    
+    @staticmethod
+    def _format_duration(seconds: int) -> str:
+        for unit, size in (("w", 604800), ("d", 86400), ("h", 3600), ("m", 60)):
+            if seconds % size == 0:
+                return f"{seconds // size}{unit}"
+        return f"{seconds}s"
+    
+    # Tier rollup (detik per bucket); dipilih yang terkecil dengan <= GRAPH_POINTS bucket
+    GRAPH_TIERS = (60, 300, 900, 3600, 6 * 3600, 86400)
+    GRAPH_POINTS = 320
+    PERCENT_METRICS = ("cpu", "memory", "disk", "swap", "cpu_peak", "memory_peak", "cpu_core_max", "fd_usage", "conntrack")
+    
+    def rollup(self, metric: str, start: int, end: int, bucket: int) -> List[Optional[tuple]]:
+        """(min, avg, max) per bucket dalam satu pass atas series"""
+        rows = math.ceil((end - start) / bucket)
+        acc = [None] * rows
+        for timestamp, value in self.data_store.series.query(metric, start, end):
+            index = min(int((timestamp - start) // bucket), rows - 1)
+            cell = acc[index]
+            if cell is None:
+                acc[index] = [value, value, value, 1]
+            else:
+                cell[0] = min(cell[0], value)
+                cell[1] += value
+                cell[2] = max(cell[2], value)
+                cell[3] += 1
+        return [None if c is None else (c[0], c[1] / c[3], c[2]) for c in acc]
+    
+    def build_graph(self, metric: str, window_text: str, window: int, bucket: int, last_bucket: int) -> tuple:
+        """(png bytes atau None, embed) untuk satu metric, dijalankan di worker thread"""
+        end = (last_bucket + 1) * bucket
+        start = end - math.ceil(window / bucket) * bucket
+        points = self.rollup(metric, start, end, bucket)
+        present = [p for p in points if p is not None]
+        
+        embed = discord.Embed(title=f"📈 {metric} (Last {window_text})", color=0x58b9ff)
+        if not present:
+            embed.description = "No historical data in this window."
+            return None, embed
+        
+        low = min(p[0] for p in present)
+        high = max(p[2] for p in present)
+        if metric in self.PERCENT_METRICS:
+            low, high = 0.0, 100.0
         else:
-            await ctx.followup.send(embed=embed, ephemeral=True)
+            margin = (high - low) * 0.05 or 1
+            low, high = low - margin, high + margin
+        threshold = CONFIG['thresholds'].get(metric)
+        
+        average = sum(p[1] for p in present) / len(present)
+        embed.description = f"`{ChartRenderer.sparkline([p[1] if p else None for p in points], low, high)}`"
+        embed.add_field(name="Min", value=f"{min(p[0] for p in present):.1f}")
+        embed.add_field(name="Avg", value=f"{average:.1f}")
+        embed.add_field(name="Max", value=f"{max(p[2] for p in present):.1f}")
+        embed.set_footer(text=f"{self._format_duration(bucket)} buckets | scale {low:.0f}–{high:.0f}"
+                              + (f" | threshold {threshold}" if threshold is not None else ""))
+        
+        png = None
+        if CONFIG["graph_png"]:
+            png = ChartRenderer().render(points, low, high, threshold)
+            embed.set_image(url="attachment://graph.png")
+        return png, embed
+    
+    async def send_graph(self, ctx, metric: str, window_text: str):
+        """Kirim chart satu metric; render di-cache per (metric, window, bucket terakhir)"""
+        await self.data_store.wait_history()
+        window = parse_duration(window_text)
+        known = self.data_store.series.metrics()
+        # Window dibatasi umur history: jumlah bucket (dan memory rollup) tetap terbatas
+        max_days = CONFIG["history_retention_days"]
+        text = None
+        if not window or window <= 0 or metric not in known:
+            text = f"❌ Unknown metric or window. Available: {', '.join(known[:25])}"
+        elif window > max_days * 86400:
+            text = f"❌ Window too large (max {max_days}d, the history retention)"
+        if text is not None:
+            if hasattr(ctx, 'channel'):
+                await self.outbound.reply(ctx, text)
+            else:
+                await self.outbound.followup(ctx, text, ephemeral=True)
+            return
+        
+        bucket = next((tier for tier in self.GRAPH_TIERS if window / tier <= self.GRAPH_POINTS), self.GRAPH_TIERS[-1])
+        last_bucket = int(time.time()) // bucket
+        png, embed = await self.response_cache.get_or_build(
+            ("graph", metric, window, last_bucket),
+            lambda: asyncio.to_thread(self.build_graph, metric, window_text, window, bucket, last_bucket)
+        )
+        
+        # Embed yang di-cache dipakai bersama, kirim salinan
+        embed = embed.copy()
+        kwargs = {"embed": embed}
+        if png is not None:
+            kwargs["file"] = discord.File(io.BytesIO(png), filename="graph.png")
+        try:
+            if hasattr(ctx, 'channel'):
+                await self.outbound.send(ctx.channel, **kwargs)
+            else:
+                await self.outbound.followup(ctx, ephemeral=True, **kwargs)
+        except discord.Forbidden:
+            if png is None:
+                raise
+            # Tidak boleh attach file: sparkline di embed saja
+            embed.set_image(url=None)
+            if hasattr(ctx, 'channel'):
+                await self.outbound.send(ctx.channel, embed=embed)
+            else:
+                await self.outbound.followup(ctx, embed=embed, ephemeral=True)
     
     async def send_alert_summary(self, ctx):
         """Send alert summary"""
+        embed = await self.response_cache.get_or_build(
+            ("alerts", self.data_store.alert_seq),
+            self.build_alert_summary_embed
+        )
+        
+        if hasattr(ctx, 'channel'):
+            await self.outbound.send(ctx.channel, embed=embed)
+        else:
+            await self.outbound.followup(ctx, embed=embed, ephemeral=True)
+    
+    def build_alert_summary_embed(self) -> discord.Embed:
+        """Bangun embed 10 alert terakhir"""
         alerts = self.data_store.data.get("alerts", [])[-10:]  # Last 10 alerts
         
         if not alerts:
@@ -847,10 +5607,229 @@ class ServerMonitor:
                     inline=False
                 )
         
-        if hasattr(ctx, 'channel'):
-            await ctx.channel.send(embed=embed)
+        return embed
+    
+    async def send_heavy_hitters(self, message):
+        """Send top consumer process dari heavy-hitter tracker"""
+        parts = message.content.lower().split()
+        metric = "cpu"
+        window = "6h"
+        for part in parts[1:]:
+            if part in ("cpu", "rss", "io"):
+                metric = part
+            else:
+                window = part
+        
+        seconds = parse_duration(window)
+        if seconds is None or seconds <= 0:
+            await self.outbound.reply(message, "Usage: `!top [cpu|rss|io] [window]` (e.g. `!top cpu 6h`)")
+            return
+        
+        top = self.heavy_hitters.top(metric, seconds)
+        titles = {"cpu": "CPU-seconds", "rss": "Peak RSS", "io": "IO bytes"}
+        embed = discord.Embed(
+            title=f"🏋️ Top {titles[metric]} (Last {window})",
+            color=0x3498db
+        )
+        
+        if not top:
+            embed.description = "No process data collected yet."
+        else:
+            lines = []
+            for i, ((name, cmdline, cgroup), value) in enumerate(top, 1):
+                if metric == "cpu":
+                    amount = f"{value:.1f} CPU-s"
+                else:
+                    amount = self.format_bytes_network(int(value))
+                group = f" [{cgroup}]" if cgroup else ""
+                lines.append(f"**{i}. {name}**{group} — {amount}\n`{cmdline[:60]}`")
+            embed.description = "\n".join(lines)
+        
+        footer = f"Tracking up to {CONFIG['heavy_hitter_capacity']} keys per hour, approximate counts"
+        paused = self.paused_note('processes')
+        if paused:
+            footer += f" | ⏸️ {paused}: no new samples"
+        embed.set_footer(text=footer)
+        await self.outbound.send(message.channel, embed=embed)
+    
+    async def send_probe_report(self, message):
+        """Send status endpoint probe, atau histogram latency satu target"""
+        parts = message.content.split(maxsplit=1)
+        targets = self.collectors.get('probes')["targets"]
+        
+        if not targets:
+            await self.outbound.reply(message, "No probes configured or no probe results yet.")
+            return
+        
+        if len(parts) > 1:
+            name = parts[1].strip()
+            result = targets.get(name)
+            if result is None:
+                await self.outbound.reply(message, f"Unknown probe `{name}`. Available: {', '.join(list(targets)[:20])}")
+                return
+            
+            hist = result["hist"]
+            peak = max(hist) or 1
+            edges = [f"≤{edge}" for edge in ProbeCollector.LATENCY_BUCKETS] + [f">{ProbeCollector.LATENCY_BUCKETS[-1]}"]
+            rows = [
+                f"{edge:>6} ms {'█' * math.ceil(count / peak * 20):<20} {count}"
+                for edge, count in zip(edges, hist)
+            ]
+            embed = discord.Embed(
+                title=f"🛰️ Probe {name}",
+                description=f"`{result['type']}` {result['target']}\n```\n" + "\n".join(rows) + "\n```",
+                color=0x00ff00 if result["ok"] else 0xff0000
+            )
+            if result["p95"] is not None:
+                embed.add_field(name="p50 / p95", value=f"{result['p50']:.0f} / {result['p95']:.0f} ms")
+            embed.add_field(name="Success", value=f"{result['success_rate']:.0f}%")
+            if not result["ok"]:
+                embed.add_field(name="Last Error", value=result["error"][:200], inline=False)
+            await self.outbound.send(message.channel, embed=embed)
+            return
+        
+        lines = []
+        for name, result in sorted(targets.items(), key=lambda item: (item[1]["ok"], item[0])):
+            if result["ok"]:
+                p95 = f", p95 {result['p95']:.0f} ms" if result["p95"] is not None else ""
+                lines.append(f"✅ **{name}** ({result['type']}) {result['latency']:.0f} ms{p95}, {result['success_rate']:.0f}% ok")
+            else:
+                lines.append(f"❌ **{name}** ({result['type']}) {result['error'][:60]}")
+        
+        text = ""
+        for shown, line in enumerate(lines):
+            if len(text) + len(line) > 3900:
+                text += f"… and {len(lines) - shown} more"
+                break
+            text += line + "\n"
+        
+        up = sum(1 for result in targets.values() if result["ok"])
+        embed = discord.Embed(
+            title=f"🛰️ Endpoint Probes ({up}/{len(targets)} up)",
+            description=text,
+            color=0x3498db
+        )
+        embed.set_footer(text=f"Every {CONFIG['probe_interval']}s, {CONFIG['probe_concurrency']} concurrent | Success rate over last {ProbeCollector.RECENT} runs")
+        await self.outbound.send(message.channel, embed=embed)
+    
+    def add_disk_scan_fields(self, embed: discord.Embed, limit: int = 5) -> bool:
+        """Tambah field direktori terbesar & paling cepat tumbuh dari scan terakhir"""
+        scan = self.collectors.get('dirsize')
+        if not CONFIG["disk_scan_roots"] or not scan["scanned"]:
+            return False
+        
+        fmt = self.format_bytes_network
+        top_text = "\n".join(f"`{fmt(size):>10}` {path}" for path, size in scan["top"][:limit])
+        embed.add_field(name="📂 Largest Directories", value=top_text or "No data", inline=False)
+        if scan["growth"]:
+            growth_text = "\n".join(
+                f"`+{fmt(delta):>9}` {path} ({fmt(rate)}/h)" for path, rate, delta in scan["growth"][:limit]
+            )
+            embed.add_field(name="📈 Fastest Growing (since last scan)", value=growth_text, inline=False)
+        age = time.time() - scan["scanned"]
+        scan_text = f"{age / 60:.0f} min ago, {scan['stats']['dirs']} dirs in {scan['stats']['duration']:.1f}s"
+        paused = self.paused_note('dirsize')
+        if paused:
+            scan_text += f"\n⏸️ {paused}, showing the last scan"
+        embed.add_field(name="Directory Scan", value=scan_text, inline=False)
+        return True
+    
+    async def send_disk_report(self, message):
+        """Send !disk top: direktori terbesar dan paling cepat tumbuh"""
+        if not CONFIG["disk_scan_roots"]:
+            await self.outbound.reply(message, "Directory scan is disabled. Set `disk_scan_roots` in config.json (e.g. `[\"/var\", \"/home\"]`).")
+            return
+        
+        disk_info = self.get_disk_info()
+        embed = discord.Embed(
+            title="💾 Disk Usage by Directory",
+            description=f"`/` {disk_info['used_display']} / {disk_info['total_display']} ({disk_info['percentage']:.1f}%)",
+            color=0x3498db
+        )
+        if not self.add_disk_scan_fields(embed, limit=DirSizeCollector.TOP_N):
+            embed.add_field(name="📂 Largest Directories", value="First scan is still running, try again later.", inline=False)
         else:
-            await ctx.followup.send(embed=embed, ephemeral=True)
+            roots = self.collectors.get('dirsize')["roots"]
+            embed.set_footer(text=" | ".join(f"{root} {self.format_bytes_network(size)}" for root, size in roots))
+        await self.outbound.send(message.channel, embed=embed)
+    
+    REPORT_METRICS = ("cpu", "memory", "disk", "temperature", "load_per_core", "psi_cpu", "psi_memory", "psi_io", "probe_success")
+    
+    def build_report_embed(self, report: dict) -> discord.Embed:
+        """Embed laporan dari ringkasan ReportAggregator"""
+        start = datetime.datetime.fromtimestamp(report["start"])
+        end = datetime.datetime.fromtimestamp(report["end"])
+        embed = discord.Embed(
+            title=f"🗓️ {report['period'].capitalize()} Report",
+            description=f"{start.strftime('%a %d %b %H:%M')} → {end.strftime('%a %d %b %H:%M')} ({time.strftime('%Z')})",
+            color=0xff6600 if report["alerts"] else 0x00ff00
+        )
+        
+        metrics = report["metrics"]
+        rows = [f"{'metric':<14}{'avg':>8}{'p95':>8}{'max':>8}"]
+        for key in self.REPORT_METRICS:
+            if key in metrics:
+                m = metrics[key]
+                rows.append(f"{key:<14}{m['avg']:>8.1f}{m['p95']:>8.1f}{m['max']:>8.1f}")
+        embed.add_field(name="📊 Metrics", value="```\n" + "\n".join(rows) + "\n```", inline=False)
+        
+        alerts = report["alerts"]
+        alerts_text = "\n".join(f"• {alert_type}: {count}" for alert_type, count in list(alerts.items())[:8])
+        embed.add_field(
+            name=f"🔔 Alerts ({sum(alerts.values())})",
+            value=alerts_text or "No alerts 🎉",
+            inline=True
+        )
+        
+        restarts = report["restarts"]
+        restarts_text = "\n".join(f"• {name}: {count}x" for name, count in list(restarts.items())[:8])
+        embed.add_field(name="🔁 Most Restarted", value=restarts_text or "No restarts", inline=True)
+        
+        disk = report["disk"]
+        if disk:
+            embed.add_field(
+                name="💾 Disk Growth",
+                value=f"{disk['start_gb']:.2f} → {disk['end_gb']:.2f} GB ({disk['growth_gb_per_day']:+.2f} GB/day)",
+                inline=False
+            )
+        embed.set_footer(text=f"{report['samples']} samples | !report {report['period']} file for all metrics")
+        return embed
+    
+    def report_file(self, report: dict) -> discord.File:
+        """Laporan lengkap (semua metric) sebagai file JSON"""
+        stamp = datetime.datetime.fromtimestamp(report["start"]).strftime('%Y%m%d-%H%M')
+        content = json.dumps(
+            {key: value for key, value in report.items() if key != "posted"},
+            indent=2
+        ).encode()
+        return discord.File(io.BytesIO(content), filename=f"report-{report['period']}-{stamp}.json")
+    
+    async def post_report(self, report: dict):
+        """Kirim laporan terjadwal ke report channel"""
+        channel_id = CONFIG["report_channel_id"] or CONFIG["alert_channel_id"]
+        channel = self.client.get_channel(channel_id) if channel_id else None
+        if channel is None:
+            print(f"Report channel {channel_id} tidak ditemukan!")
+            report["posted"] = True
+            return
+        await self.outbound.send(channel, embed=self.build_report_embed(report))
+        report["posted"] = True
+        self.data_store.save()
+    
+    async def send_report(self, message):
+        """Handle !report [daily|weekly] [last] [file]"""
+        parts = message.content.lower().split()[1:]
+        period = "weekly" if "weekly" in parts else "daily"
+        report = self.reports.report(period, last="last" in parts)
+        if report is None:
+            await self.outbound.reply(message, f"No {period} report data yet.")
+            return
+        
+        embed = self.build_report_embed(report)
+        if "file" in parts:
+            await self.outbound.send(message.channel, embed=embed, file=self.report_file(report))
+        else:
+            await self.outbound.send(message.channel, embed=embed)
     
     async def send_config_info(self, ctx):
         """Send configuration info"""
@@ -889,11 +5868,26 @@ class ServerMonitor:
             inline=True
         )
         
+        embed.add_field(
+            name="Dashboards",
+            value=f"{len(self.dashboards.targets())} target(s)",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="Sampling",
+            value=f"{CONFIG['sample_interval_min']}-{CONFIG['sample_interval_max']}s (now {self.sampler.interval}s)",
+            inline=True
+        )
+        
         thresholds = "\n".join([
             f"CPU: {CONFIG['thresholds']['cpu']}%",
             f"Memory: {CONFIG['thresholds']['memory']}%",
             f"Disk: {CONFIG['thresholds']['disk']}%",
             f"Temp: {CONFIG['thresholds']['temperature']}°C"
+        ] + [
+            f"{key}: {value}" for key, value in CONFIG['thresholds'].items()
+            if key not in ('cpu', 'memory', 'disk', 'temperature')
         ])
         
         embed.add_field(
@@ -910,9 +5904,102 @@ class ServerMonitor:
             )
         
         if hasattr(ctx, 'channel'):
-            await ctx.channel.send(embed=embed)
+            await self.outbound.send(ctx.channel, embed=embed)
         else:
-            await ctx.followup.send(embed=embed, ephemeral=True)
+            await self.outbound.followup(ctx, embed=embed, ephemeral=True)
+    
+    async def send_internals(self, message):
+        """Send instrumentation internal bot"""
+        embed = discord.Embed(
+            title="🔬 Bot Internals",
+            color=0x3498db
+        )
+        
+        collector_text = ""
+        for name, result in self.collectors.results.items():
+            if not self.collectors.collectors[name].enabled():
+                continue
+            status = "❌" if result["error"] else "✅"
+            collector_text += f"{status} {name}: {result['duration'] * 1000:.1f} ms, {result['failures']}/{result['runs']} failed\n"
+        embed.add_field(
+            name="Collectors",
+            value=collector_text or "None running",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="Sampler",
+            value=f"Interval: {self.sampler.interval}s\nSamples: {self.sampler.sample_count}\n"
+                  f"Fast path: {'on' if self.sampler.fast_path else 'off'}\n"
+                  f"Core history: {self.sampler.core_history.count} × {self.sampler.core_history.cores} "
+                  f"({self.sampler.core_history.nbytes / 1024:.0f} KB)",
+            inline=True
+        )
+        
+        store = self.data_store
+        embed.add_field(
+            name="Persistence",
+            value=f"Mode: {'write-behind' if store.write_behind else 'sync'}\n"
+                  f"Dirty: {'yes' if store.dirty else 'no'} | Flushes: {store.flushes}\n"
+                  f"Last flush: {store.last_flush_duration * 1000:.0f} ms",
+            inline=True
+        )
+        
+        if STARTUP_TIMER.phases:
+            embed.add_field(
+                name="Startup",
+                value="\n".join(f"{phase}: {elapsed / 1000:.2f}s" for phase, elapsed in STARTUP_TIMER.phases),
+                inline=False
+            )
+        
+        series = store.series.summary()
+        embed.add_field(
+            name="Series Store",
+            value=f"{series['metrics']} metrics, {series['blocks']} blocks\n"
+                  f"{series['samples']:,} samples in {self.format_bytes_network(series['bytes'])}\n"
+                  f"{series['bytes_per_sample']:.1f} bytes/sample",
+            inline=True
+        )
+        
+        usage = self.governor.last
+        budget_text = (
+            f"CPU: {usage['cpu']:.1f}% / {CONFIG['budget_cpu'] or '∞'}%\n"
+            f"RSS: {usage['rss'] / 1024 / 1024:.0f} / {CONFIG['budget_rss_mb'] or '∞'} MB\n"
+        )
+        if usage["traced"] is not None:
+            budget_text += f"Python heap: {usage['traced'] / 1024 / 1024:.1f} MB (peak {usage['traced_peak'] / 1024 / 1024:.1f})\n"
+        budget_text += f"Level {self.governor.level}: {ResourceGovernor.LEVELS[self.governor.level]}"
+        embed.add_field(
+            name="Self Budget",
+            value=budget_text,
+            inline=True
+        )
+        
+        cache = self.response_cache
+        embed.add_field(
+            name="Response Cache",
+            value=f"Hit rate: {cache.hit_rate():.1f}%\nHits: {cache.hits} | Coalesced: {cache.coalesced}\n"
+                  f"Misses: {cache.misses} | Entries: {len(cache.entries)}",
+            inline=True
+        )
+        
+        outbound_text = ""
+        for row in self.outbound.summary():
+            outbound_text += (
+                f"**{row['class']}**: {row['queued']} queued, {row['in_flight']} in flight | "
+                f"sent {row['sent']}, errors {row['errors']} | "
+                f"wait p95 {row['p95_wait'] * 1000:.0f} ms, max {row['max_wait'] * 1000:.0f} ms"
+            )
+            if row['coalesced'] or row['rejected']:
+                outbound_text += f" | coalesced {row['coalesced']}, dropped {row['rejected']}"
+            outbound_text += "\n"
+        embed.add_field(
+            name="Outbound Queue",
+            value=outbound_text,
+            inline=False
+        )
+        
+        await self.outbound.send(message.channel, embed=embed)
     
     async def send_audit_logs(self, message):
         """Send audit logs"""
@@ -938,7 +6025,7 @@ class ServerMonitor:
             
             embed.description = log_text
         
-        await message.channel.send(embed=embed)
+        await self.outbound.send(message.channel, embed=embed)
     
     async def send_help(self, message):
         """Send help message"""
@@ -953,7 +6040,15 @@ class ServerMonitor:
             "!stats / !updatestats": "Show current server statistics",
             "!setstats": "Reset and create new stats message",
             "!history [hours]": "Show historical stats (default: 24h)",
+            "!history <metric,...> <window> [by <bucket>] [avg|max|min|p95]": "Bucketed history table (e.g. `!history cpu,memory,temperature 7d by 6h p95`)",
             "!alerts": "Show recent alerts",
+            "!incidents": "Open incidents and recently resolved ones",
+            "!graph <metric> [window]": "Trend chart of a metric (default: 6h)",
+            "!top [cpu|rss|io] [window]": "Top 10 process consumers over time (default: cpu 6h)",
+            "!probes [name]": "Endpoint probe status, or latency histogram of one target",
+            "!report [daily|weekly] [last] [file]": "Report so far this period (or the last finished one), optionally as a JSON file",
+            "!disk top": "Largest and fastest growing directories (needs disk_scan_roots)",
+            "!containers / !services [status|cpu|memory]": "Paged list of all containers or services, unhealthy first",
             "!help": "Show this help message"
         }
         
@@ -969,6 +6064,9 @@ class ServerMonitor:
             "!config threshold <type> <value>": "Set alert threshold",
             "!config alerts <on/off>": "Enable/disable alerts",
             "!audit": "Show audit logs",
+            "!internals": "Show bot instrumentation (collectors, caches)",
+            "!flush": "Write pending data to disk now",
+            "!export <metric|all> <window> [csv|jsonl]": "Export history as gzip file (e.g. `!export all 7d csv`)",
             "!service status <name>": "Check service status",
             "!service restart <name>": "Restart a service"
         }
@@ -978,7 +6076,7 @@ class ServerMonitor:
         
         embed.set_footer(text="Use the buttons on stats message for quick actions!")
         
-        await message.channel.send(embed=embed)
+        await self.outbound.send(message.channel, embed=embed)
     
     async def handle_config_command(self, message):
         """Handle config commands"""
@@ -990,7 +6088,7 @@ class ServerMonitor:
             return
         
         if len(parts) < 3:
-            await message.reply("Usage: `!config <setting> <value>`")
+            await self.outbound.reply(message, "Usage: `!config <setting> <value>`")
             return
         
         setting = parts[1]
@@ -1036,7 +6134,7 @@ class ServerMonitor:
                         response = f"✅ {threshold_type} threshold set to {threshold_value}"
                         success = True
                     else:
-                        response = f"❌ Unknown threshold type. Available: cpu, memory, disk, temperature"
+                        response = f"❌ Unknown threshold type. Available: {', '.join(CONFIG['thresholds'])}"
                 else:
                     response = "Usage: `!config threshold <type> <value>`"
             
@@ -1062,19 +6160,19 @@ class ServerMonitor:
                 success
             )
             
-            await message.reply(response)
+            await self.outbound.reply(message, response)
             
         except ValueError:
-            await message.reply("❌ Invalid value format")
+            await self.outbound.reply(message, "❌ Invalid value format")
         except Exception as e:
-            await message.reply(f"❌ Error: {str(e)}")
+            await self.outbound.reply(message, f"❌ Error: {str(e)}")
     
     async def handle_service_command(self, message):
         """Handle service commands"""
         parts = message.content.split()
         
         if len(parts) < 3:
-            await message.reply("Usage: `!service <status/restart> <service_name>`")
+            await self.outbound.reply(message, "Usage: `!service <status/restart> <service_name>`")
             return
         
         action = parts[1].lower()
@@ -1083,7 +6181,8 @@ class ServerMonitor:
         if action == "status":
             status = self.get_service_status(service_name)
             emoji = "✅" if status["active"] else "❌"
-            await message.reply(f"{emoji} Service **{service_name}**: {status['status']}")
+            usage = self._format_cgroup_usage(self.collectors.get('cgroups')['services'].get(service_name))
+            await self.outbound.reply(message, f"{emoji} Service **{service_name}**: {status['status']}{usage}")
             
             self.data_store.add_audit_log(
                 str(message.author),
@@ -1093,7 +6192,7 @@ class ServerMonitor:
         
         elif action == "restart":
             # Add confirmation
-            await message.reply(f"⚠️ Are you sure you want to restart **{service_name}**? Reply with `yes` to confirm.")
+            await self.outbound.reply(message, f"⚠️ Are you sure you want to restart **{service_name}**? Reply with `yes` to confirm.")
             
             def check(m):
                 return m.author == message.author and m.channel == message.channel and m.content.lower() == 'yes'
@@ -1111,10 +6210,10 @@ class ServerMonitor:
                     )
                     
                     if result.returncode == 0:
-                        await message.channel.send(f"✅ Service **{service_name}** restarted successfully")
+                        await self.outbound.send(message.channel, f"✅ Service **{service_name}** restarted successfully")
                         success = True
                     else:
-                        await message.channel.send(f"❌ Failed to restart service: {result.stderr}")
+                        await self.outbound.send(message.channel, f"❌ Failed to restart service: {result.stderr}")
                         success = False
                     
                     self.data_store.add_audit_log(
@@ -1124,7 +6223,7 @@ class ServerMonitor:
                     )
                     
                 except Exception as e:
-                    await message.channel.send(f"❌ Error: {str(e)}")
+                    await self.outbound.send(message.channel, f"❌ Error: {str(e)}")
                     self.data_store.add_audit_log(
                         str(message.author),
                         f"service restart {service_name}",
@@ -1132,10 +6231,125 @@ class ServerMonitor:
                     )
             
             except asyncio.TimeoutError:
-                await message.channel.send("❌ Confirmation timeout. Restart cancelled.")
+                await self.outbound.send(message.channel, "❌ Confirmation timeout. Restart cancelled.")
         
         else:
-            await message.reply("❌ Unknown action. Use 'status' or 'restart'")
+            await self.outbound.reply(message, "❌ Unknown action. Use 'status' or 'restart'")
+    
+    def _write_export_parts(self, metric: str, seconds: int, fmt: str, limit: int) -> tuple:
+        """Stream history dari SeriesStore ke file gzip (jalan di worker thread), pecah per limit upload.
+        
+        Return (file per part, timestamp baris pertama, timestamp baris terakhir).
+        """
+        series = self.data_store.series
+        start = time.time() - seconds
+        columns = series.metrics_since(start) if metric == "all" else [metric]
+        
+        # Ukuran dicek tiap flush_rows baris setelah sync flush gzip,
+        # sisakan ruang untuk baris yang ditulis di antaranya
+        flush_rows = 1000
+        part_limit = int(limit * 0.9)
+        parts = []
+        part = gz = writer = text = None
+        rows = 0
+        first = last = None
+        
+        def open_part():
+            fileobj = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024)
+            gz = gzip.GzipFile(fileobj=fileobj, mode='wb')
+            wrapper = io.TextIOWrapper(gz, encoding='utf-8', newline='')
+            csv_writer = csv.writer(wrapper) if fmt == "csv" else None
+            if csv_writer:
+                csv_writer.writerow(["timestamp"] + columns)
+            return fileobj, gz, wrapper, csv_writer
+        
+        def close_part():
+            text.close()  # Tutup wrapper + gzip, fileobj tetap terbuka
+            part.seek(0)
+            parts.append(part)
+        
+        for timestamp, stats in series.rows(columns, start):
+            if part is None:
+                part, gz, text, writer = open_part()
+            if first is None:
+                first = timestamp
+            last = timestamp
+            
+            iso = datetime.datetime.fromtimestamp(timestamp).isoformat()
+            if fmt == "csv":
+                writer.writerow([iso] + [stats.get(c, "") for c in columns])
+            else:
+                row = {"timestamp": iso}
+                row.update({c: stats[c] for c in columns if c in stats})
+                text.write(json.dumps(row) + "\n")
+            rows += 1
+            
+            if rows % flush_rows == 0:
+                text.flush()
+                gz.flush(zlib.Z_SYNC_FLUSH)
+                if part.tell() >= part_limit:
+                    close_part()
+                    part = None
+        
+        if part is not None:
+            close_part()
+        
+        return parts, first, last
+    
+    async def handle_export_command(self, message):
+        """Handle !export <metric|all> <window> [csv|jsonl]"""
+        parts = message.content.lower().split()
+        if len(parts) < 3:
+            await self.outbound.reply(message, "Usage: `!export <metric|all> <window> [csv|jsonl]` (e.g. `!export cpu 24h`)")
+            return
+        
+        metric = parts[1]
+        seconds = parse_duration(parts[2])
+        fmt = parts[3] if len(parts) > 3 else "csv"
+        if seconds is None or seconds <= 0:
+            await self.outbound.reply(message, "❌ Invalid window. Use e.g. `30m`, `24h`, `7d`")
+            return
+        if fmt not in ("csv", "jsonl"):
+            await self.outbound.reply(message, "❌ Format must be 'csv' or 'jsonl'")
+            return
+        
+        limit = message.guild.filesize_limit if message.guild else 10 * 1024 * 1024
+        
+        # Gzip di worker thread supaya event loop tetap responsif
+        await self.data_store.wait_history(seconds)
+        results, first, last = await asyncio.to_thread(self._write_export_parts, metric, seconds, fmt, limit)
+        
+        self.data_store.add_audit_log(
+            str(message.author),
+            f"export {metric} {parts[2]} {fmt}",
+            bool(results)
+        )
+        
+        if not results:
+            await self.outbound.reply(message, f"❌ No history data for `{metric}` in the last {parts[2]}")
+            return
+        
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M')
+        total = len(results)
+        # Sebutkan range yang benar-benar ada jika history lebih pendek dari window
+        covered = ""
+        if first - (time.time() - seconds) > max(CONFIG["update_interval"] * 2, 300):
+            covered = (
+                f"\nData available {datetime.datetime.fromtimestamp(first).strftime('%Y-%m-%d %H:%M')}"
+                f" → {datetime.datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M')} only"
+            )
+        try:
+            for index, fileobj in enumerate(results, 1):
+                suffix = f"-part{index}" if total > 1 else ""
+                filename = f"monitor-{metric}-{parts[2]}-{stamp}{suffix}.{fmt}.gz"
+                await self.outbound.send(
+                    message.channel,
+                    content=f"📦 Export `{metric}` ({parts[2]}, {fmt})" + (f" part {index}/{total}" if total > 1 else "") + covered,
+                    file=discord.File(fileobj, filename=filename)
+                )
+        finally:
+            for fileobj in results:
+                fileobj.close()
     
     def save_config(self):
         """Save current config to file"""
@@ -1150,38 +6364,59 @@ class ServerMonitor:
         except Exception as e:
             print(f"Error saving config: {e}")
     
+    def build_history_stats(self, snapshot: dict) -> dict:
+        """Entry history dari snapshot"""
+        cpu_info = snapshot["cpu"]
+        stats = {
+            "cpu": cpu_info['usage'],
+            "memory": snapshot["memory"]['percentage'],
+            "disk": snapshot["disk"]['percentage'],
+            "temperature": cpu_info['temperature']
+        }
+        
+        # Peak antar tick dari sampler
+        peaks = snapshot["peaks"]
+        if 'cpu' in peaks:
+            stats["cpu_peak"] = peaks['cpu']
+        if 'memory' in peaks:
+            stats["memory_peak"] = peaks['memory']
+        if cpu_info.get('core_peaks'):
+            stats["cpu_core_max"] = max(cpu_info['core_peaks'])
+        
+        # Metric saturasi
+        for key, _, value in self.get_pressure_readings():
+            stats[key] = value
+        
+        # Endpoint probe: success rate gabungan, per target hanya yang opt-in
+        # (tiap target menambah tiga metric ke setiap entry history dan series)
+        probes = snapshot["probes"]
+        if CONFIG["probes"] and probes["total"]:
+            stats["probe_success"] = probes["up"] / probes["total"] * 100
+            tracked = {p.get("name") or p["target"] for p in CONFIG["probes"] if p.get("history")}
+            for name, result in probes["targets"].items():
+                if name not in tracked:
+                    continue
+                stats[f"probe_{name}_success"] = result["success_rate"]
+                if result["p95"] is not None:
+                    stats[f"probe_{name}_p50"] = result["p50"]
+                    stats[f"probe_{name}_p95"] = result["p95"]
+        
+        # Event log per menit
+        for key, rate in snapshot["logs"]["rates"].items():
+            stats[f"log_{key.replace(':', '_')}"] = rate
+        
+        return stats
+    
     async def send_or_update_stats(self):
-        """Kirim stats baru atau update yang sudah ada"""
+        """Kirim stats baru atau update yang sudah ada di semua dashboard"""
         try:
-            channel = self.client.get_channel(CONFIG["channel_id"])
-            if not channel:
-                print("Channel tidak ditemukan!")
-                return
-            
-            embed = await self.create_stats_embed()
-            view = StatsView(self)
-            
-            # Store current stats in history
-            cpu_info = self.get_cpu_info()
-            memory_info = self.get_memory_info()
-            disk_info = self.get_disk_info()
-            
-            self.data_store.add_history({
-                "cpu": cpu_info['usage'],
-                "memory": memory_info['percentage'],
-                "disk": disk_info['percentage'],
-                "temperature": cpu_info['temperature']
-            })
-            
-            if self.status_message:
-                # Update pesan yang sudah ada
-                await self.status_message.edit(embed=embed, view=view)
-                print(f"Stats updated at {datetime.datetime.now().strftime('%H:%M:%S')}")
-            else:
-                # Kirim pesan baru
-                self.status_message = await channel.send(embed=embed, view=view)
-                print("Stats message sent!")
-                
+            snapshot = await self.collect_snapshot()
+            self.last_snapshot = snapshot
+            stats = self.build_history_stats(snapshot)
+            self.data_store.add_history(stats)
+            self.reports.observe(stats, snapshot)
+            await self.dashboards.publish(snapshot)
+            STARTUP_TIMER.mark("first embed published")
         except Exception as e:
             print(f"Error updating stats: {e}")
     
@@ -1195,10 +6430,38 @@ class ServerMonitor:
         """Loop untuk check alerts"""
         await self.check_threshold_alerts()
     
+    @tasks.loop(seconds=30)
+    async def check_budget(self):
+        """Loop untuk cek budget resource bot sendiri"""
+        try:
+            change = self.governor.check()
+            if change:
+                print(change)
+                self.data_store.add_audit_log("system", f"budget: {change}", True)
+        except Exception as e:
+            print(f"Error checking resource budget: {e}")
+    
+    @tasks.loop(seconds=60)
+    async def check_reports(self):
+        """Loop untuk kirim laporan terjadwal yang periodenya sudah selesai"""
+        try:
+            self.reports.roll()
+            for period in CONFIG["report_schedule"]:
+                report = self.reports.last.get(period)
+                if report and not report.get("posted"):
+                    await self.post_report(report)
+        except Exception as e:
+            print(f"Error sending scheduled report: {e}")
+    
     @update_stats.before_loop
     async def before_update_stats(self):
         """Wait until bot is ready"""
         await self.client.wait_until_ready()
+        # Isi cache collector dulu supaya embed pertama tidak kosong
+        try:
+            await asyncio.wait_for(self.collectors.refresh(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
     
     @check_alerts.before_loop
     async def before_check_alerts(self):
@@ -1211,14 +6474,22 @@ class ServerMonitor:
             print("Harap ganti TOKEN di konfigurasi!")
             return
         
-        if CONFIG["channel_id"] == 0:
+        if CONFIG["channel_id"] == 0 and not CONFIG["dashboards"]:
             print("Harap ganti CHANNEL_ID di konfigurasi!")
             return
         
+        # docker stop mengirim SIGTERM: tutup client dengan rapi seperti Ctrl+C
+        def handle_sigterm(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, handle_sigterm)
+        
         try:
             self.client.run(CONFIG["token"])
         except Exception as e:
             print(f"Error starting bot: {e}")
+        finally:
+            # Data yang belum ter-flush ditulis sebelum keluar
+            self.data_store.flush(seal=True)
 
 def load_config():
     """Load config from file if exists"""
@@ -1234,7 +6505,17 @@ def load_config():
                     else:
                         loaded_config['embed_color'] = int(loaded_config['embed_color'])
                 
-                CONFIG.update(loaded_config)
+                # Blok nested (mis. thresholds) digabung per key supaya key baru
+                # seperti psi_* tetap ada walau config.json dibuat versi lama
+                for key, value in loaded_config.items():
+                    if isinstance(value, dict) and isinstance(CONFIG.get(key), dict):
+                        CONFIG[key] = {**CONFIG[key], **value}
+                    else:
+                        CONFIG[key] = value
+                
+                # Interval 0 membuat MetricSampler membagi dengan nol; minimal 1 detik
+                for key in ('sample_interval_min', 'sample_interval_max'):
+                    CONFIG[key] = max(1, int(CONFIG[key]))
                 print("Config loaded from config.json")
         except Exception as e:
             print(f"Error loading config.json: {e}")
@@ -1253,13 +6534,53 @@ def create_sample_config():
             "cpu": 80,
             "memory": 85,
             "disk": 90,
-            "temperature": 75
+            "temperature": 75,
+            "psi_cpu": 40,
+            "psi_memory": 20,
+            "psi_io": 40,
+            "load_per_core": 2.0,
+            "fd_usage": 80,
+            "conntrack": 80,
+            "exec_rate": 600,
+            "probe_failures": 3,
+            "log_rate": 60,
+            "core_hot": 95
         },
         "view_mode": "detailed",
         "color_mode": "dynamic",
         "enable_alerts": True,
         "monitor_docker": False,
-        "monitor_services": []
+        "monitor_services": [],
+        "sample_interval_min": 1,
+        "sample_interval_max": 5,
+        "sample_window": 900,
+        "fast_proc": True,
+        "dashboards": [],
+        "dashboard_concurrency": 4,
+        "heavy_hitter_capacity": 100,
+        "heavy_hitter_hours": 24,
+        "proc_events": False,
+        "probes": [],
+        "probe_interval": 60,
+        "probe_concurrency": 20,
+        "log_files": [],
+        "budget_cpu": 10,
+        "budget_rss_mb": 300,
+        "budget_tracemalloc": False,
+        "save_interval": 10,
+        "history_retention_days": 400,
+        "graph_png": True,
+        "disk_scan_roots": [],
+        "disk_scan_interval": 1800,
+        "disk_scan_rate": 5000,
+        "disk_scan_depth": 4,
+        "report_schedule": [],
+        "report_time": "09:00",
+        "report_weekday": "mon",
+        "report_channel_id": 0,
+        "incident_window": 300,
+        "incident_resolve_after": 180,
+        "core_hot_minutes": 5
     }
     
     with open('config.json.example', 'w') as f:
@@ -1272,13 +6593,17 @@ if __name__ == "__main__":
     print("Discord Server Monitor Bot - Enhanced Edition")
     print("=" * 50)
     
+    STARTUP_TIMER.mark("imports")
+    
     # Load config if exists
     load_config()
     
     # Create sample config if not exists
     if not os.path.exists('config.json.example'):
         create_sample_config()
+    STARTUP_TIMER.mark("config loaded")
     
     # Create and run bot
     monitor = ServerMonitor()
+    STARTUP_TIMER.mark("monitor initialized")
     monitor.run()
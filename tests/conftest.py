@@ -0,0 +1,34 @@
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Test boleh mengubah CONFIG; kembalikan setelahnya"""
+    saved = copy.deepcopy(main.CONFIG)
+    yield
+    main.CONFIG.clear()
+    main.CONFIG.update(saved)
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    """ServerMonitor dengan file data di tmp_path; reply dicatat, tidak dikirim"""
+    monkeypatch.chdir(tmp_path)
+    monitor = main.ServerMonitor()
+    replies = []
+
+    async def reply(message, text=None, **kwargs):
+        replies.append(text)
+
+    monitor.outbound.reply = reply
+    monitor.replies = replies
+    monitor.data_store.series.append(1, {"cpu": 5})
+    return monitor
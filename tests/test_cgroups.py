@@ -0,0 +1,27 @@
+import main
+from main import CgroupCollector
+
+
+class FakeMonitor:
+    def get_docker_stats(self):
+        return [{"id": "abcdef123456", "name": "rootless"}]
+
+
+def test_unresolvable_container_rediscovered_with_backoff(tmp_path, monkeypatch):
+    collector = CgroupCollector(FakeMonitor())
+    collector.root = str(tmp_path)
+    walks = []
+    discover = collector.discover
+
+    def counting_discover():
+        walks.append(now[0])
+        discover()
+
+    collector.discover = counting_discover
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "time", lambda: now[0])
+    for _ in range(30):
+        collector.collect()
+        now[0] += 10
+    # Dulu: walk tiap tick selama container belum ketemu
+    assert [t - 1000 for t in walks] == [0, 10, 30, 70, 130, 190, 250]
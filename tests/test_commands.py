@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import main
+
+
+class Message:
+    channel = object()
+
+
+def test_graph_window_capped_at_retention(monitor):
+    asyncio.run(monitor.send_graph(Message(), "cpu", "100000000d"))
+    assert monitor.replies and "Window too large" in monitor.replies[0]
+
+
+def test_history_table_fits_embed_limit(monitor):
+    series = monitor.data_store.series
+    now = int(time.time())
+    metrics = ["cpu", "memory", "temperature", "disk", "cpu_peak"]
+    for timestamp in range(now - 60 * 3600, now, 300):
+        series.append(timestamp, {metric: 123456.7 for metric in metrics})
+    rows = monitor._history_span(now, 60 * 3600, 3600)[1]
+    assert rows <= monitor.HISTORY_MAX_BUCKETS + 1
+    embed = monitor.build_history_table(metrics, "60h", 60 * 3600, 3600, "avg")
+    assert len(embed.description) <= monitor.HISTORY_EMBED_LIMIT
+    assert "omitted" in embed.footer.text
+
+
+def test_parse_duration_rejects_overflow():
+    assert main.parse_duration("inf") is None
+    assert main.parse_duration("1e400d") is None
+    assert main.parse_duration("7d") == 7 * 86400
+
+
+def test_budget_pause_marked_on_views(monitor):
+    monitor.collectors.suspended = {"processes", "dirsize"}
+    monitor.governor.level = 2
+    assert monitor.paused_note("processes") == "paused by budget (level 2)"
+    embeds = []
+
+    async def send(channel, embed=None, **kwargs):
+        embeds.append(embed)
+
+    monitor.outbound.send = send
+    message = Message()
+    message.content = "!top cpu 6h"
+    asyncio.run(monitor.send_heavy_hitters(message))
+    assert "paused by budget (level 2)" in embeds[0].footer.text
+    monitor.collectors.suspended = set()
+    assert monitor.paused_note("processes") is None
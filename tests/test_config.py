@@ -0,0 +1,28 @@
+import json
+
+import main
+
+
+def test_old_thresholds_block_keeps_new_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text(json.dumps({
+        "update_interval": 60,
+        "thresholds": {"cpu": 70, "memory": 85, "disk": 90, "temperature": 75},
+    }))
+    main.load_config()
+    assert main.CONFIG["update_interval"] == 60
+    assert main.CONFIG["thresholds"]["cpu"] == 70
+    assert main.CONFIG["thresholds"]["psi_cpu"] == 40
+    assert main.CONFIG["thresholds"]["load_per_core"] == 2.0
+
+
+def test_zero_sample_intervals_clamped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text(json.dumps({
+        "sample_interval_min": 0,
+        "sample_interval_max": 0,
+    }))
+    main.load_config()
+    assert main.CONFIG["sample_interval_min"] == 1
+    assert main.CONFIG["sample_interval_max"] == 1
+    assert main.MetricSampler(None).next_interval({}) >= 1
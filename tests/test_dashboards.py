@@ -0,0 +1,36 @@
+import main
+from main import DashboardRegistry
+
+
+class FakeStore:
+    def __init__(self, dashboards):
+        self.data = {"dashboards": dashboards}
+        self.saves = 0
+
+    def save(self):
+        self.saves += 1
+
+
+class FakeMonitor:
+    def __init__(self, dashboards):
+        self.data_store = FakeStore(dashboards)
+
+
+def test_primary_dashboard_key_survives_view_change():
+    main.CONFIG["channel_id"] = 111
+    main.CONFIG["view_mode"] = "detailed"
+    before = DashboardRegistry.key(111, "detailed")
+    main.CONFIG["view_mode"] = "compact"
+    assert DashboardRegistry.key(111, "compact") == before == "111"
+    assert DashboardRegistry.key(222, "compact") == "222:compact"
+
+
+def test_prune_migrates_legacy_key_and_drops_stale_targets():
+    main.CONFIG["channel_id"] = 111
+    main.CONFIG["view_mode"] = "compact"
+    main.CONFIG["dashboards"] = [{"channel_id": 222}]
+    registry = DashboardRegistry(FakeMonitor({"111:detailed": 1, "222:detailed": 2, "333:compact": 3}))
+    registry._prune({registry.key(c, v) for c, v in registry.targets()})
+    # 222 ikut view utama (compact), pesan detailed-nya tidak di-edit lagi
+    assert registry.message_ids == {"111": 1}
+    assert registry.monitor.data_store.saves == 1
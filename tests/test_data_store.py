@@ -0,0 +1,78 @@
+import asyncio
+import datetime
+import json
+
+from main import DataStore
+
+
+def write_data(tmp_path, entries=900):
+    filename = str(tmp_path / "monitor_data.json")
+    start = datetime.datetime.now() - datetime.timedelta(seconds=30 * entries)
+    history = [
+        {
+            "timestamp": (start + datetime.timedelta(seconds=30 * i)).isoformat(),
+            "stats": {"cpu": i, "memory": 50.5}
+        }
+        for i in range(entries)
+    ]
+    with open(filename, "w") as f:
+        json.dump({"alerts": [], "audit_logs": [], "stats_summary": {}, "history": history}, f, indent=4)
+    return filename
+
+
+def make_store(tmp_path, filename):
+    return DataStore(filename, str(tmp_path / "monitor_history.bin"))
+
+
+def test_sync_finish_during_load_does_not_duplicate_tail(tmp_path):
+    store = make_store(tmp_path, write_data(tmp_path))
+    
+    async def scenario():
+        original = store.history_text
+        store.start_history_loader()
+        # Tunggu sampai tail sudah di-merge dan sisanya sedang di-parse di thread
+        while store.history_text is original:
+            await asyncio.sleep(0)
+        store.finish_history_sync()
+        await store.history_task
+    
+    asyncio.run(scenario())
+    cpus = [entry["stats"]["cpu"] for entry in store.data["history"]]
+    assert cpus == list(range(900))
+    assert store.history_complete and store.history_event.is_set()
+    assert len(list(store.series.query("cpu", 0))) == 900
+
+
+def test_samples_added_during_load_do_not_block_backfill(tmp_path):
+    store = make_store(tmp_path, write_data(tmp_path, entries=200))
+    store.write_behind = True
+
+    async def scenario():
+        store.start_history_loader()
+        # Tick pertama datang sebelum loader selesai
+        store.add_history({"cpu": 99, "memory": 40.0})
+        await store.history_event.wait()
+
+    asyncio.run(scenario())
+    samples = list(store.series.query("cpu", 0))
+    assert len(samples) == 201
+    assert samples[-1][1] == 99
+
+
+def test_unparseable_history_keeps_original_file(tmp_path):
+    filename = write_data(tmp_path)
+    with open(filename) as f:
+        text = f.read()
+    with open(filename, "w") as f:
+        f.write(text.replace('"cpu": 850,', '"cpu": ,', 1))
+    store = make_store(tmp_path, filename)
+    
+    async def scenario():
+        store.start_history_loader()
+        await store.history_event.wait()
+    
+    asyncio.run(scenario())
+    store.flush()
+    copies = list(tmp_path.glob("monitor_data.json.corrupt-*"))
+    assert len(copies) == 1
+    assert copies[0].read_text().count('"cpu"') == 900
@@ -0,0 +1,22 @@
+import main
+from main import DirSizeCollector
+
+
+def test_scan_runs_on_its_own_thread(tmp_path):
+    (tmp_path / "big").mkdir()
+    (tmp_path / "big" / "file").write_bytes(b"x" * 65536)
+    main.CONFIG["disk_scan_roots"] = [str(tmp_path)]
+    collector = DirSizeCollector()
+    assert collector.executor == "loop"
+    assert collector.timeout == main.Collector.timeout
+
+    # Run pertama hanya memulai scan di thread sendiri, tidak menunggu hasilnya
+    collector.collect()
+    assert collector.thread is not None and collector.thread.daemon
+    collector.thread.join(5)
+    result = collector.collect()
+    assert result["scanned"] is not None
+    assert result["top"][0][0] == str(tmp_path / "big")
+    # Belum waktunya scan lagi: hasil lama dikembalikan tanpa thread baru
+    thread = collector.thread
+    assert collector.collect() is result and collector.thread is thread
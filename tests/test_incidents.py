@@ -0,0 +1,28 @@
+from main import IncidentManager
+
+
+class FakeStore:
+    def __init__(self):
+        self.data = {}
+
+    def save(self):
+        pass
+
+
+def test_long_running_alert_does_not_absorb_later_alerts():
+    manager = IncidentManager(FakeStore())
+    start = 1000000.0
+    manager.process([("disk", "Disk usage is high", 95)], start)
+    # Disk terus fire selama tiga hari
+    for minute in range(1, 3 * 24 * 60, 10):
+        manager.process([("disk", "Disk usage is high", 95)], start + minute * 60)
+    now = start + 3 * 86400
+    manager.process([("disk", "Disk usage is high", 95), ("cpu", "CPU usage is high", 99)], now)
+    assert [sorted(i["alerts"]) for i in manager.open] == [["disk"], ["cpu"]]
+
+
+def test_alerts_firing_close_together_share_an_incident():
+    manager = IncidentManager(FakeStore())
+    manager.process([("disk", "Disk usage is high", 95)], 1000.0)
+    manager.process([("disk", "Disk usage is high", 95), ("cpu", "CPU usage is high", 99)], 1100.0)
+    assert [sorted(i["alerts"]) for i in manager.open] == [["cpu", "disk"]]
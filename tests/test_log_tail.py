@@ -0,0 +1,57 @@
+import os
+
+import main
+from main import LogTailCollector
+
+
+def events(collector):
+    totals = {}
+    for bucket in collector.buckets:
+        for key, count in bucket["counts"].items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
+
+def make_collector(path):
+    main.CONFIG["log_files"] = [{"path": str(path), "name": "app", "patterns": {"error": r"(?i)error"}}]
+    collector = LogTailCollector()
+    collector.mode = "polling"
+    # Offset tersimpan: file dibaca dari awal, bukan dari akhir
+    collector.offsets = {str(path): [os.stat(path).st_ino, 0]}
+    return collector
+
+
+def test_line_with_several_matches_counts_once(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"ERROR: disk error, retrying after error\nok\nerror again\npartial error")
+    collector = make_collector(log)
+    collector.collect()
+    # Baris terakhir belum lengkap (tanpa newline), belum dihitung
+    assert events(collector) == {"app:error": 2}
+
+
+def test_rotation_drains_old_file_then_reads_new(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"error 1\n")
+    collector = make_collector(log)
+    collector.collect()
+    with open(log, "ab") as f:
+        f.write(b"error 2\n")
+    os.rename(log, tmp_path / "app.log.1")
+    log.write_bytes(b"error 3\nerror 4\n")
+    collector.collect()
+    assert events(collector) == {"app:error": 4}
+    assert collector.files[str(log)]["inode"] == os.stat(log).st_ino
+
+
+def test_truncation_restarts_from_beginning(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_bytes(b"error 1\nerror 2\nerror 3\n")
+    collector = make_collector(log)
+    collector.collect()
+    # copytruncate: file dikosongkan lalu ditulis lagi dari awal
+    with open(log, "wb") as f:
+        f.write(b"error 4\n")
+    collector.collect()
+    assert events(collector) == {"app:error": 4}
+    assert collector.files[str(log)]["offset"] == len(b"error 4\n")
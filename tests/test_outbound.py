@@ -0,0 +1,42 @@
+import asyncio
+
+import main
+from main import OutboundScheduler
+
+
+def test_dashboard_never_takes_every_worker():
+    main.CONFIG["dashboard_concurrency"] = 100
+    assert OutboundScheduler().dashboard_limit() == OutboundScheduler.WORKERS - 1
+
+
+def test_alert_sent_while_dashboard_edits_are_blocked():
+    async def scenario():
+        main.CONFIG["dashboard_concurrency"] = OutboundScheduler.WORKERS
+        scheduler = OutboundScheduler()
+        blocked = asyncio.Event()  # Seperti edit yang tidur karena 429
+        started = []
+        
+        async def dashboard_edit(index):
+            started.append(index)
+            await blocked.wait()
+        
+        dashboards = [
+            scheduler.submit(OutboundScheduler.DASHBOARD, f"channel:{index}", lambda index=index: dashboard_edit(index))
+            for index in range(OutboundScheduler.WORKERS * 2)
+        ]
+        await asyncio.sleep(0.05)
+        assert len(started) == OutboundScheduler.WORKERS - 1
+        
+        async def alert():
+            return "sent"
+        
+        result = await asyncio.wait_for(
+            scheduler.submit(OutboundScheduler.ALERT, "channel:alerts", alert), timeout=1
+        )
+        assert result == "sent"
+        
+        blocked.set()
+        await asyncio.wait_for(asyncio.gather(*dashboards), timeout=1)
+        scheduler.stop()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,108 @@
+import asyncio
+import socket
+
+from aiohttp import web
+
+import main
+from main import ProbeCollector
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_http_stub():
+    async def ok(request):
+        return web.Response(text="ok")
+
+    async def fail(request):
+        return web.Response(status=500)
+
+    async def slow(request):
+        await asyncio.sleep(0.5)
+        return web.Response(text="late")
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/fail", fail)
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = free_port()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_probes_against_local_stubs():
+    async def scenario():
+        runner, base = await start_http_stub()
+        listener = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        tcp_port = listener.sockets[0].getsockname()[1]
+        main.CONFIG["probes"] = [
+            {"name": "web", "type": "http", "target": f"{base}/ok"},
+            {"name": "broken", "type": "http", "target": f"{base}/fail"},
+            {"name": "created", "type": "http", "target": f"{base}/ok", "expect_status": 201},
+            {"name": "slow", "type": "http", "target": f"{base}/slow", "timeout": 0.2},
+            {"name": "db", "type": "tcp", "target": f"127.0.0.1:{tcp_port}"},
+            {"name": "closed", "type": "tcp", "target": f"127.0.0.1:{free_port()}", "timeout": 1},
+        ]
+        collector = ProbeCollector()
+        try:
+            first = await collector.collect()
+            second = await collector.collect()
+        finally:
+            collector.close()
+            listener.close()
+            await runner.cleanup()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    targets = second["targets"]
+    assert second["up"] == 2 and second["total"] == 6
+    assert targets["web"]["ok"] and targets["db"]["ok"]
+    assert targets["broken"]["error"] == "HTTP 500"
+    assert targets["created"]["error"] == "HTTP 200, expected 201"
+    assert targets["slow"]["error"] == "timeout after 0.2s"
+    assert not targets["closed"]["ok"]
+    # Gagal berturut-turut dihitung per target
+    assert first["targets"]["slow"]["consecutive_failures"] == 1
+    assert targets["slow"]["consecutive_failures"] == 2
+    assert targets["web"]["consecutive_failures"] == 0
+    assert targets["web"]["success_rate"] == 100 and targets["slow"]["success_rate"] == 0
+
+
+def test_failures_reset_and_percentiles():
+    collector = ProbeCollector()
+    probe = {"name": "api", "target": "127.0.0.1:1"}
+    for latency in range(1, collector.RECENT + 1):
+        result = collector.record("api", probe, True, float(latency), None)
+    assert result["p50"] == 31 and result["p95"] == 58
+    collector.record("api", probe, False, None, "refused")
+    result = collector.record("api", probe, False, None, "refused")
+    assert result["consecutive_failures"] == 2
+    # RECENT terakhir: 58 sukses + 2 gagal
+    assert result["success_rate"] == 58 / 60 * 100
+    assert collector.record("api", probe, True, 10.0, None)["consecutive_failures"] == 0
+    assert sum(result["hist"]) == 60
+
+
+def test_per_target_history_is_opt_in(monitor):
+    main.CONFIG["probes"] = [
+        {"name": "web", "type": "http", "target": "http://127.0.0.1/", "history": True},
+        {"name": "db", "type": "tcp", "target": "127.0.0.1:5432"},
+    ]
+    target = {"success_rate": 100.0, "p50": 5.0, "p95": 9.0}
+    snapshot = {
+        "cpu": {"usage": 10.0, "temperature": 40.0},
+        "memory": {"percentage": 50.0},
+        "disk": {"percentage": 60.0},
+        "peaks": {},
+        "probes": {"targets": {"web": dict(target), "db": dict(target)}, "up": 2, "total": 2},
+        "logs": {"rates": {}},
+    }
+    stats = monitor.build_history_stats(snapshot)
+    assert stats["probe_success"] == 100
+    assert stats["probe_web_p95"] == 9.0
+    assert not any(key.startswith("probe_db") for key in stats)
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import struct
+import threading
+
+import pytest
+
+from main import ProcEventCollector
+
+
+def event(collector, what, body):
+    return b"\0" * 4 + collector.EVENT_HEADER.pack(what, 0, 0) + body
+
+
+def read_comm(pid):
+    with open(f"/proc/{pid}/comm") as f:
+        return f.read().strip()
+
+
+def test_exec_read_immediately_and_aggregated_later():
+    if not os.path.exists(f"/proc/{os.getpid()}/comm"):
+        pytest.skip("butuh /proc")
+    collector = ProcEventCollector()
+    pid = os.getpid()
+    resolved_in = []
+    resolve = collector._resolve
+
+    def tracking_resolve(records):
+        resolved_in.append(threading.current_thread() is not threading.main_thread())
+        return resolve(records)
+
+    collector._resolve = tracking_resolve
+
+    async def scenario():
+        collector._handle_event(event(collector, collector.PROC_EVENT_EXEC, struct.pack("=II", pid, pid)), 4)
+        # comm/stat dibaca saat event, agregasi belum
+        assert collector.live[pid][1] == read_comm(pid)
+        assert collector.live[pid][3] == os.getppid()
+        assert not collector.buckets
+        await collector.resolver
+
+    asyncio.run(scenario())
+    # Parent belum dilacak: namanya dicari di worker thread
+    assert resolved_in == [True]
+    keys = collector.buckets[-1]["keys"]
+    assert keys == {(read_comm(os.getppid()), read_comm(pid)): [1, 0, 0.0]}
+
+
+def test_exit_reads_cpu_before_deferring():
+    if not os.path.exists(f"/proc/{os.getpid()}/stat"):
+        pytest.skip("butuh /proc")
+    collector = ProcEventCollector()
+    pid = os.getpid()
+
+    async def scenario():
+        collector._remember(pid, (0.0, "job", "cron", 1))
+        collector._exited(pid, 1.0, collector.SHORT_LIVED, zombie=True)
+        assert pid not in collector.live
+        record = collector.queue[0]
+        assert record[:6] == (1.0, "job", "cron", 1, 0, 1) and record[6] > 0
+        await collector.resolver
+
+    asyncio.run(scenario())
+    assert collector.buckets[-1]["short_lived"] == 1
+
+
+def test_fork_respects_max_tracked():
+    collector = ProcEventCollector()
+    collector.MAX_TRACKED = 10
+    for child in range(100000, 100050):
+        body = struct.pack("=IIII", 1, 1, child, child)
+        collector._handle_event(event(collector, collector.PROC_EVENT_FORK, body), 4)
+    assert len(collector.live) == 10
+    assert collector.dropped == 40
@@ -0,0 +1,87 @@
+import os
+import time
+
+import psutil
+import pytest
+
+from main import ProcFastPath
+
+pytestmark = pytest.mark.skipif(not ProcFastPath.available(), reason="butuh /proc (Linux)")
+
+
+@pytest.fixture
+def fast_path():
+    reader = ProcFastPath()
+    yield reader
+    reader.close()
+
+
+def close_enough(a, b, rel=0.01, absolute=0):
+    return abs(a - b) <= max(abs(b) * rel, absolute)
+
+
+def busy_wait(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_verify_reports_no_mismatch(fast_path):
+    assert fast_path.verify() == []
+
+
+def test_cpu_percent_matches_psutil(fast_path):
+    fast_path.cpu_percent()
+    psutil.cpu_percent(interval=None)
+    psutil.cpu_percent(interval=None, percpu=True)
+    busy_wait(0.3)
+    time.sleep(0.3)
+    usage, per_core = fast_path.cpu_percent()
+    expected = psutil.cpu_percent(interval=None)
+    expected_per_core = psutil.cpu_percent(interval=None, percpu=True)
+    
+    assert close_enough(usage, expected, absolute=5)
+    assert len(per_core) == len(expected_per_core)
+    assert all(close_enough(a, b, absolute=5) for a, b in zip(per_core, expected_per_core))
+
+
+def test_cpu_times_match_psutil(fast_path):
+    total, per_cpu = fast_path.cpu_times()
+    expected = ProcFastPath.psutil_busy_total(psutil.cpu_times())
+    ticks = os.sysconf('SC_CLK_TCK')
+    # Dibaca di saat yang hampir sama: selisih beberapa tick per core
+    slack = ticks * psutil.cpu_count()
+    assert close_enough(total[1], expected[1] * ticks, absolute=slack)
+    assert close_enough(total[0], expected[0] * ticks, absolute=slack)
+    assert len(per_cpu) == len(psutil.cpu_times(percpu=True))
+
+
+def test_meminfo_matches_virtual_memory(fast_path):
+    memory = fast_path.meminfo()
+    expected = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    assert memory["total"] == expected.total
+    assert close_enough(memory["available"], expected.available, absolute=64 * 1024**2)
+    assert close_enough(memory["percent"], expected.percent, absolute=2)
+    assert memory["swap_total"] == swap.total
+    assert close_enough(memory["swap_percent"], swap.percent, absolute=2)
+
+
+def test_loadavg_matches_psutil(fast_path):
+    assert all(close_enough(a, b, absolute=0.5) for a, b in zip(fast_path.loadavg(), psutil.getloadavg()))
+
+
+def test_net_bytes_match_net_io_counters(fast_path):
+    sent, recv = fast_path.net_bytes()
+    expected = psutil.net_io_counters()
+    assert close_enough(sent, expected.bytes_sent, absolute=1024**2)
+    assert close_enough(recv, expected.bytes_recv, absolute=1024**2)
+
+
+def test_disk_bytes_match_disk_io_counters(fast_path):
+    expected = psutil.disk_io_counters()
+    if expected is None:
+        pytest.skip("tidak ada block device")
+    read_bytes, write_bytes = fast_path.disk_bytes()
+    assert close_enough(read_bytes, expected.read_bytes, absolute=1024**2)
+    assert close_enough(write_bytes, expected.write_bytes, absolute=1024**2)
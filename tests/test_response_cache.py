@@ -0,0 +1,49 @@
+import asyncio
+
+from main import ResponseCache
+
+
+def test_waiters_rebuild_when_builder_is_cancelled():
+    async def scenario():
+        cache = ResponseCache()
+        release = asyncio.Event()
+        builds = []
+        
+        async def slow_build():
+            builds.append("slow")
+            await release.wait()
+            return "slow"
+        
+        async def fast_build():
+            builds.append("fast")
+            return "fast"
+        
+        owner = asyncio.create_task(cache.get_or_build(("key",), slow_build))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_build(("key",), fast_build))
+        await asyncio.sleep(0)
+        
+        owner.cancel()
+        assert await asyncio.wait_for(waiter, timeout=1) == "fast"
+        assert builds == ["slow", "fast"]
+        assert not cache.pending
+    
+    asyncio.run(scenario())
+
+
+def test_builder_errors_reach_waiters():
+    async def scenario():
+        cache = ResponseCache()
+        
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        results = await asyncio.gather(
+            cache.get_or_build(("key",), failing),
+            cache.get_or_build(("key",), failing),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+    
+    asyncio.run(scenario())
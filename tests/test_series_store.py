@@ -0,0 +1,94 @@
+import os
+import time
+
+from main import SeriesStore
+
+
+def make_store(tmp_path, samples=3000):
+    store = SeriesStore(str(tmp_path / "history.bin"))
+    start = int(time.time()) - samples * 30
+    for i in range(samples):
+        stats = {"cpu": i % 100, "memory": 50.5}
+        if i % 2:
+            stats["disk"] = 70
+        store.append(start + i * 30, stats)
+    store.write_pending()
+    return store, start
+
+
+def test_rows_merge_metrics_by_timestamp(tmp_path):
+    store, start = make_store(tmp_path)
+    rows = list(store.rows(["cpu", "disk", "memory"], start))
+    assert len(rows) == 3000
+    assert rows[0] == (start, {"cpu": 0.0, "memory": 50.5})
+    assert rows[1] == (start + 30, {"cpu": 1.0, "disk": 70.0, "memory": 50.5})
+    assert [ts for ts, _ in rows] == sorted(ts for ts, _ in rows)
+
+
+def test_rows_cover_more_than_the_json_tail(tmp_path):
+    # Export dulu hanya membaca max_history entry terakhir dari JSON
+    store, start = make_store(tmp_path)
+    assert len(list(store.rows(["cpu"], start))) > 1000
+    assert store.metrics_since(start) == ["cpu", "disk", "memory"]
+
+
+def test_compact_does_not_hold_lock_while_writing(tmp_path):
+    store, start = make_store(tmp_path)
+    record = store._record
+    sealed = []
+
+    def seal_during_write(metric, block):
+        if not sealed:
+            # Seal metric baru dari "loop" selagi file compact sedang ditulis
+            store.append(int(time.time()), {"gpu": 5})
+            store.seal("gpu")
+            sealed.append(True)
+        return record(metric, block)
+
+    store._record = seal_during_write
+    retention = time.time() - (start + 1500 * 30)
+    store.compact(retention)
+    assert sealed
+    assert "gpu" in store.blocks
+    assert all(b["t_last"] >= time.time() - retention for blocks in store.blocks.values() for b in blocks)
+    rows = list(store.rows(["cpu"], start))
+    assert 0 < len(rows) < 3000
+    assert rows[-1][0] == start + 2999 * 30
+
+
+def test_compact_in_place_when_file_cannot_be_replaced(tmp_path, monkeypatch):
+    store, start = make_store(tmp_path)
+    filename = store.filename
+    size = store.file_size
+    replace = os.replace
+
+    def bind_mounted(src, dst):
+        # Seperti file bind-mount Docker: rename ke file utama gagal (EBUSY)
+        if dst == filename:
+            raise OSError(16, "Device or resource busy")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", bind_mounted)
+    store.compact(time.time() - (start + 1500 * 30))
+    assert store.file_size == os.path.getsize(filename) < size
+    assert not os.path.exists(store.compact_filename)
+    expected = list(store.rows(["cpu"], start))
+
+    reloaded = SeriesStore(filename)
+    reloaded.open = store.open
+    assert list(reloaded.rows(["cpu"], start)) == expected
+
+
+def test_interrupted_in_place_compact_is_finished_on_load(tmp_path):
+    store, start = make_store(tmp_path)
+    sealed = list(store.rows(["cpu"], start + 2048 * 30, start + 2559 * 30))
+    with open(store.filename, "rb") as f:
+        complete = f.read()
+    # Crash di tengah salinan in-place: file utama setengah jadi
+    with open(store.compact_filename, "wb") as f:
+        f.write(complete)
+    with open(store.filename, "r+b") as f:
+        f.write(b"\0" * 100)
+    reloaded = SeriesStore(store.filename)
+    assert not os.path.exists(store.compact_filename)
+    assert list(reloaded.rows(["cpu"], start + 2048 * 30, start + 2559 * 30)) == sealed
@@ -0,0 +1,33 @@
+import main
+from main import SysfsTemperatureReader, TemperatureCollector
+
+
+def test_no_sensors_rediscovered_on_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(SysfsTemperatureReader, "HWMON_PATH", str(tmp_path / "hwmon"))
+    monkeypatch.setattr(SysfsTemperatureReader, "THERMAL_PATH", str(tmp_path / "thermal"))
+    calls = []
+    monkeypatch.setattr(main.psutil, "sensors_temperatures", lambda: calls.append(1) or {}, raising=False)
+    collector = TemperatureCollector()
+    discover = collector.reader.discover
+    scans = []
+    collector.reader.discover = lambda: scans.append(1) or discover()
+    for _ in range(5):
+        assert collector.collect()["sensors"] == 0
+    # VM/container tanpa hwmon: tidak scan sysfs/psutil tiap tick
+    assert len(scans) == 1 and len(calls) == 1
+
+
+def test_hottest_sensor_reports_its_chip(tmp_path, monkeypatch):
+    for name, chip, value in (("hwmon0", "coretemp", 55000), ("hwmon1", "nvme", 81000)):
+        base = tmp_path / name
+        base.mkdir()
+        (base / "name").write_text(chip + "\n")
+        (base / "temp1_input").write_text(f"{value}\n")
+    (tmp_path / "hwmon0" / "temp1_label").write_text("Package id 0\n")
+    monkeypatch.setattr(SysfsTemperatureReader, "HWMON_PATH", str(tmp_path))
+    reader = SysfsTemperatureReader()
+    result = reader.read()
+    assert result["current"] == 81.0
+    assert (result["hottest_chip"], result["hottest"]) == ("nvme", "nvme temp1")
+    assert result["packages"] == [("Package id 0", 55.0)]
+    reader.close()